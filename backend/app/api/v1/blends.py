@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.blend import Blend as BlendModel
 from app.schemas.blend import Blend, BlendCreate, BlendUpdate
+from app.services.cache_service import cache_service
 
 router = APIRouter()
 
@@ -57,6 +58,7 @@ def create_blend(blend_in: BlendCreate, db: Session = Depends(get_db)):
         notes=blend_in.notes,
     )
     db.add(db_blend)
+    cache_service.invalidate_on_commit(db, "blends")
     db.commit()
     db.refresh(db_blend)
     return db_blend
@@ -84,6 +86,7 @@ def update_blend(blend_id: int, blend_in: BlendUpdate, db: Session = Depends(get
         setattr(db_blend, field, value)
 
     db.add(db_blend)
+    cache_service.invalidate_on_commit(db, "blends")
     db.commit()
     db.refresh(db_blend)
     return db_blend
@@ -99,5 +102,6 @@ def delete_blend(blend_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Blend not found")
 
     db.delete(db_blend)
+    cache_service.invalidate_on_commit(db, "blends")
     db.commit()
     return {"success": True, "message": "Blend deleted successfully"}
@@ -32,8 +32,9 @@ def read_beans(
     bean_types = type if type else None
     skip = (page - 1) * size
     
-    beans = service.get_beans(skip=skip, limit=size, search=search, bean_types=bean_types)
-    total = service.get_beans_count(search=search, bean_types=bean_types)
+    beans, total = service.get_beans_page(
+        skip=skip, limit=size, search=search, bean_types=bean_types
+    )
     
     pages = math.ceil(total / size) if size > 0 else 0
     beans_data = [Bean.model_validate(b) for b in beans]
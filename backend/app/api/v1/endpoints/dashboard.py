@@ -7,6 +7,7 @@ from app.database import get_db
 from app.schemas.bean import Bean
 from app.services import bean_service
 from app.services.blend_service import blend_service
+from app.services.cache_service import cache_service
 
 router = APIRouter()
 
@@ -19,8 +20,17 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
     - 전체 블렌드 레시피 개수
     - 총 원두 재고량 (kg)
     - 재고 부족 원두 리스트 (Top 5)
+    - 쓰기 이벤트 전까지 캐시된 결과 반환
     """
+    return cache_service.get_or_set(
+        "dashboard",
+        None,
+        lambda: _load_dashboard_stats(db),
+        tags=("beans", "blends", "inventory", "roasting", "inbound"),
+    )
 
+
+def _load_dashboard_stats(db: Session) -> Dict[str, Any]:
     # Dependency Injection (Manual for now, normally use Depends)
     from app.repositories.bean_repository import BeanRepository
     from app.services.bean_service import BeanService
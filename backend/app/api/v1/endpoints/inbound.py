@@ -1,27 +1,32 @@
 import logging
-from typing import Optional
+from typing import List, Optional
 
-import httpx
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
 from app.models.inbound_document import InboundDocument
+from app.repositories.inbound_job_repository import InboundJobRepository
 from app.repositories.inbound_repository import InboundRepository
+from app.repositories.pagination import InvalidCursorError
 from app.schemas.inbound import (
+    CursorInboundResponse,
+    InboundBatchStatusResponse,
+    InboundBatchSubmitResponse,
     InboundConfirmRequest,
+    InboundJobDetail,
     PaginatedInboundResponse,
 )
-from app.services.image_service import image_service
-from app.services.ocr_service import OCRService
+from app.services import inbound_analysis_service as analysis
+from app.services.ocr_service import ocr_service
+from app.services.inbound_batch_service import inbound_batch_service
 from app.services.inbound_service import inbound_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Initialize services (ocr_service is used here for streaming analysis)
-ocr_service = OCRService()
 
 import asyncio
 import json
@@ -40,244 +45,114 @@ async def analyze_inbound_document(
     Returns a Server-Sent Events (SSE) stream with status updates.
     """
 
-    # Eagerly read file content to prevent "I/O operation on closed file" error
+    # Eagerly spool file content to prevent "I/O operation on closed file" error
     # because UploadFile is closed when the request handler exits, but the generator runs later.
-    upload_file_bytes = None
-    upload_filename = "unknown.jpg"
-    upload_content_type = "image/jpeg"
+    # (청크 단위 수신: 크기 제한/형식 검사를 받는 도중에 적용, 전체를 메모리에 올리지 않음)
+    received_upload = None
+    upload_error = None
 
     if file:
-        upload_file_bytes = await file.read()
-        upload_filename = file.filename
-        upload_content_type = file.content_type or "image/jpeg"
+        try:
+            received_upload = await analysis.receive_upload(file)
+        except analysis.AnalysisError as e:
+            upload_error = str(e)
 
     async def analyze_generator():
-        image_bytes = None
-        filename = "unknown.jpg"
-        mime_type = "image/jpeg"
+        upload = received_upload
 
         try:
             # Step 1: Image Fetching
             yield json.dumps({"status": "progress", "message": "이미지를 가져오는 중..."}) + "\n"
 
-            if upload_file_bytes:
-                image_bytes = upload_file_bytes
-                filename = upload_filename
-                mime_type = upload_content_type
+            if upload_error:
+                yield json.dumps({"status": "error", "message": upload_error}) + "\n"
+                return
+            elif upload:
+                pass
             elif url:
                 yield json.dumps(
                     {"status": "progress", "message": "외부 URL에서 이미지 다운로드 중..."}
                 ) + "\n"
-                try:
-                    # Google Drive Link Helper
-                    import re
-
-                    drive_pattern = r"(?:https?:\/\/)?(?:drive|docs)\.google\.com\/(?:file\/d\/|open\?id=|uc\?id=)([a-zA-Z0-9_-]+)"
-                    match = re.search(drive_pattern, url)
-                    fetch_url = url
-                    if match:
-                        file_id = match.group(1)
-                        fetch_url = f"https://drive.google.com/uc?export=download&id={file_id}"
-                        yield json.dumps(
-                            {"status": "progress", "message": "Google Drive 링크 변환 중..."}
-                        ) + "\n"
-
-                    async with httpx.AsyncClient() as client:
-                        response = await client.get(fetch_url, follow_redirects=True)
-                        response.raise_for_status()
-                        image_bytes = response.content
-
-                        # Try to extract filename
-                        import cgi
-
-                        content_disposition = response.headers.get("content-disposition")
-                        if content_disposition:
-                            try:
-                                _, params = cgi.parse_header(content_disposition)
-                                if "filename" in params:
-                                    filename = params["filename"]
-                                    if not any(
-                                        filename.lower().endswith(ext)
-                                        for ext in [".jpg", ".jpeg", ".png", ".webp"]
-                                    ):
-                                        filename += ".jpg"
-                                else:
-                                    filename = "gdrive_upload.jpg"
-                            except:
-                                filename = "gdrive_upload.jpg"
-                        else:
-                            filename = "gdrive_upload.jpg"
-
-                        mime_type = response.headers.get("content-type", "image/jpeg")
-                except Exception as e:
+                if analysis.drive_download_url(url):
                     yield json.dumps(
-                        {"status": "error", "message": f"이미지 다운로드 실패: {str(e)}"}
+                        {"status": "progress", "message": "Google Drive 링크 변환 중..."}
                     ) + "\n"
-                    return
+                upload, _, _ = await analysis.fetch_url(url)
             else:
                 yield json.dumps(
                     {"status": "error", "message": "파일 또는 URL을 제공해야 합니다."}
                 ) + "\n"
                 return
 
-            if not image_bytes:
-                yield json.dumps(
-                    {"status": "error", "message": "이미지 데이터가 비어있습니다."}
-                ) + "\n"
-                return
-
             # Step 2: Validation
-            yield json.dumps(
-                {"status": "progress", "message": "이미지 보안 및 품질 검증 중..."}
-            ) + "\n"
-            is_valid, error_msg = image_service.validate_image(image_bytes, filename)
-            if not is_valid:
+            if upload.size:
                 yield json.dumps(
-                    {"status": "error", "message": f"유효하지 않은 이미지: {error_msg}"}
+                    {"status": "progress", "message": "이미지 보안 및 품질 검증 중..."}
                 ) + "\n"
-                return
+            analysis.validate(upload)
 
-            # Step 3: Preprocessing
-            yield json.dumps(
-                {"status": "progress", "message": "OCR 최적화를 위한 전처리 중..."}
-            ) + "\n"
-            processed_image_bytes = image_bytes
-            try:
-                import io
-
-                from PIL import Image
-
-                # Explicit BytesIO to prevent premature GC/Closure
-                with io.BytesIO(image_bytes) as buf:
-                    with Image.open(buf) as img:
-                        img.load()  # Force load data into memory
-                        processed_img = image_service.preprocess_for_ocr(img)
-
-                        output = io.BytesIO()
-                        if processed_img.mode in ("RGBA", "LA"):
-                            processed_img = processed_img.convert("RGB")
-                        processed_img.save(output, format="JPEG", quality=95)
-                        processed_image_bytes = output.getvalue()
-                        mime_type = "image/jpeg"
-            except Exception as e:
-                logger.warning(f"Preprocessing failed: {e}", exc_info=True)
-                # Continue with original
-
-            # Step 4: OCR Analysis (Streaming from Service)
-            ocr_result = None
-            async for update in ocr_service.analyze_image_stream(processed_image_bytes, mime_type):
-                if update["status"] == "complete":
-                    ocr_result = update["data"]
-                elif update["status"] == "error":
-                    yield json.dumps({"status": "error", "message": update["message"]}) + "\n"
-                    return
-                else:
-                    # Progress update from OCR Service
-                    yield json.dumps(update) + "\n"
-
-            if not ocr_result:
-                yield json.dumps({"status": "error", "message": "OCR 분석 결과가 없습니다."}) + "\n"
-                return
+            # 같은 원본(재업로드/같은 Drive 링크)이면 캐시된 OCR 결과 사용
+            # → 디코딩 전에 조회하여 OCR 전처리와 모델 호출을 모두 생략
+            ocr_result = await asyncio.to_thread(ocr_service.cached_result, upload.content_hash)
 
-            if ocr_result.get("error") == "INVALID_DOCUMENT":
+            if ocr_result is not None:
                 yield json.dumps(
-                    {"status": "error", "message": "INVALID_DOCUMENT: 명세서 형식이 아닙니다."}
+                    {"status": "progress", "message": "이전 분석 결과 사용, 이미지 준비 중..."}
                 ) + "\n"
-                return
+                # 명세서 이미지는 저장해야 하므로 저장용 인코딩만 수행
+                prepared = await analysis.prepare(upload, ocr=False)
+            else:
+                # Step 3: Preprocessing
+                yield json.dumps(
+                    {"status": "progress", "message": "OCR 최적화를 위한 전처리 중..."}
+                ) + "\n"
+                # 디코딩 1회로 OCR 입력과 저장용 3단계 이미지를 함께 준비 (프로세스 풀)
+                prepared = await analysis.prepare(upload)
+                processed_image_bytes, mime_type = prepared.ocr_bytes, prepared.ocr_mime_type
+
+                # Step 4: OCR Analysis (Streaming from Service)
+                stream = ocr_service.analyze_image_stream(
+                    processed_image_bytes, mime_type, source_hash=upload.content_hash
+                )
+                async for update in stream:
+                    if update["status"] == "complete":
+                        ocr_result = update["data"]
+                    elif update["status"] == "error":
+                        yield json.dumps({"status": "error", "message": update["message"]}) + "\n"
+                        return
+                    elif update["status"] == "partial":
+                        # 모델 응답 도중 완성된 품목/공급자/금액 블록 (품목은 즉시 생두 매칭)
+                        partial = analysis.build_partial(update, db)
+                        if partial:
+                            yield json.dumps(partial) + "\n"
+                    else:
+                        # Progress update from OCR Service
+                        yield json.dumps(update) + "\n"
+
+            ocr_result = analysis.check_ocr_result(ocr_result)
 
             # Step 5: Save Image (Local Storage)
             yield json.dumps({"status": "progress", "message": "이미지 저장 중..."}) + "\n"
-            image_data = None
-            try:
-                # Run sync S3/Local IO in thread to avoid blocking pipeline
-                image_data = await asyncio.to_thread(
-                    image_service.process_and_save, image_bytes, filename
-                )
-                drive_link = f"/static/uploads/inbound/{image_data['paths']['original']}"
-            except Exception as e:
-                yield json.dumps(
-                    {"status": "error", "message": f"이미지 저장 실패: {str(e)}"}
-                ) + "\n"
-                return
+            # Run sync S3/Local IO in thread to avoid blocking pipeline
+            image_data = await asyncio.to_thread(analysis.save_image, prepared, upload.filename)
 
             # Step 6: Post-processing (Bean Matching)
             yield json.dumps(
                 {"status": "progress", "message": "생두 데이터베이스 매칭 중..."}
             ) + "\n"
-
-            from app.schemas.inbound import (
-                AdditionalInfo,
-                AmountsInfo,
-                DocumentInfo,
-                ReceiverInfo,
-                SupplierInfo,
-                OCRResponse,
-            )
-
-            document_info = (
-                DocumentInfo(**ocr_result.get("document_info", {}))
-                if "document_info" in ocr_result
-                else None
-            )
-            supplier_info = (
-                SupplierInfo(**ocr_result.get("supplier", {})) if "supplier" in ocr_result else None
-            )
-            receiver_info = (
-                ReceiverInfo(**ocr_result.get("receiver", {})) if "receiver" in ocr_result else None
-            )
-            amounts_info = (
-                AmountsInfo(**ocr_result.get("amounts", {})) if "amounts" in ocr_result else None
-            )
-            additional_info = (
-                AdditionalInfo(**ocr_result.get("additional_info", {}))
-                if "additional_info" in ocr_result
-                else None
-            )
-
-            items_with_match_info = []
-            for item_data in ocr_result.get("items", []):
-                bean_name = item_data.get("bean_name")
-                # Use InboundService for matching
-                matched_bean, match_field, match_method = inbound_service.match_bean_multi_field(bean_name, db)
-                item_data["matched"] = matched_bean is not None
-                item_data["match_field"] = match_field
-                item_data["match_method"] = match_method
-                item_data["bean_id"] = matched_bean.id if matched_bean else None
-                items_with_match_info.append(item_data)
-
-            final_response = OCRResponse(
-                debug_raw_text=ocr_result.get("debug_raw_text"),
-                document_info=document_info,
-                supplier=supplier_info,
-                receiver=receiver_info,
-                amounts=amounts_info,
-                items=items_with_match_info,
-                additional_info=additional_info,
-                has_multiple_orders=ocr_result.get("has_multiple_orders", False),
-                total_order_count=ocr_result.get("total_order_count", 0),
-                order_groups=ocr_result.get("order_groups", []),
-                supplier_name=ocr_result.get("supplier", {}).get("name"),
-                contract_number=ocr_result.get("document_info", {}).get("contract_number"),
-                supplier_phone=ocr_result.get("supplier", {}).get("phone"),
-                supplier_email=ocr_result.get("supplier", {}).get("email"),
-                receiver_name=ocr_result.get("receiver", {}).get("name"),
-                invoice_date=ocr_result.get("document_info", {}).get("invoice_date"),
-                total_amount=ocr_result.get("amounts", {}).get("total_amount"),
-                drive_link=drive_link,
-                original_image_path=image_data["paths"].get("original") if image_data else None,
-                webview_image_path=image_data["paths"].get("webview") if image_data else None,
-                thumbnail_image_path=image_data["paths"].get("thumbnail") if image_data else None,
-                image_width=image_data.get("width") if image_data else None,
-                image_height=image_data.get("height") if image_data else None,
-                file_size_bytes=image_data.get("file_size_bytes") if image_data else None,
-            )
+            final_response = analysis.build_response(ocr_result, image_data, db)
 
             # Final Success Yield
-            yield json.dumps({"status": "complete", "data": final_response.dict()}) + "\n"
+            yield json.dumps({"status": "complete", "data": final_response}) + "\n"
 
+        except analysis.AnalysisError as e:
+            yield json.dumps({"status": "error", "message": str(e)}) + "\n"
         except Exception as e:
             logger.error(f"Analysis Generator Error: {e}", exc_info=True)
             yield json.dumps({"status": "error", "message": f"서버 내부 오류: {str(e)}"}) + "\n"
+        finally:
+            if upload is not None:
+                upload.close()
 
     return StreamingResponse(analyze_generator(), media_type="application/x-ndjson")
 
@@ -307,6 +182,93 @@ def get_inbound_list(
     return {"items": items, "total": total, "page": page, "size": limit, "total_pages": total_pages}
 
 
+@router.get("/list/cursor", response_model=CursorInboundResponse)
+def get_inbound_list_by_cursor(
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    keyword: Optional[str] = None,
+    with_total: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    명세서 목록 조회 (커서 페이징, (created_at, id) 최신순)
+    """
+    inbound_repo = InboundRepository(db)
+    try:
+        page = inbound_repo.get_list_by_cursor(
+            cursor=cursor,
+            limit=limit,
+            from_date=from_date,
+            to_date=to_date,
+            keyword=keyword,
+            with_total=with_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "items": page.items,
+        "next_cursor": page.next_cursor,
+        "has_more": page.has_more,
+        "total": page.total,
+        "total_is_estimate": page.total_is_estimate,
+    }
+
+
+@router.post("/batch", response_model=InboundBatchSubmitResponse, status_code=202)
+async def submit_inbound_batch(
+    files: List[UploadFile] = File([]),
+    urls: List[str] = Form([]),
+    db: Session = Depends(get_db),
+):
+    """
+    명세서 일괄 분석 작업 등록 (여러 파일/URL)
+    - 작업 등록 후 바로 반환, 진행 상황은 GET /batch/{batch_id} 로 조회
+    """
+    urls = [u.strip() for u in urls if u and u.strip()]
+    if not files and not urls:
+        raise HTTPException(status_code=400, detail="파일 또는 URL을 제공해야 합니다.")
+    if len(files) + len(urls) > settings.INBOUND_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.INBOUND_BATCH_MAX_FILES}건까지 등록할 수 있습니다.",
+        )
+
+    uploads = []
+    try:
+        for file in files:
+            try:
+                uploads.append(await analysis.receive_upload(file))
+            except analysis.AnalysisError as e:
+                raise HTTPException(status_code=400, detail=f"{file.filename}: {str(e)}")
+
+        batch_id, jobs = inbound_batch_service.submit(db, uploads, urls)
+    finally:
+        for upload in uploads:
+            upload.close()
+    return {"batch_id": batch_id, "jobs": jobs}
+
+
+@router.get("/batch/{batch_id}", response_model=InboundBatchStatusResponse)
+def get_inbound_batch_status(batch_id: str, db: Session = Depends(get_db)):
+    """일괄 분석 진행 상황 (단계별 작업 수 + 작업 목록)"""
+    status = inbound_batch_service.get_batch_status(db, batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return status
+
+
+@router.get("/jobs/{job_id}", response_model=InboundJobDetail)
+def get_inbound_job(job_id: int, db: Session = Depends(get_db)):
+    """일괄 분석 작업 상세 (완료된 작업은 검토용 분석 결과 포함)"""
+    job = InboundJobRepository(db).get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
 @router.get("/{document_id}")
 def get_inbound_detail(document_id: int, db: Session = Depends(get_db)):
     """
@@ -4,7 +4,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.schemas.inventory_log import InventoryLog, InventoryLogCreate, InventoryLogListResponse
+from app.repositories.pagination import InvalidCursorError
+from app.schemas.inventory_log import (
+    InventoryLog,
+    InventoryLogCreate,
+    InventoryLogCursorResponse,
+    InventoryLogListResponse,
+)
 from app.services.inventory_log_service import inventory_log_service
 
 router = APIRouter()
@@ -32,12 +38,9 @@ def read_inventory_logs(
     change_types = change_type if change_type else None
 
     # 데이터 조회
-    logs = inventory_log_service.get_logs(
+    logs, total = inventory_log_service.get_logs_page(
         db, bean_id=bean_id, change_types=change_types, search=search, skip=skip, limit=size
     )
-    total = inventory_log_service.get_logs_count(
-        db, bean_id=bean_id, change_types=change_types, search=search
-    )
     pages = (total + size - 1) // size if size > 0 else 0
 
     # Explicit conversation
@@ -46,6 +49,42 @@ def read_inventory_logs(
     return InventoryLogListResponse(items=logs_data, total=total, page=page, size=size, pages=pages)
 
 
+@router.get("/cursor", response_model=InventoryLogCursorResponse)
+def read_inventory_logs_by_cursor(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (첫 페이지는 생략)"),
+    size: int = Query(10, ge=1, le=100, description="페이지당 항목 수"),
+    bean_id: Optional[int] = Query(None, description="원두 ID 필터"),
+    change_type: List[str] = Query([], description="변동 유형 필터 (PURCHASE, SALES 등)"),
+    search: Optional[str] = Query(None, description="검색어 (원두 이름/원산지)"),
+    with_total: bool = Query(False, description="전체 건수 포함 (PostgreSQL은 추정치)"),
+    db: Session = Depends(get_db),
+):
+    """
+    재고 입출고 기록 조회 (커서 페이징)
+    - (created_at, id) 기준 최신순, 페이지가 깊어져도 일정한 속도
+    """
+    try:
+        page = inventory_log_service.get_logs_by_cursor(
+            db,
+            bean_id=bean_id,
+            change_types=change_type or None,
+            search=search,
+            cursor=cursor,
+            limit=size,
+            with_total=with_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return InventoryLogCursorResponse(
+        items=[InventoryLog.model_validate(log) for log in page.items],
+        next_cursor=page.next_cursor,
+        has_more=page.has_more,
+        total=page.total,
+        total_is_estimate=page.total_is_estimate,
+    )
+
+
 @router.post("/", response_model=InventoryLog, status_code=status.HTTP_201_CREATED)
 def create_inventory_log(log: InventoryLogCreate, db: Session = Depends(get_db)):
     """
@@ -5,6 +5,12 @@ from typing import Any, Dict
 from fastapi import APIRouter
 
 from app.config import settings
+from app.services.bean_name_index import bean_name_index
+from app.services.cache_service import cache_service
+from app.services.derived_image_service import derived_image_service
+from app.services.latency_tracker import ocr_latency_tracker
+from app.services.ocr_cache_service import ocr_cache_service
+from app.services.ocr_service import ocr_service
 
 router = APIRouter()
 
@@ -44,3 +50,54 @@ def get_system_status() -> Dict[str, Any]:
             "upload_path": upload_path,
         },
     }
+
+
+@router.get("/cache")
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    대시보드/통계 조회 캐시 지표 (hit/miss, 제거, 무효화 횟수)
+    """
+    return cache_service.stats()
+
+
+@router.get("/cache/ocr")
+def get_ocr_cache_stats() -> Dict[str, Any]:
+    """
+    OCR 결과 캐시 지표 (hit/miss, 저장 건수/용량, 제거 횟수)
+    """
+    return ocr_cache_service.stats()
+
+
+@router.get("/cache/derived-images")
+def get_derived_image_cache_stats() -> Dict[str, Any]:
+    """
+    웹뷰/썸네일 지연 생성 캐시 지표 (생성/재사용 횟수, 디스크 사용량, 제거 횟수)
+    """
+    return derived_image_service.stats()
+
+
+@router.get("/cache/bean-names")
+def get_bean_name_index_stats() -> Dict[str, Any]:
+    """
+    명세서 품목 → 생두 매칭 인덱스 지표 (조회/재생성/무효화 횟수, 인덱스 생두 수)
+    """
+    return bean_name_index.stats()
+
+
+@router.get("/ocr/latency")
+def get_ocr_latency_stats() -> Dict[str, Any]:
+    """
+    OCR 모델별 응답 시간 히스토그램 (헤징 대기 기준)
+    """
+    return ocr_latency_tracker.snapshot()
+
+
+@router.get("/ocr/rate-limits")
+def get_ocr_rate_limit_stats() -> Dict[str, Any]:
+    """
+    OCR 모델별 호출 한도 상태 (현재 동시 실행 한도, 대기 시간, 429/529 횟수)
+    """
+    return {
+        "enabled": ocr_service.rate_limiters.config.enabled,
+        "models": ocr_service.rate_limiters.snapshot(),
+    }
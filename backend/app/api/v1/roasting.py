@@ -9,7 +9,10 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.roasting import (
     BlendRoastingRequest,
+    BulkRoastingRequest,
+    BulkRoastingResponse,
     RoastingLog,
+    RoastingLogCursorResponse,
     RoastingLogDetail,
     RoastingResponse,
     RoastingResponse,
@@ -23,11 +26,17 @@ from fastapi import Query
 from app.services.roasting_service import RoastingService
 from app.services.bean_service import BeanService
 from app.services.inventory_service import InventoryService
+from app.services.fifo_ledger_service import FifoLedgerService
 from app.repositories.bean_repository import BeanRepository
 from app.repositories.inbound_repository import InboundRepository
 from app.repositories.inventory_log_repository import InventoryLogRepository
+from app.repositories.batch_sequence_repository import BatchSequenceRepository
 from app.repositories.blend_repository import BlendRepository
 from app.repositories.roasting_log_repository import RoastingLogRepository
+from app.repositories.roasting_rollup_repository import RoastingRollupRepository
+from app.repositories.pagination import InvalidCursorError
+from app.repositories.fifo_ledger_repository import FifoLedgerRepository
+from app.repositories.unit_of_work import UnitOfWork
 
 router = APIRouter()
 
@@ -38,11 +47,21 @@ def get_roasting_service(db: Session = Depends(get_db)) -> RoastingService:
     inventory_log_repo = InventoryLogRepository(db)
     blend_repo = BlendRepository(db)
     roasting_log_repo = RoastingLogRepository(db)
+    batch_sequence_repo = BatchSequenceRepository(db)
 
     bean_service = BeanService(bean_repo)
-    inventory_service = InventoryService(inbound_repo, inventory_log_repo)
+    fifo_ledger = FifoLedgerService(FifoLedgerRepository(db))
+    inventory_service = InventoryService(inbound_repo, inventory_log_repo, fifo_ledger)
     
-    return RoastingService(bean_service, inventory_service, blend_repo, roasting_log_repo)
+    return RoastingService(
+        bean_service,
+        inventory_service,
+        blend_repo,
+        roasting_log_repo,
+        batch_sequence_repo,
+        RoastingRollupRepository(db),
+        UnitOfWork(db),
+    )
 
 
 @router.post("/single-origin", response_model=RoastingResponse)
@@ -118,6 +137,30 @@ def roast_blend(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk", response_model=BulkRoastingResponse)
+def roast_bulk(
+    request: BulkRoastingRequest,
+    service: RoastingService = Depends(get_roasting_service),
+):
+    """
+    일괄 로스팅 기록 (하루치 생산 기록)
+    - 싱글 오리진/블렌드 배치를 한 번에 처리
+    - 전체 재고 사전 검증 후 단일 트랜잭션으로 반영 (하나라도 실패 시 전체 취소)
+    """
+    try:
+        results = service.create_bulk_roasting(request.batches)
+        return BulkRoastingResponse(
+            message=f"{len(results)} roasting batches logged successfully",
+            results=results,
+        )
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        print(f"Error in roast_bulk: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/history", response_model=list[RoastingLog])
 def get_roasting_history(
     skip: int = 0,
@@ -139,6 +182,38 @@ def get_roasting_history(
     return repo.get_multi(skip=skip, limit=limit, filters=filters)
 
 
+@router.get("/history/cursor", response_model=RoastingLogCursorResponse)
+def get_roasting_history_by_cursor(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (첫 페이지는 생략)"),
+    limit: int = Query(100, ge=1, le=500),
+    start_date: Optional[date] = Query(None, description="조회 시작일"),
+    end_date: Optional[date] = Query(None, description="조회 종료일"),
+    bean_id: Optional[int] = Query(None, description="생두 ID 필터"),
+    bean_type: Optional[str] = Query(None, description="원두 유형 필터 (GREEN_BEAN, BLEND_BEAN)"),
+    with_total: bool = Query(False, description="전체 건수 포함 (PostgreSQL은 추정치)"),
+    db: Session = Depends(get_db),
+):
+    """로스팅 이력 조회 (커서 페이징, (roast_date, id) 최신순)"""
+    repo = RoastingLogRepository(db)
+    filters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "bean_id": bean_id,
+        "bean_type": bean_type
+    }
+    try:
+        page = repo.get_multi_by_cursor(cursor=cursor, limit=limit, filters=filters, with_total=with_total)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return RoastingLogCursorResponse(
+        items=[RoastingLog.model_validate(log) for log in page.items],
+        next_cursor=page.next_cursor,
+        has_more=page.has_more,
+        total=page.total,
+        total_is_estimate=page.total_is_estimate,
+    )
+
+
 @router.get("/{log_id}", response_model=RoastingLogDetail)
 def get_roasting_log(
     log_id: int,
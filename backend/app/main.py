@@ -6,6 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1 import analytics, beans, blends, roasting
 from app.api.v1.endpoints import dashboard, inbound, inventory_logs
 from app.database import Base, engine
+from app.services.image_process_pool import image_process_pool
+from app.services.inbound_batch_service import inbound_batch_service
 
 
 @asynccontextmanager
@@ -37,8 +39,39 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️  Auto-seeding check failed: {e}")
 
+    # 로스팅 집계 테이블 도입 이전 로그 backfill (최초 1회, 통계 조회는 읽기 전용)
+    try:
+        from app.database import SessionLocal
+        from app.repositories.roasting_rollup_repository import RoastingRollupRepository
+
+        with SessionLocal() as db:
+            RoastingRollupRepository(db).ensure_backfilled()
+            db.commit()
+    except Exception as e:
+        print(f"⚠️  Roasting rollup backfill failed: {e}")
+
+    # FIFO 커서가 없는 원두 backfill (원가 견적은 읽기 전용, 이후 커서는 입고/차감 시 갱신)
+    try:
+        from app.database import SessionLocal
+        from app.repositories.fifo_ledger_repository import FifoLedgerRepository
+        from app.services.fifo_ledger_service import FifoLedgerService
+
+        with SessionLocal() as db:
+            created = FifoLedgerService(FifoLedgerRepository(db)).backfill()
+            db.commit()
+        if created:
+            print(f"✅ FIFO cursors backfilled: {created}")
+    except Exception as e:
+        print(f"⚠️  FIFO cursor backfill failed: {e}")
+
+    # 명세서 일괄 분석 워커 시작 (미완료 작업 재개)
+    await inbound_batch_service.start()
+
     yield
     # 종료 시: 정리 작업 (필요시)
+    await inbound_batch_service.stop()
+    await inbound.ocr_service.aclose()
+    image_process_pool.shutdown()
     print("👋 Shutting down...")
 
 
@@ -87,8 +120,13 @@ def read_root():
 
 
 import os
+from pathlib import Path
 
+import anyio
 from fastapi.staticfiles import StaticFiles
+from starlette.exceptions import HTTPException
+
+from app.services.derived_image_service import derived_image_service
 
 # Create static directory if not exists
 os.makedirs("static/uploads", exist_ok=True)
@@ -102,6 +140,20 @@ class CachedStaticFiles(StaticFiles):
         response.headers["Cache-Control"] = "public, max-age=31536000"
         return response
 
+    async def get_response(self, path: str, scope):
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as e:
+            if e.status_code != 404:
+                raise
+            # 업로드 웹뷰/썸네일은 첫 요청 시 원본에서 생성 (파생 이미지 캐시)
+            derived = await anyio.to_thread.run_sync(
+                derived_image_service.resolve, Path(self.directory) / path
+            )
+            if derived is None:
+                raise
+            return self.file_response(derived, os.stat(derived), scope)
+
 
 app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
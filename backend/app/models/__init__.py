@@ -4,13 +4,19 @@ Models 패키지
 모든 SQLAlchemy 모델을 여기서 import하여 쉽게 사용할 수 있도록 함
 """
 
+from .batch_sequence import BatchSequence
 from .bean import Bean
+from . import bean_search_index  # noqa: F401 (검색 인덱스 동기화 이벤트 등록)
 from .blend import Blend
+from .fifo_cursor import FifoCursor
 from .inbound_document import InboundDocument
 from .inbound_document_detail import InboundDocumentDetail
 from .inbound_item import InboundItem
+from .inbound_job import InboundJob
 from .inbound_receiver import InboundReceiver
 from .inventory_log import InventoryLog
+from .roasting_daily_rollup import RoastingDailyRollup
+from .roasting_log import RoastingLog
 from .supplier import Supplier
 
 __all__ = [
@@ -19,7 +25,12 @@ __all__ = [
     "InboundDocumentDetail",
     "InboundReceiver",
     "InboundItem",
+    "InboundJob",
     "InventoryLog",
+    "RoastingLog",
     "Supplier",
     "Blend",
+    "FifoCursor",
+    "BatchSequence",
+    "RoastingDailyRollup",
 ]
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.database import Base
+from app.utils.timezone import get_kst_now
+
+
+class BatchSequence(Base):
+    """
+    일자별 배치 번호 시퀀스 (카운터 테이블)
+    - prefix: 배치 번호 접두어 (예: R251225)
+    - last_value: 마지막으로 발급된 일련번호
+    """
+
+    __tablename__ = "batch_sequences"
+
+    prefix = Column(String(20), primary_key=True, comment="배치 번호 접두어 (예: R251225)")
+    last_value = Column(Integer, nullable=False, default=0, comment="마지막 발급 일련번호")
+
+    updated_at = Column(DateTime(timezone=True), default=get_kst_now, onupdate=get_kst_now)
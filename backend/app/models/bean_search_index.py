@@ -0,0 +1,190 @@
+"""
+원두 검색 인덱스 (bean_search_index)
+
+원두명/원산지/품종 7개 컬럼을 하나의 정규화된 검색 문자열로 모아 별도 인덱스에 보관한다.
+- SQLite: FTS5 trigram 가상 테이블 (rowid = bean_id), 3글자 이상은 MATCH로 인덱스 조회
+  (그보다 짧은 검색어는 단일 컬럼 스캔)
+- PostgreSQL: pg_trgm GIN 인덱스, ILIKE '%검색어%'가 인덱스를 사용
+- 검색 문자열은 NFC 정규화(한글 자모 분리 입력 대응) + casefold
+- Bean insert/update/delete 시 같은 트랜잭션에서 자동 동기화 (mapper event)
+"""
+
+import logging
+import unicodedata
+from typing import Optional
+
+from sqlalchemy import column, event, func, inspect, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.bean import Bean
+
+logger = logging.getLogger(__name__)
+
+INDEX_TABLE = "bean_search_index"
+
+# 검색 대상 컬럼
+SEARCH_FIELDS = ("name", "name_ko", "name_en", "origin", "origin_ko", "origin_en", "variety")
+
+# FTS5 trigram 토크나이저는 3글자 이상에서만 인덱스 매칭 가능
+_TRIGRAM_MIN_LENGTH = 3
+
+# 엔진(URL)별 FTS5 사용 여부
+_fts_enabled: dict = {}
+
+_search_index = table(INDEX_TABLE, column("bean_id"), column("search_text"))
+
+
+def normalize_search_text(value: Optional[str]) -> str:
+    return unicodedata.normalize("NFC", value or "").casefold().strip()
+
+
+def build_search_text(bean: Bean) -> str:
+    """검색 대상 컬럼을 줄바꿈으로 이어 붙인 정규화 문자열"""
+    return "\n".join(
+        normalize_search_text(getattr(bean, field))
+        for field in SEARCH_FIELDS
+        if getattr(bean, field)
+    )
+
+
+def _url_key(bind) -> str:
+    engine = getattr(bind, "engine", bind)
+    return str(engine.url)
+
+
+def create_search_index(connection: Connection) -> None:
+    """검색 인덱스 테이블 생성 (없으면) 후 비어 있으면 전체 원두로 채움"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        try:
+            connection.execute(
+                text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} "
+                    "USING fts5(search_text, tokenize='trigram')"
+                )
+            )
+            _fts_enabled[_url_key(connection)] = True
+        except Exception as e:
+            # FTS5/trigram 미지원 SQLite (3.34 미만): 일반 테이블 + LIKE
+            logger.warning(f"FTS5 trigram unavailable, falling back to plain search table: {e}")
+            connection.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {INDEX_TABLE} "
+                    "(bean_id INTEGER PRIMARY KEY, search_text TEXT NOT NULL)"
+                )
+            )
+            _fts_enabled[_url_key(connection)] = False
+    else:
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {INDEX_TABLE} "
+                "(bean_id INTEGER PRIMARY KEY REFERENCES beans(id) ON DELETE CASCADE, "
+                "search_text TEXT NOT NULL)"
+            )
+        )
+        if dialect == "postgresql":
+            try:
+                with connection.begin_nested():
+                    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                    connection.execute(
+                        text(
+                            f"CREATE INDEX IF NOT EXISTS ix_{INDEX_TABLE}_trgm "
+                            f"ON {INDEX_TABLE} USING gin (search_text gin_trgm_ops)"
+                        )
+                    )
+            except Exception as e:
+                logger.warning(f"pg_trgm unavailable, bean search will not use an index: {e}")
+
+    if connection.execute(text(f"SELECT 1 FROM {INDEX_TABLE} LIMIT 1")).first() is None:
+        rebuild_search_index(connection)
+
+
+def drop_search_index(connection: Connection) -> None:
+    connection.execute(text(f"DROP TABLE IF EXISTS {INDEX_TABLE}"))
+
+
+def _id_column_name(dialect_name: str) -> str:
+    # SQLite는 FTS5 rowid (일반 테이블이면 INTEGER PRIMARY KEY가 rowid 별칭)
+    return "rowid" if dialect_name == "sqlite" else "bean_id"
+
+
+def _delete_entry(connection: Connection, bean_id: int) -> None:
+    id_col = _id_column_name(connection.dialect.name)
+    connection.execute(
+        text(f"DELETE FROM {INDEX_TABLE} WHERE {id_col} = :bean_id"), {"bean_id": bean_id}
+    )
+
+
+def _insert_entry(connection: Connection, bean_id: int, search_text: str) -> None:
+    id_col = _id_column_name(connection.dialect.name)
+    connection.execute(
+        text(f"INSERT INTO {INDEX_TABLE} ({id_col}, search_text) VALUES (:bean_id, :search_text)"),
+        {"bean_id": bean_id, "search_text": search_text},
+    )
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """beans 전체로 검색 인덱스 재생성"""
+    connection.execute(text(f"DELETE FROM {INDEX_TABLE}"))
+    fields = ", ".join(SEARCH_FIELDS)
+    for row in connection.execute(text(f"SELECT id, {fields} FROM beans")):
+        search_text = "\n".join(normalize_search_text(value) for value in row[1:] if value)
+        _insert_entry(connection, row[0], search_text)
+
+
+def bean_search_condition(db: Session, search: str):
+    """Bean.id IN (검색 인덱스 조회) 조건"""
+    bind = db.get_bind()
+    dialect = bind.dialect.name
+    query = normalize_search_text(search)
+    id_col = literal_column(_id_column_name(dialect))
+    search_text = literal_column("search_text")
+
+    if dialect == "sqlite":
+        if _fts_enabled.get(_url_key(bind)) and len(query) >= _TRIGRAM_MIN_LENGTH:
+            phrase = '"' + query.replace('"', '""') + '"'
+            condition = literal_column(INDEX_TABLE).op("MATCH")(phrase)
+        else:
+            # 3글자 미만: 전체 스캔 (FTS5 테이블의 LIKE는 짧은 비ASCII 패턴을 놓치므로 instr 사용)
+            condition = func.instr(search_text, query) > 0
+    else:
+        condition = search_text.ilike(f"%{query}%")
+
+    return Bean.id.in_(select(id_col).select_from(_search_index).where(condition))
+
+
+# --- 스키마 생성/삭제 시 인덱스도 함께 관리 ---
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _after_metadata_create(target, connection, **kw):
+    create_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _before_metadata_drop(target, connection, **kw):
+    drop_search_index(connection)
+
+
+# --- Bean 쓰기 시 동기화 (같은 트랜잭션) ---
+
+
+@event.listens_for(Bean, "after_insert")
+def _index_inserted_bean(mapper, connection, target: Bean):
+    _insert_entry(connection, target.id, build_search_text(target))
+
+
+@event.listens_for(Bean, "after_update")
+def _index_updated_bean(mapper, connection, target: Bean):
+    state = inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in SEARCH_FIELDS):
+        return  # 재고 수량 변경 등은 인덱스 갱신 불필요
+    _delete_entry(connection, target.id)
+    _insert_entry(connection, target.id, build_search_text(target))
+
+
+@event.listens_for(Bean, "after_delete")
+def _unindex_deleted_bean(mapper, connection, target: Bean):
+    _delete_entry(connection, target.id)
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+
+from app.database import Base
+from app.utils.timezone import get_kst_now
+
+
+class FifoCursor(Base):
+    """
+    원두별 FIFO 소진 커서 (Materialized FIFO Lot Ledger)
+    - 입고 품목(InboundItem)을 (created_at, id) 순으로 나열한 lot 목록에서
+      현재 소진 중인 lot(head)과 그 lot에서 이미 소진된 수량을 기록
+    - 누적 사용량(음수 재고 로그 합계)이 바뀔 때마다 증분 갱신
+    """
+
+    __tablename__ = "fifo_cursors"
+
+    bean_id = Column(Integer, ForeignKey("beans.id", ondelete="CASCADE"), primary_key=True)
+
+    consumed_qty = Column(Float, nullable=False, default=0.0, comment="누적 사용량 (kg)")
+    head_item_id = Column(
+        Integer,
+        ForeignKey("inbound_items.id", ondelete="SET NULL"),
+        nullable=True,
+        comment="현재 소진 중인 입고 품목 ID (없으면 전량 소진)",
+    )
+    head_consumed_qty = Column(
+        Float, nullable=False, default=0.0, comment="head lot에서 이미 소진된 수량 (kg)"
+    )
+    overflow_qty = Column(
+        Float, nullable=False, default=0.0, comment="입고 이력을 초과한 사용량 (kg)"
+    )
+
+    updated_at = Column(DateTime(timezone=True), default=get_kst_now, onupdate=get_kst_now)
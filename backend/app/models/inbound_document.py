@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -7,6 +7,8 @@ from app.utils.timezone import get_kst_now
 
 class InboundDocument(Base):
     __tablename__ = "inbound_documents"
+    # 커서 페이지네이션 (created_at DESC, id DESC): 역방향 인덱스 스캔 (created_at 은 NOT NULL)
+    __table_args__ = (Index("ix_inbound_documents_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     contract_number = Column(
@@ -32,7 +34,7 @@ class InboundDocument(Base):
     processing_status = Column(String(20), default="pending")
 
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), default=get_kst_now)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=get_kst_now)
 
     # Relationships
     supplier = relationship("app.models.supplier.Supplier", back_populates="inbound_documents")
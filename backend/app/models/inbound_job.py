@@ -0,0 +1,53 @@
+import enum
+
+from sqlalchemy import JSON, Column, DateTime, Enum, Index, Integer, String, Text
+
+from app.database import Base
+from app.utils.timezone import get_kst_now
+
+
+class InboundJobStatus(str, enum.Enum):
+    """명세서 일괄 분석 작업 상태 (단계 순서대로)"""
+
+    QUEUED = "QUEUED"
+    FETCHING = "FETCHING"
+    VALIDATING = "VALIDATING"
+    PREPROCESSING = "PREPROCESSING"
+    OCR = "OCR"
+    SAVING = "SAVING"
+    MATCHING = "MATCHING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+TERMINAL_JOB_STATUSES = (InboundJobStatus.COMPLETED, InboundJobStatus.FAILED)
+
+
+class InboundJob(Base):
+    """
+    명세서 일괄 분석 작업 (파일/URL 1건 = 작업 1건)
+    - batch_id: 한 번에 제출한 작업 묶음
+    - result: 완료 시 OCRResponse (검토 후 /inbound/confirm 으로 입고 확정)
+    """
+
+    __tablename__ = "inbound_jobs"
+    __table_args__ = (Index("ix_inbound_jobs_status_id", "status", "id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(String(36), nullable=False, index=True, comment="일괄 제출 ID")
+
+    source_type = Column(String(10), nullable=False, comment="file / url")
+    source = Column(Text, nullable=False, comment="원본 파일명 또는 URL")
+    staged_path = Column(Text, nullable=True, comment="업로드 파일 임시 저장 경로")
+    mime_type = Column(String(100), nullable=True)
+
+    status = Column(Enum(InboundJobStatus), nullable=False, default=InboundJobStatus.QUEUED)
+    progress_message = Column(Text, nullable=True, comment="진행 메시지")
+    error = Column(Text, nullable=True, comment="실패 사유")
+    attempts = Column(Integer, nullable=False, default=0)
+
+    result = Column(JSON, nullable=True, comment="분석 결과 (OCRResponse)")
+
+    created_at = Column(DateTime(timezone=True), default=get_kst_now)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
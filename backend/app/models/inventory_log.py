@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, Text
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Index, Integer, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -21,6 +21,8 @@ class InventoryChangeType(str, enum.Enum):
 
 class InventoryLog(Base):
     __tablename__ = "inventory_logs"
+    # 커서 페이지네이션 (created_at DESC, id DESC): 역방향 인덱스 스캔 (created_at 은 NOT NULL)
+    __table_args__ = (Index("ix_inventory_logs_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     bean_id = Column(Integer, ForeignKey("beans.id"), nullable=False)
@@ -35,7 +37,7 @@ class InventoryLog(Base):
     notes = Column(Text, nullable=True, comment="비고/사유")
     related_id = Column(Integer, nullable=True, comment="관련 ID (로스팅ID 등)")
 
-    created_at = Column(DateTime(timezone=True), default=get_kst_now)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=get_kst_now)
 
     # Relationships
     bean = relationship("app.models.bean.Bean", back_populates="inventory_logs")
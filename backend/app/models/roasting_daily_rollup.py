@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer
+
+from app.database import Base
+from app.utils.timezone import get_kst_now
+
+
+class RoastingDailyRollup(Base):
+    """
+    일별·원두별 로스팅 집계 (대시보드 통계용 사전 집계 테이블)
+    - 로스팅 로그가 기록될 때마다 증분 갱신
+    - 집계 기준 원두 = 로스팅 로그의 target_bean_id (생산된 원두)
+    """
+
+    __tablename__ = "roasting_daily_rollup"
+
+    rollup_date = Column(Date, primary_key=True, comment="로스팅 일자 (KST)")
+    bean_id = Column(
+        Integer,
+        ForeignKey("beans.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="생산된 원두 ID",
+    )
+
+    output_weight_sum = Column(Float, nullable=False, default=0.0, comment="총 생산량 (kg)")
+    input_weight_sum = Column(Float, nullable=False, default=0.0, comment="총 투입량 (kg)")
+    batch_count = Column(Integer, nullable=False, default=0, comment="배치 수")
+    loss_rate_sum = Column(Float, nullable=False, default=0.0, comment="배치 손실률 합계 (%)")
+    production_cost_sum = Column(Float, nullable=False, default=0.0, comment="총 투입 생두 원가")
+
+    updated_at = Column(DateTime(timezone=True), default=get_kst_now, onupdate=get_kst_now)
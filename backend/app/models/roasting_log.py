@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -8,10 +8,14 @@ from app.utils.timezone import get_kst_now
 class RoastingLog(Base):
     """로스팅 생산 배치 기록"""
     __tablename__ = "roasting_logs"
+    # 커서 페이지네이션 (roast_date DESC, id DESC): 역방향 인덱스 스캔 (roast_date 는 NOT NULL)
+    __table_args__ = (Index("ix_roasting_logs_roast_date_id", "roast_date", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     batch_no = Column(String(50), unique=True, index=True, comment="생산 배치 번호")
-    roast_date = Column(DateTime(timezone=True), default=get_kst_now, comment="로스팅 일시")
+    roast_date = Column(
+        DateTime(timezone=True), nullable=False, default=get_kst_now, comment="로스팅 일시"
+    )
 
     target_bean_id = Column(Integer, ForeignKey("beans.id"), nullable=False, comment="생산된 원두 ID")
     
@@ -2,6 +2,7 @@ from typing import Generic, Type, TypeVar, Optional, List, Any
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.database import Base
+from app.repositories.unit_of_work import is_unit_of_work_active
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -19,6 +20,19 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.model = model
         self.db = db
 
+    def _persist(self, db_obj: Optional[ModelType] = None) -> None:
+        """
+        변경 사항 반영
+        - 기본: 호출마다 commit + refresh
+        - UnitOfWork 안: flush만 수행 (commit은 UnitOfWork가 한 번에 처리)
+        """
+        if is_unit_of_work_active(self.db):
+            self.db.flush()
+            return
+        self.db.commit()
+        if db_obj is not None:
+            self.db.refresh(db_obj)
+
     def get(self, id: Any) -> Optional[ModelType]:
         return self.db.query(self.model).filter(self.model.id == id).first()
 
@@ -33,10 +47,19 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             
         db_obj = self.model(**obj_in_data)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._persist(db_obj)
         return db_obj
 
+    def create_many(self, objs_in: List[CreateSchemaType | dict[str, Any]]) -> List[ModelType]:
+        """여러 건을 한 번에 INSERT (flush 1회)"""
+        db_objs = [
+            self.model(**(obj_in if isinstance(obj_in, dict) else obj_in.model_dump()))
+            for obj_in in objs_in
+        ]
+        self.db.add_all(db_objs)
+        self._persist()
+        return db_objs
+
     def update(
         self, db_obj: ModelType, obj_in: UpdateSchemaType | dict[str, Any]
     ) -> ModelType:
@@ -51,13 +74,12 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, update_data[field])
 
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._persist(db_obj)
         return db_obj
 
     def remove(self, id: int) -> ModelType:
         obj = self.db.query(self.model).get(id)
         if obj:
             self.db.delete(obj)
-            self.db.commit()
+            self._persist()
         return obj
@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+from sqlalchemy import select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models.batch_sequence import BatchSequence
+from app.models.roasting_log import RoastingLog
+from app.utils.timezone import get_kst_now
+
+
+class BatchSequenceRepository:
+    """
+    일자별 배치 번호 할당기
+    - 카운터 행을 UPDATE ... RETURNING 한 번으로 증가시켜 원자적으로 번호 블록을 예약
+      (최신 로스팅 로그를 읽고 +1 하는 방식과 달리 동시 요청에서도 중복 번호가 나오지 않음)
+    - 예약은 호출자(로스팅 UnitOfWork)와 분리된 별도 커넥션의 짧은 트랜잭션에서 바로 commit
+      → 카운터 행 잠금을 로스팅 저장이 끝날 때까지 잡지 않아 같은 날 동시 로스팅이 줄 서지 않음
+      → 호출자 트랜잭션이 rollback 되면 예약한 번호는 비게 됨 (번호 공백 허용)
+    - SQLite 는 DB 전체 쓰기 잠금이라 별도 트랜잭션이 호출자의 미완료 쓰기에 막히므로
+      호출자 세션에서 예약 (쓰기가 어차피 직렬화되어 분리해도 이점 없음)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def reserve(self, prefix: str, count: int = 1) -> int:
+        """
+        count개의 연속 번호를 예약하고 첫 번호를 반환
+        예) last_value=3, count=2 → 4 반환 (4, 5 예약)
+        """
+        with self._allocation_connection() as conn:
+            last_value = self._increment(conn, prefix, count)
+            if last_value is None:
+                # 해당 일자 첫 발급: 기존 로그 기준으로 카운터 행 생성 후 다시 증가
+                self._create_if_missing(conn, prefix, self._seed_value(conn, prefix))
+                last_value = self._increment(conn, prefix, count)
+        return last_value - count + 1
+
+    @staticmethod
+    def _uses_own_transaction(bind: Union[Engine, Connection]) -> bool:
+        # 테스트/외부 트랜잭션처럼 세션이 커넥션에 묶여 있으면 새 커넥션을 열 수 없음
+        return isinstance(bind, Engine) and bind.dialect.name != "sqlite"
+
+    @contextmanager
+    def _allocation_connection(self) -> Iterator[Union[Connection, Session]]:
+        bind = self.db.get_bind()
+        if self._uses_own_transaction(bind):
+            with bind.begin() as conn:  # 별도 커넥션, 블록이 끝나면 바로 commit
+                yield conn
+        else:
+            yield self.db
+
+    @staticmethod
+    def _increment(conn: Union[Connection, Session], prefix: str, count: int) -> Optional[int]:
+        stmt = (
+            update(BatchSequence)
+            .where(BatchSequence.prefix == prefix)
+            .values(last_value=BatchSequence.last_value + count, updated_at=get_kst_now())
+            .returning(BatchSequence.last_value)
+            .execution_options(synchronize_session=False)
+        )
+        return conn.execute(stmt).scalar_one_or_none()
+
+    @staticmethod
+    def _create_if_missing(conn: Union[Connection, Session], prefix: str, seed: int) -> None:
+        """동시에 생성을 시도해도 한 행만 남도록 ON CONFLICT DO NOTHING"""
+        bind = conn.get_bind() if isinstance(conn, Session) else conn
+        if bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = (
+            insert(BatchSequence)
+            .values(prefix=prefix, last_value=seed, updated_at=get_kst_now())
+            .on_conflict_do_nothing(index_elements=["prefix"])
+        )
+        conn.execute(stmt)
+
+    @staticmethod
+    def _seed_value(conn: Union[Connection, Session], prefix: str) -> int:
+        """카운터 도입 이전에 발급된 같은 일자 배치 번호의 최대 일련번호"""
+        batch_nos = conn.execute(
+            select(RoastingLog.batch_no).where(RoastingLog.batch_no.like(f"{prefix}-%"))
+        ).scalars()
+        seed = 0
+        for batch_no in batch_nos:
+            try:
+                seed = max(seed, int(batch_no.split("-")[-1]))
+            except (ValueError, IndexError):
+                continue
+        return seed
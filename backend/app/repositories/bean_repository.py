@@ -1,6 +1,8 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.models.bean import Bean, BeanType
+from app.models.bean_search_index import bean_search_condition
 from app.schemas.bean import BeanCreate, BeanUpdate
 from app.repositories.base_repository import BaseRepository
 
@@ -16,6 +18,18 @@ class BeanRepository(BaseRepository[Bean, BeanCreate, BeanUpdate]):
         """SKU로 원두 조회"""
         return self.db.query(Bean).filter(Bean.sku == sku).first()
 
+    def get_by_ids(self, ids: List[int]) -> List[Bean]:
+        """여러 ID의 원두를 한 번에 조회"""
+        if not ids:
+            return []
+        return self.db.query(Bean).filter(Bean.id.in_(ids)).all()
+
+    def get_by_skus(self, skus: List[str]) -> List[Bean]:
+        """여러 SKU의 원두를 한 번에 조회"""
+        if not skus:
+            return []
+        return self.db.query(Bean).filter(Bean.sku.in_(skus)).all()
+
     def get_unique_origins(self) -> List[str]:
         """등록된 모든 원두의 원산지 목록 조회"""
         results = self.db.query(Bean.origin).distinct().all()
@@ -26,27 +40,18 @@ class BeanRepository(BaseRepository[Bean, BeanCreate, BeanUpdate]):
         results = self.db.query(Bean.variety).distinct().all()
         return [r[0] for r in results if r[0]]
 
-    def search_beans(
+    def _search_query(
         self,
-        skip: int = 0,
-        limit: int = 100,
         search: Optional[str] = None,
         bean_types: Optional[List[str]] = None,
         origin: Optional[str] = None,
         exclude_blend: bool = False,
-    ) -> List[Bean]:
+    ):
         query = self.db.query(Bean)
 
         if search:
-            query = query.filter(
-                (Bean.name.contains(search))
-                | (Bean.name_ko.contains(search))
-                | (Bean.name_en.contains(search))
-                | (Bean.origin.contains(search))
-                | (Bean.origin_ko.contains(search))
-                | (Bean.origin_en.contains(search))
-                | (Bean.variety.contains(search))
-            )
+            # 이름/원산지/품종 검색은 검색 인덱스 사용 (컬럼별 LIKE '%...%' 스캔 대신)
+            query = query.filter(bean_search_condition(self.db, search))
 
         if bean_types:
             query = query.filter(Bean.type.in_(bean_types))
@@ -57,38 +62,56 @@ class BeanRepository(BaseRepository[Bean, BeanCreate, BeanUpdate]):
         if exclude_blend:
             query = query.filter(Bean.origin != "Blend")
 
-        return query.offset(skip).limit(limit).all()
+        return query
 
-    def count_beans(
+    def search_beans(
         self,
+        skip: int = 0,
+        limit: int = 100,
         search: Optional[str] = None,
         bean_types: Optional[List[str]] = None,
         origin: Optional[str] = None,
         exclude_blend: bool = False,
-    ) -> int:
-        query = self.db.query(Bean)
-
-        if search:
-            query = query.filter(
-                (Bean.name.contains(search))
-                | (Bean.name_ko.contains(search))
-                | (Bean.name_en.contains(search))
-                | (Bean.origin.contains(search))
-                | (Bean.origin_ko.contains(search))
-                | (Bean.origin_en.contains(search))
-                | (Bean.variety.contains(search))
-            )
-
-        if bean_types:
-            query = query.filter(Bean.type.in_(bean_types))
-
-        if origin:
-            query = query.filter(Bean.origin == origin)
+    ) -> List[Bean]:
+        return (
+            self._search_query(search, bean_types, origin, exclude_blend)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
-        if exclude_blend:
-            query = query.filter(Bean.origin != "Blend")
+    def search_beans_with_total(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        bean_types: Optional[List[str]] = None,
+        origin: Optional[str] = None,
+        exclude_blend: bool = False,
+    ) -> Tuple[List[Bean], int]:
+        """페이지 목록과 전체 건수를 한 쿼리로 조회 (COUNT(*) OVER ())"""
+        rows = (
+            self._search_query(search, bean_types, origin, exclude_blend)
+            .add_columns(func.count().over().label("total"))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        if rows:
+            return [row[0] for row in rows], rows[0][1]
+        if skip == 0:
+            return [], 0
+        # 마지막 페이지를 넘어선 요청이면 전체 건수만 별도 조회
+        return [], self.count_beans(search, bean_types, origin, exclude_blend)
 
-        return query.count()
+    def count_beans(
+        self,
+        search: Optional[str] = None,
+        bean_types: Optional[List[str]] = None,
+        origin: Optional[str] = None,
+        exclude_blend: bool = False,
+    ) -> int:
+        return self._search_query(search, bean_types, origin, exclude_blend).count()
 
     def get_total_stock_sum(self) -> float:
         result = self.db.query(Bean).with_entities(Bean.quantity_kg).all()
@@ -105,7 +128,3 @@ class BeanRepository(BaseRepository[Bean, BeanCreate, BeanUpdate]):
 
     def count_low_stock_beans(self, threshold: float = 5.0) -> int:
         return self.db.query(Bean).filter(Bean.quantity_kg < threshold).count()
-
-    def get_all_for_check(self) -> List[Bean]:
-        """배치 확인을 위한 가벼운 전체 조회 (필요한 컬럼만 조회 가능하지만 현재는 전체 객체 반환)"""
-        return self.db.query(Bean).all()
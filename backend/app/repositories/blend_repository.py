@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models.blend import Blend
 from app.schemas.blend import BlendCreate, BlendUpdate
@@ -8,3 +8,9 @@ from app.repositories.base_repository import BaseRepository
 class BlendRepository(BaseRepository[Blend, BlendCreate, BlendUpdate]):
     def __init__(self, db: Session):
         super().__init__(Blend, db)
+
+    def get_by_ids(self, ids: List[int]) -> List[Blend]:
+        """여러 ID의 블렌드를 한 번에 조회"""
+        if not ids:
+            return []
+        return self.db.query(Blend).filter(Blend.id.in_(ids)).all()
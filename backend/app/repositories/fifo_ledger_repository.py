@@ -0,0 +1,108 @@
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.models.fifo_cursor import FifoCursor
+from app.models.inbound_item import InboundItem
+from app.models.inventory_log import InventoryLog
+
+
+class FifoLedgerRepository:
+    """
+    FIFO lot ledger 데이터 접근
+    - lot = 원두별 입고 품목(InboundItem), (created_at, id) 오름차순
+    - commit은 호출하는 Service에서 처리 (flush만 수행)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_cursor(self, bean_id: int) -> Optional[FifoCursor]:
+        return self.db.query(FifoCursor).filter(FifoCursor.bean_id == bean_id).first()
+
+    def get_cursors(self, bean_ids: List[int]) -> Dict[int, FifoCursor]:
+        if not bean_ids:
+            return {}
+        cursors = self.db.query(FifoCursor).filter(FifoCursor.bean_id.in_(bean_ids)).all()
+        return {cursor.bean_id: cursor for cursor in cursors}
+
+    def get_bean_ids_without_cursor(self) -> List[int]:
+        """입고 lot 또는 사용 이력이 있지만 커서가 없는 원두 ID"""
+        has_cursor = self.db.query(FifoCursor.bean_id)
+        with_lots = self.db.query(InboundItem.bean_id).filter(InboundItem.bean_id.isnot(None))
+        with_usage = self.db.query(InventoryLog.bean_id).filter(InventoryLog.change_amount < 0)
+        bean_ids = {bean_id for (bean_id,) in with_lots.union(with_usage) if bean_id is not None}
+        return sorted(bean_ids - {bean_id for (bean_id,) in has_cursor})
+
+    def save_cursor(self, cursor: FifoCursor) -> FifoCursor:
+        self.db.add(cursor)
+        self.db.flush()
+        return cursor
+
+    def get_lot(self, item_id: int) -> Optional[InboundItem]:
+        return self.db.query(InboundItem).filter(InboundItem.id == item_id).first()
+
+    def _lot_query(self, bean_id: int):
+        return self.db.query(InboundItem).filter(InboundItem.bean_id == bean_id)
+
+    def get_all_lots(self, bean_id: int) -> List[InboundItem]:
+        return self._lot_query(bean_id).order_by(InboundItem.created_at, InboundItem.id).all()
+
+    def get_next_lot(self, lot: InboundItem) -> Optional[InboundItem]:
+        """lot 바로 다음 순서의 입고 품목"""
+        return (
+            self._lot_query(lot.bean_id)
+            .filter(
+                or_(
+                    InboundItem.created_at > lot.created_at,
+                    and_(InboundItem.created_at == lot.created_at, InboundItem.id > lot.id),
+                )
+            )
+            .order_by(InboundItem.created_at, InboundItem.id)
+            .first()
+        )
+
+    def get_prev_lot(self, lot: InboundItem) -> Optional[InboundItem]:
+        """lot 바로 이전 순서의 입고 품목"""
+        return (
+            self._lot_query(lot.bean_id)
+            .filter(
+                or_(
+                    InboundItem.created_at < lot.created_at,
+                    and_(InboundItem.created_at == lot.created_at, InboundItem.id < lot.id),
+                )
+            )
+            .order_by(InboundItem.created_at.desc(), InboundItem.id.desc())
+            .first()
+        )
+
+    def get_last_lot(self, bean_id: int) -> Optional[InboundItem]:
+        return (
+            self._lot_query(bean_id)
+            .order_by(InboundItem.created_at.desc(), InboundItem.id.desc())
+            .first()
+        )
+
+    def iter_lots_from(self, lot: InboundItem, batch_size: int = 16) -> Iterator[InboundItem]:
+        """lot부터 순서대로 lazy하게 순회 (필요한 lot까지만 읽도록 yield_per 사용)"""
+        return (
+            self._lot_query(lot.bean_id)
+            .filter(
+                or_(
+                    InboundItem.created_at > lot.created_at,
+                    and_(InboundItem.created_at == lot.created_at, InboundItem.id >= lot.id),
+                )
+            )
+            .order_by(InboundItem.created_at, InboundItem.id)
+            .yield_per(batch_size)
+        )
+
+    def get_total_usage(self, bean_id: int) -> float:
+        """누적 사용량 (음수 재고 로그의 절대값 합계)"""
+        total = (
+            self.db.query(func.sum(-InventoryLog.change_amount))
+            .filter(InventoryLog.bean_id == bean_id, InventoryLog.change_amount < 0)
+            .scalar()
+        )
+        return float(total or 0.0)
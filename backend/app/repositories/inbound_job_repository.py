@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.inbound_job import TERMINAL_JOB_STATUSES, InboundJob, InboundJobStatus
+
+
+class InboundJobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, job_id: int) -> Optional[InboundJob]:
+        return self.db.query(InboundJob).filter(InboundJob.id == job_id).first()
+
+    def get_batch(self, batch_id: str) -> List[InboundJob]:
+        return (
+            self.db.query(InboundJob)
+            .filter(InboundJob.batch_id == batch_id)
+            .order_by(InboundJob.id)
+            .all()
+        )
+
+    def create_many(self, batch_id: str, sources: List[Dict[str, Any]]) -> List[InboundJob]:
+        jobs = [
+            InboundJob(batch_id=batch_id, status=InboundJobStatus.QUEUED, **source)
+            for source in sources
+        ]
+        self.db.add_all(jobs)
+        self.db.commit()
+        return jobs
+
+    def update(self, job: InboundJob, **fields: Any) -> InboundJob:
+        for field, value in fields.items():
+            setattr(job, field, value)
+        self.db.commit()
+        return job
+
+    def requeue_unfinished(self) -> List[int]:
+        """
+        미완료 작업(서버 재시작 등으로 중단된 작업 포함)을 대기 상태로 되돌리고 ID 반환
+        (시도 횟수 초과 작업은 워커가 꺼낼 때 FAILED 처리)
+        """
+        jobs = (
+            self.db.query(InboundJob)
+            .filter(InboundJob.status.notin_(TERMINAL_JOB_STATUSES))
+            .order_by(InboundJob.id)
+            .all()
+        )
+        for job in jobs:
+            job.status = InboundJobStatus.QUEUED
+        self.db.commit()
+        return [job.id for job in jobs]
@@ -1,11 +1,12 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, asc
+from sqlalchemy import asc, insert, or_
 from app.models.inbound_document import InboundDocument
 from app.models.inbound_item import InboundItem
 from app.models.inbound_document_detail import InboundDocumentDetail
 from app.models.inbound_receiver import InboundReceiver
 from app.models.supplier import Supplier
+from app.repositories.pagination import KeysetPage, paginate_keyset
 from app.schemas.inbound import InboundDocumentCreate
 
 class InboundRepository:
@@ -50,6 +51,13 @@ class InboundRepository:
         item = InboundItem(**item_data)
         self.db.add(item)
         return item
+
+    def create_items(self, rows: List[dict]) -> List[InboundItem]:
+        """입고 품목 여러 건을 INSERT ... RETURNING 으로 생성 (입력 순서대로 반환)"""
+        if not rows:
+            return []
+        stmt = insert(InboundItem).returning(InboundItem, sort_by_parameter_order=True)
+        return list(self.db.scalars(stmt, rows))
     
     def get_fifo_candidates(self, bean_id: int) -> List[InboundItem]:
         """잔여 재고가 있는 입고 항목을 오래된 순서대로 조회 (FIFO)"""
@@ -60,6 +68,22 @@ class InboundRepository:
             .all()
         )
 
+    def get_fifo_candidates_bulk(self, bean_ids: List[int], lock: bool = True) -> List[InboundItem]:
+        """
+        여러 원두의 FIFO 후보 입고 항목을 한 번에 조회 (원두별, 오래된 순서)
+        lock=True이면 SELECT ... FOR UPDATE로 동시 차감을 방지 (SQLite에서는 무시됨)
+        """
+        if not bean_ids:
+            return []
+        query = (
+            self.db.query(InboundItem)
+            .filter(InboundItem.bean_id.in_(bean_ids), InboundItem.remaining_quantity > 0)
+            .order_by(InboundItem.bean_id, asc(InboundItem.created_at), InboundItem.id)
+        )
+        if lock:
+            query = query.with_for_update()
+        return query.all()
+
     def update_item_remaining_quantity(self, item_id: int, new_quantity: float) -> Optional[InboundItem]:
         """입고 품목 재고 수량 업데이트"""
         item = self.db.query(InboundItem).filter(InboundItem.id == item_id).first()
@@ -69,14 +93,12 @@ class InboundRepository:
             self.db.flush() # Commit is handled by Service
         return item
 
-    def get_list(
-        self, 
-        skip: int = 0, 
-        limit: int = 20, 
-        from_date: Optional[str] = None, 
+    def _list_query(
+        self,
+        from_date: Optional[str] = None,
         to_date: Optional[str] = None,
         keyword: Optional[str] = None
-    ) -> tuple[List[InboundDocument], int]:
+    ):
         query = self.db.query(InboundDocument)
 
         if from_date:
@@ -91,9 +113,35 @@ class InboundRepository:
                     InboundDocument.supplier_name.ilike(f"%{keyword}%"),
                 )
             )
+        return query
+
+    def get_list(
+        self, 
+        skip: int = 0, 
+        limit: int = 20, 
+        from_date: Optional[str] = None, 
+        to_date: Optional[str] = None,
+        keyword: Optional[str] = None
+    ) -> tuple[List[InboundDocument], int]:
+        query = self._list_query(from_date, to_date, keyword)
         
         total = query.count()
-        query = query.order_by(InboundDocument.created_at.desc())
+        query = query.order_by(InboundDocument.created_at.desc(), InboundDocument.id.desc())
         items = query.offset(skip).limit(limit).all()
         
         return items, total
+
+    def get_list_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        keyword: Optional[str] = None,
+        with_total: bool = False,
+    ) -> KeysetPage:
+        """(created_at, id) 커서 기반 조회"""
+        return paginate_keyset(
+            self._list_query(from_date, to_date, keyword),
+            InboundDocument.created_at, InboundDocument.id, limit, cursor, with_total,
+        )
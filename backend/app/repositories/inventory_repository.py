@@ -1,20 +1,22 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import case, func, insert, update
 from sqlalchemy.orm import Session, contains_eager
 from app.models.bean import Bean
+from app.models.bean_search_index import bean_search_condition
+from app.repositories.pagination import KeysetPage, paginate_keyset
 from app.models.inventory_log import InventoryLog
+from app.repositories.unit_of_work import is_unit_of_work_active
 
 class InventoryRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_logs(
+    def _logs_query(
         self,
         bean_id: Optional[int] = None,
         change_types: Optional[List[str]] = None,
         search: Optional[str] = None,
-        skip: int = 0,
-        limit: int = 100,
-    ) -> List[InventoryLog]:
+    ):
         query = self.db.query(InventoryLog).join(Bean)
 
         if bean_id:
@@ -22,44 +24,76 @@ class InventoryRepository:
         if change_types:
             query = query.filter(InventoryLog.change_type.in_(change_types))
         if search:
-            query = query.filter(
-                (Bean.name.contains(search))
-                | (Bean.name_ko.contains(search))
-                | (Bean.name_en.contains(search))
-                | (Bean.origin.contains(search))
-                | (Bean.origin_ko.contains(search))
-            )
+            query = query.filter(bean_search_condition(self.db, search))
+
+        return query
 
+    def get_logs(
+        self,
+        bean_id: Optional[int] = None,
+        change_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[InventoryLog]:
         return (
-            query.options(contains_eager(InventoryLog.bean))
-            .order_by(InventoryLog.created_at.desc())
+            self._logs_query(bean_id, change_types, search)
+            .options(contains_eager(InventoryLog.bean))
+            .order_by(InventoryLog.created_at.desc(), InventoryLog.id.desc())
             .offset(skip)
             .limit(limit)
             .all()
         )
 
-    def count_logs(
+    def get_logs_with_total(
         self,
         bean_id: Optional[int] = None,
         change_types: Optional[List[str]] = None,
         search: Optional[str] = None,
-    ) -> int:
-        query = self.db.query(InventoryLog).join(Bean)
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Tuple[List[InventoryLog], int]:
+        """페이지 목록과 전체 건수를 한 쿼리로 조회 (COUNT(*) OVER ())"""
+        rows = (
+            self._logs_query(bean_id, change_types, search)
+            .options(contains_eager(InventoryLog.bean))
+            .add_columns(func.count().over().label("total"))
+            .order_by(InventoryLog.created_at.desc(), InventoryLog.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        if rows:
+            return [row[0] for row in rows], rows[0][1]
+        if skip == 0:
+            return [], 0
+        # 마지막 페이지를 넘어선 요청이면 전체 건수만 별도 조회
+        return [], self.count_logs(bean_id, change_types, search)
 
-        if bean_id:
-            query = query.filter(InventoryLog.bean_id == bean_id)
-        if change_types:
-            query = query.filter(InventoryLog.change_type.in_(change_types))
-        if search:
-            query = query.filter(
-                (Bean.name.contains(search))
-                | (Bean.name_ko.contains(search))
-                | (Bean.name_en.contains(search))
-                | (Bean.origin.contains(search))
-                | (Bean.origin_ko.contains(search))
-            )
+    def get_logs_by_cursor(
+        self,
+        bean_id: Optional[int] = None,
+        change_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        with_total: bool = False,
+    ) -> KeysetPage:
+        """(created_at, id) 커서 기반 조회"""
+        query = self._logs_query(bean_id, change_types, search).options(
+            contains_eager(InventoryLog.bean)
+        )
+        return paginate_keyset(
+            query, InventoryLog.created_at, InventoryLog.id, limit, cursor, with_total
+        )
 
-        return query.count()
+    def count_logs(
+        self,
+        bean_id: Optional[int] = None,
+        change_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+    ) -> int:
+        return self._logs_query(bean_id, change_types, search).count()
 
     def get_bean(self, bean_id: int) -> Optional[Bean]:
         return self.db.query(Bean).filter(Bean.id == bean_id).first()
@@ -69,10 +103,38 @@ class InventoryRepository:
 
     def create_log(self, log: InventoryLog) -> InventoryLog:
         self.db.add(log)
+        if is_unit_of_work_active(self.db):
+            self.db.flush()
+            return log
         self.db.commit()
         self.db.refresh(log)
         return log
 
     def delete_log(self, log: InventoryLog):
         self.db.delete(log)
+        if is_unit_of_work_active(self.db):
+            self.db.flush()
+            return
         self.db.commit()
+
+    def apply_stock_changes(self, changes: Dict[int, float]) -> Dict[int, float]:
+        """
+        원두별 재고 증감을 UPDATE 한 번으로 반영 (quantity_kg = quantity_kg + CASE id ...)
+        - 현재 값을 읽어 계산하지 않으므로 동시 요청의 변경을 덮어쓰지 않음
+        - 변경 후 재고를 RETURNING 으로 받아 반환 (bean_id -> quantity_kg)
+        """
+        if not changes:
+            return {}
+        stmt = (
+            update(Bean)
+            .where(Bean.id.in_(list(changes)))
+            .values(quantity_kg=Bean.quantity_kg + case(changes, value=Bean.id, else_=0.0))
+            .returning(Bean.id, Bean.quantity_kg)
+            .execution_options(synchronize_session=False)
+        )
+        return {bean_id: quantity for bean_id, quantity in self.db.execute(stmt)}
+
+    def create_logs(self, rows: List[dict]) -> None:
+        """재고 로그 여러 건을 executemany 로 INSERT (commit은 호출하는 Service에서 처리)"""
+        if rows:
+            self.db.execute(insert(InventoryLog), rows)
@@ -0,0 +1,111 @@
+"""
+커서(Keyset) 페이지네이션
+
+OFFSET/LIMIT은 앞 페이지의 행을 모두 읽고 버리므로 깊은 페이지일수록 느려진다.
+(정렬 컬럼, id) 내림차순 기준으로 직전 페이지 마지막 행 다음부터 바로 탐색한다.
+- 커서: 마지막 행의 (정렬 값, id)를 base64(JSON)로 인코딩한 불투명 문자열
+- 정렬 컬럼은 NOT NULL: (정렬, id) 오름차순 복합 인덱스를 역방향으로 스캔하여 정렬 없이 바로 탐색
+  (NULLS LAST 조건이 있으면 PostgreSQL 은 인덱스 역방향 스캔 순서(NULLS FIRST)와 달라 전체 정렬)
+- 전체 건수는 요청 시에만 계산 (PostgreSQL은 실행 계획 추정치, 그 외는 COUNT)
+"""
+
+import base64
+import binascii
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Query
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidCursorError(ValueError):
+    """디코딩할 수 없는 커서"""
+
+
+@dataclass
+class KeysetPage:
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    payload = [sort_value.isoformat(), row_id]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        if not isinstance(row_id, int):
+            raise TypeError("id must be an integer")
+        return datetime.fromisoformat(sort_value), row_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def _after_cursor(sort_column, id_column, cursor: str):
+    """커서 다음 행 조건 (sort DESC, id DESC)"""
+    sort_value, row_id = decode_cursor(cursor)
+    return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
+
+
+def estimate_count(query: Query) -> Tuple[int, bool]:
+    """
+    전체 건수 (건수, 추정치 여부)
+    - PostgreSQL: EXPLAIN 행 수 추정치 (COUNT 전체 스캔 없음)
+    - 그 외: COUNT(*)
+    """
+    db = query.session
+    if db.get_bind().dialect.name == "postgresql":
+        try:
+            statement = query.order_by(None).statement.compile(
+                dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"]), True
+        except Exception as e:
+            logger.warning(f"Row estimate failed, falling back to COUNT: {e}")
+    return query.order_by(None).count(), False
+
+
+def paginate_keyset(
+    query: Query,
+    sort_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
+) -> KeysetPage:
+    """
+    (sort_column, id_column) 내림차순 커서 페이지 조회 (sort_column 은 NOT NULL)
+    - limit + 1건을 읽어 다음 페이지 존재 여부 판단
+    - query의 첫 번째 엔티티에서 정렬 값/id를 읽어 다음 커서 생성
+    """
+    page = KeysetPage()
+    if with_total:
+        page.total, page.total_is_estimate = estimate_count(query)
+
+    if cursor:
+        query = query.filter(_after_cursor(sort_column, id_column, cursor))
+
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1).all()
+    page.has_more = len(rows) > limit
+    page.items = rows[:limit]
+    if page.has_more:
+        last = page.items[-1]
+        page.next_cursor = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    return page
@@ -3,6 +3,7 @@ from datetime import date
 from sqlalchemy.orm import Session
 from app.models.roasting_log import RoastingLog
 from app.repositories.base_repository import BaseRepository
+from app.repositories.pagination import KeysetPage, paginate_keyset
 from app.schemas.roasting import RoastingLogCreate
 
 
@@ -10,13 +11,7 @@ class RoastingLogRepository(BaseRepository[RoastingLog, RoastingLogCreate, Roast
     def __init__(self, db: Session):
         super().__init__(RoastingLog, db)
 
-    def get_multi(
-        self,
-        skip: int = 0,
-        limit: int = 100,
-        filters: Optional[Dict[str, Any]] = None
-    ) -> List[RoastingLog]:
-        """다중 조회 with Filters"""
+    def _filtered_query(self, filters: Optional[Dict[str, Any]] = None):
         query = self.db.query(self.model)
 
         if filters:
@@ -33,14 +28,35 @@ class RoastingLogRepository(BaseRepository[RoastingLog, RoastingLogCreate, Roast
                 # Join Bean table to filter by name if needed, but bean_id is preferred
                 pass
 
-        return query.order_by(self.model.roast_date.desc()).offset(skip).limit(limit).all()
+        return query
+
+    def get_multi(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[RoastingLog]:
+        """다중 조회 with Filters"""
+        return (
+            self._filtered_query(filters)
+            .order_by(self.model.roast_date.desc(), self.model.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
-    def get_latest_batch_no(self) -> Optional[str]:
-        """가장 최근 batch_no 조회"""
-        latest = self.db.query(self.model).order_by(self.model.id.desc()).first()
-        if latest:
-            return str(latest.batch_no) if latest.batch_no else None
-        return None
+    def get_multi_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        with_total: bool = False,
+    ) -> KeysetPage:
+        """(roast_date, id) 커서 기반 조회"""
+        return paginate_keyset(
+            self._filtered_query(filters), self.model.roast_date, self.model.id,
+            limit, cursor, with_total,
+        )
 
     def get_daily_production_stats(
         self,
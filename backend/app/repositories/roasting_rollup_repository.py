@@ -0,0 +1,124 @@
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean
+from app.models.roasting_daily_rollup import RoastingDailyRollup
+from app.models.roasting_log import RoastingLog
+from app.utils.timezone import get_kst_now
+
+_SUM_COLUMNS = (
+    "output_weight_sum",
+    "input_weight_sum",
+    "batch_count",
+    "loss_rate_sum",
+    "production_cost_sum",
+)
+
+
+class RoastingRollupRepository:
+    """
+    일별·원두별 로스팅 집계 (roasting_daily_rollup)
+    - 로스팅 로그 기록 시 INSERT ... ON CONFLICT DO UPDATE로 증분 갱신
+    - commit은 호출하는 Service에서 처리 (flush만 수행)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _roast_day(log: RoastingLog) -> date:
+        roast_date = log.roast_date or get_kst_now()
+        return roast_date.date() if isinstance(roast_date, datetime) else roast_date
+
+    @staticmethod
+    def _aggregate(logs: Iterable[RoastingLog]) -> Dict[Tuple[date, int], Dict[str, float]]:
+        groups: Dict[Tuple[date, int], Dict[str, float]] = {}
+        for log in logs:
+            key = (RoastingRollupRepository._roast_day(log), log.target_bean_id)
+            sums = groups.setdefault(key, {column: 0 for column in _SUM_COLUMNS})
+            sums["output_weight_sum"] += log.output_weight_total or 0.0
+            sums["input_weight_sum"] += log.input_weight_total or 0.0
+            sums["batch_count"] += 1
+            sums["loss_rate_sum"] += log.loss_rate or 0.0
+            sums["production_cost_sum"] += log.production_cost or 0.0
+        return groups
+
+    def add_logs(self, logs: Iterable[RoastingLog]) -> None:
+        """로스팅 로그를 (일자, 원두) 단위로 묶어 집계에 더함"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        now = get_kst_now()
+        for (rollup_date, bean_id), sums in self._aggregate(logs).items():
+            stmt = insert(RoastingDailyRollup).values(
+                rollup_date=rollup_date, bean_id=bean_id, updated_at=now, **sums
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["rollup_date", "bean_id"],
+                set_={
+                    **{
+                        column: getattr(RoastingDailyRollup, column)
+                        + getattr(stmt.excluded, column)
+                        for column in _SUM_COLUMNS
+                    },
+                    "updated_at": now,
+                },
+            )
+            self.db.execute(stmt)
+
+    def rebuild(self) -> None:
+        """roasting_logs 전체로 집계 재생성 (최초 도입 시 backfill)"""
+        self.db.query(RoastingDailyRollup).delete(synchronize_session=False)
+        logs = self.db.query(RoastingLog).yield_per(500)
+        self.add_logs(logs)
+        self.db.flush()
+
+    def is_empty(self) -> bool:
+        return self.db.query(RoastingDailyRollup.rollup_date).first() is None
+
+    def record_logs(self, logs: Iterable[RoastingLog]) -> None:
+        """
+        새로 기록된(flush된) 로스팅 로그를 집계에 반영
+        - 집계가 아직 비어 있으면 기존 로그까지 포함해 전체 재생성 (새 로그도 포함됨)
+        """
+        if self.is_empty():
+            self.rebuild()
+        else:
+            self.add_logs(logs)
+
+    def ensure_backfilled(self) -> None:
+        """집계가 비어 있는데 로스팅 로그가 있으면 재생성"""
+        if self.is_empty() and self.db.query(RoastingLog.id).first() is not None:
+            self.rebuild()
+
+    def get_daily_production_stats(self, start_date: date, end_date: date) -> List[Any]:
+        """일별 생산량 집계 - Returns list of (date, total_weight, batch_count)"""
+        return (
+            self.db.query(
+                RoastingDailyRollup.rollup_date.label("date"),
+                func.sum(RoastingDailyRollup.output_weight_sum).label("total_weight"),
+                func.sum(RoastingDailyRollup.batch_count).label("batch_count"),
+            )
+            .filter(RoastingDailyRollup.rollup_date.between(start_date, end_date))
+            .group_by(RoastingDailyRollup.rollup_date)
+            .order_by(RoastingDailyRollup.rollup_date)
+            .all()
+        )
+
+    def get_bean_usage_stats(self, start_date: date, end_date: date) -> List[Any]:
+        """원두별 생산 비중 집계 - Returns list of (bean_name, total_output)"""
+        return (
+            self.db.query(
+                Bean.name,
+                func.sum(RoastingDailyRollup.output_weight_sum).label("total_output"),
+            )
+            .join(Bean, RoastingDailyRollup.bean_id == Bean.id)
+            .filter(RoastingDailyRollup.rollup_date.between(start_date, end_date))
+            .group_by(Bean.name)
+            .all()
+        )
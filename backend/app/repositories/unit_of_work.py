@@ -0,0 +1,43 @@
+from sqlalchemy.orm import Session
+
+_UOW_DEPTH_KEY = "unit_of_work_depth"
+
+
+def is_unit_of_work_active(db: Session) -> bool:
+    """현재 세션이 Unit of Work 안에 있는지 여부"""
+    return db.info.get(_UOW_DEPTH_KEY, 0) > 0
+
+
+class UnitOfWork:
+    """
+    요청 단위 트랜잭션 (Unit of Work)
+
+    블록 안에서는 Repository의 create/update/remove가 commit 대신 flush만 수행하고,
+    가장 바깥 블록이 끝날 때 한 번만 commit 한다. 예외 발생 시 전체 rollback.
+    블록 밖에서는 기존처럼 호출마다 commit 한다.
+
+        with UnitOfWork(db):
+            repo.create(...)
+            repo.update(...)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def __enter__(self) -> "UnitOfWork":
+        self.db.info[_UOW_DEPTH_KEY] = self.db.info.get(_UOW_DEPTH_KEY, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        depth = self.db.info.get(_UOW_DEPTH_KEY, 1) - 1
+        if depth > 0:
+            # 중첩된 블록: 바깥 블록이 commit/rollback 담당
+            self.db.info[_UOW_DEPTH_KEY] = depth
+            return False
+
+        self.db.info.pop(_UOW_DEPTH_KEY, None)
+        if exc_type is None:
+            self.db.commit()
+        else:
+            self.db.rollback()
+        return False
@@ -37,14 +37,47 @@ class ImageProcessingSection(BaseModel):
 class OCRPromptStructure(BaseModel):
     """OCR 프롬프트 구조"""
 
+    # 필드 순서 = 프롬프트 스키마의 키 순서 (응답 스트리밍 시 품목/공급자/금액이 긴 원문보다 먼저 도착하도록
+    # debug_raw_text 는 마지막)
     error: Optional[Any] = None
-    debug_raw_text: str
     document_info: Dict[str, str]
     supplier: Dict[str, str]
     receiver: Dict[str, str]
     amounts: Dict[str, str]
     items: List[Dict[str, Any]]
     additional_info: Dict[str, str]
+    debug_raw_text: str
+
+
+class OCRHedgingConfig(BaseModel):
+    """OCR 헤징 설정 (주 모델 응답 지연 시 다음 모델 병렬 요청)"""
+
+    enabled: bool = False
+    percentile: float = Field(0.9, gt=0, le=1)  # 모델별 응답 시간 백분위를 대기 기준으로 사용
+    default_delay_seconds: float = 10.0  # 샘플이 부족할 때 대기 시간
+    min_delay_seconds: float = 2.0
+    min_samples: int = 5
+    max_parallel: int = Field(2, ge=1)
+
+
+class OCRModelRateLimit(BaseModel):
+    """모델별 호출 한도 (rpm/tpm 이 없으면 무제한)"""
+
+    rpm: Optional[int] = Field(None, gt=0)  # 분당 요청 수
+    tpm: Optional[int] = Field(None, gt=0)  # 분당 토큰 수
+    max_concurrency: int = Field(4, ge=1)
+    min_concurrency: int = Field(1, ge=1)
+
+
+class OCRRateLimitConfig(BaseModel):
+    """OCR 호출 한도 설정 (토큰 버킷 + AIMD 동시 실행 제한)"""
+
+    enabled: bool = False
+    image_tokens: int = 1600  # 이미지 1장 예상 입력 토큰
+    output_tokens: int = 2000  # 예상 출력 토큰
+    decrease_factor: float = Field(0.5, gt=0, lt=1)  # 429/529 시 동시 실행 수 감소 배율
+    default: OCRModelRateLimit = Field(default_factory=OCRModelRateLimit)
+    models: Dict[str, OCRModelRateLimit] = Field(default_factory=dict)
 
 
 class OCRConfig(BaseModel):
@@ -52,6 +85,8 @@ class OCRConfig(BaseModel):
 
     model_priority_rule: Optional[str] = Field(None, alias="_model_priority_rule")
     model_priority: List[str]
+    hedging: OCRHedgingConfig = Field(default_factory=OCRHedgingConfig)
+    rate_limits: OCRRateLimitConfig = Field(default_factory=OCRRateLimitConfig)
     prompt_structure: OCRPromptStructure
 
 
@@ -52,6 +52,14 @@ class AmountsInfo(BaseModel):
     currency: Optional[str] = None
 
 
+class BeanMatchCandidate(BaseModel):
+    """유사 일치 생두 후보"""
+
+    bean_id: int
+    name: str
+    score: float  # 0~1 (1 - 편집 거리 / 생두명 길이)
+
+
 class OCRItem(BaseModel):
     """품목 정보 (확장)"""
 
@@ -72,7 +80,10 @@ class OCRItem(BaseModel):
     matched: Optional[bool] = None  # 기존 생두와 매칭 여부
     match_field: Optional[str] = None  # 매칭된 필드: "name", "name_en", "name_ko", "new"
     match_method: Optional[str] = None  # 매칭 방법: "exact", "case_insensitive", "new"
-    bean_id: Optional[int] = None  # 매칭된 생두 ID (matched=True일 때)
+    # 매칭된 생두 ID (matched=True일 때), 확정 요청에서는 검토 화면에서 후보 중 선택한 생두 ID
+    bean_id: Optional[int] = None
+    match_score: Optional[float] = None  # 매칭 점수 (정확/대소문자 무시 일치는 1.0)
+    match_candidates: List[BeanMatchCandidate] = []  # 유사 일치 후보 (자동 매칭하지 않음, 검토 화면에서 선택)
 
 
 class AdditionalInfo(BaseModel):
@@ -211,7 +222,60 @@ class PaginatedInboundResponse(BaseModel):
     total_pages: int
 
 
+class CursorInboundResponse(BaseModel):
+    """명세서 목록 응답 (커서 페이징)"""
+
+    items: List[InboundDocument]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
 class InboundConfirmResponse(BaseModel):
     status: str
     document_id: int
     supplier_id: int
+
+
+class InboundJobSummary(BaseModel):
+    """일괄 분석 작업 요약"""
+
+    id: int
+    source_type: str
+    source: str
+    status: str
+    progress_message: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class InboundJobDetail(InboundJobSummary):
+    """일괄 분석 작업 상세 (완료 시 OCRResponse 결과 포함)"""
+
+    batch_id: str
+    result: Optional[OCRResponse] = None
+
+
+class InboundBatchSubmitResponse(BaseModel):
+    batch_id: str
+    jobs: List[InboundJobSummary]
+
+
+class InboundBatchStatusResponse(BaseModel):
+    """일괄 분석 진행 상황"""
+
+    batch_id: str
+    total: int
+    finished: int
+    completed: int
+    failed: int
+    done: bool
+    status_counts: dict
+    jobs: List[InboundJobSummary]
@@ -41,3 +41,13 @@ class InventoryLogListResponse(BaseModel):
     page: int
     size: int
     pages: int
+
+
+class InventoryLogCursorResponse(BaseModel):
+    """입출고 기록 목록 응답 (커서 페이징)"""
+
+    items: List[InventoryLog]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total: Optional[int] = None
+    total_is_estimate: bool = False
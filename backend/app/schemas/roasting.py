@@ -4,9 +4,9 @@ Ref: Documents/Planning/Themoon_Rostings_v2.md
 """
 
 from datetime import datetime, date
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.bean import RoastProfile
 from app.schemas.bean import Bean
@@ -42,6 +42,58 @@ class BlendRoastingRequest(BaseModel):
     notes: Optional[str] = Field(None, description="로스팅 노트")
 
 
+class BulkRoastingBatch(BaseModel):
+    """일괄 로스팅 배치 항목 (싱글 오리진 또는 블렌드)"""
+
+    roasting_type: Literal["single_origin", "blend"] = Field(..., description="로스팅 유형")
+    green_bean_id: Optional[int] = Field(None, description="생두 ID (싱글 오리진)")
+    blend_id: Optional[int] = Field(None, description="블렌드 ID (블렌드)")
+    input_weight: Optional[float] = Field(None, gt=0, description="생두 투입량 (kg), 블렌드는 생략 시 자동 계산")
+    output_weight: float = Field(..., ge=0, description="원두 생산량 (kg)")
+    roast_profile: Optional[RoastProfile] = Field(None, description="로스팅 프로필 (싱글 오리진)")
+    roasting_time: Optional[int] = Field(None, description="로스팅 소요 시간 (초)")
+    ambient_temp: Optional[float] = Field(None, description="실내 온도 (섭씨)")
+    humidity: Optional[float] = Field(None, description="실내 습도 (%)")
+    notes: Optional[str] = Field(None, description="로스팅 노트")
+
+    @model_validator(mode="after")
+    def check_required_fields(self):
+        if self.roasting_type == "single_origin":
+            if self.green_bean_id is None or self.input_weight is None or self.roast_profile is None:
+                raise ValueError("single_origin 배치는 green_bean_id, input_weight, roast_profile이 필요합니다")
+        elif self.blend_id is None:
+            raise ValueError("blend 배치는 blend_id가 필요합니다")
+        return self
+
+
+class BulkRoastingRequest(BaseModel):
+    """일괄 로스팅 요청 (하루치 생산 기록)"""
+
+    batches: List[BulkRoastingBatch] = Field(..., min_length=1, description="로스팅 배치 목록")
+
+
+class BulkRoastingResult(BaseModel):
+    """일괄 로스팅 배치별 결과"""
+
+    index: int = Field(..., description="요청 내 배치 순번 (0부터)")
+    roasting_type: str
+    batch_no: str = Field(..., description="생산 배치 번호")
+    roasted_bean_id: int
+    roasted_bean_name: str
+    input_weight: float = Field(..., description="생두 투입량 (kg)")
+    output_weight: float = Field(..., description="원두 생산량 (kg)")
+    loss_rate_percent: float = Field(..., description="손실률 (%)")
+    production_cost: float = Field(..., description="생산 원가 (원/kg)")
+
+
+class BulkRoastingResponse(BaseModel):
+    """일괄 로스팅 결과 응답"""
+
+    success: bool = True
+    message: str
+    results: List[BulkRoastingResult]
+
+
 class RoastingResponse(BaseModel):
     """로스팅 결과 응답"""
 
@@ -104,6 +156,16 @@ class RoastingLog(RoastingLogBase):
         from_attributes = True
 
 
+class RoastingLogCursorResponse(BaseModel):
+    """로스팅 이력 응답 (커서 페이징)"""
+
+    items: List[RoastingLog]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
 class RoastingLogDetail(RoastingLog):
     """로스팅 로그 상세 정보 (재고 로그 포함)"""
     inventory_logs: List[InventoryLog] = []
@@ -0,0 +1,479 @@
+"""
+생두 이름 매칭 인덱스 (In-process)
+
+명세서 품목명 → 생두 매칭을 품목마다 DB 조회
+(name/name_en/name_ko × 정확/대소문자 무시, 최대 6회) 대신 메모리 인덱스 한 번으로 처리한다.
+- 정규화: 한글 NFC + casefold + 공백 제거 ("Ethiopia  Yirgacheffe" == "ethiopiayirgacheffe")
+- 우선순위는 기존과 동일
+  정확 일치(name → name_en → name_ko) → 정규화 일치(name → name_en → name_ko),
+  같은 키에 여러 생두가 있으면 id 가 작은 생두
+- 유사 일치(fuzzy): 위에서 못 찾으면 한글을 자모로 분해한 문자 bigram 역색인으로
+  후보를 좁힌 뒤 점수화 (띄어쓰기/오타/접두·접미사 차이: "예가채프" → "예가체프")
+  · 점수: 1 - 편집 거리 / 긴 쪽 길이
+    (양방향: 품목명의 남는 글자도 감점, "Brazil Santos NY2" ≠ "Brazil")
+  · 품목명에 숫자(등급/스크린 등)가 있으면 생두 이름의 숫자가 모두 들어 있어야 후보 ("G1" ≠ "G2")
+  · BEAN_FUZZY_MATCH_THRESHOLD 이상인 생두를 후보로만 반환 (자동 매칭하지 않음, 검토 화면에서 선택)
+    1위와 BEAN_FUZZY_MATCH_MARGIN 이상 차이나는 후보는 제외
+  · 편집 거리는 bigram 차이로 구한 상한이 기준을 넘는 상위 몇 개 후보만 계산
+    → 생두 수천 개에서도 품목당 1ms 미만 (생두 쌍마다 편집 거리를 구하지 않음)
+- 가격표 일괄 확인(check-batch)용 조회 테이블도 같은 스냅샷에서 처음 사용할 때 만든다
+  (_BatchCheckIndex)
+- 무효화: 생두 이름(name/name_en/name_ko) 변경이 commit 되면 다음 조회 때 재생성
+  (재고 수량만 바뀌는 쓰기는 무시)
+- 다른 프로세스의 변경은 BEAN_NAME_INDEX_TTL_SECONDS 후 반영
+  (verify=True 조회는 생두 수/최대 id 로 즉시 확인)
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.bean import Bean
+
+logger = logging.getLogger(__name__)
+
+MATCH_FIELDS = ("name", "name_en", "name_ko")
+_DIRTY_KEY = "bean_name_index_dirty"
+_WHITESPACE = re.compile(r"\s+")
+_NON_WORD = re.compile(r"[\W_]+")
+_DIGITS = re.compile(r"\d+")
+NGRAM_SIZE = 2
+FUZZY_MIN_KEY_LENGTH = 4  # 이보다 짧은 이름(자모 기준)은 유사 일치 대상에서 제외 ("AA", "G1")
+FUZZY_VERIFY_LIMIT = 8  # 편집 거리를 계산할 최대 후보 수
+FUZZY_CANDIDATE_LIMIT = 3
+
+
+def normalize_bean_name(value: Optional[str]) -> str:
+    """매칭용 정규화 키 (NFC + casefold + 공백 제거)"""
+    if not value:
+        return ""
+    return _WHITESPACE.sub("", unicodedata.normalize("NFC", value).casefold())
+
+
+def fuzzy_key(value: Optional[str]) -> str:
+    """유사 일치용 키 (공백/구두점 제거 + casefold 후 한글을 자모로 분해)"""
+    if not value:
+        return ""
+    return unicodedata.normalize(
+        "NFD", _NON_WORD.sub("", unicodedata.normalize("NFC", value).casefold())
+    )
+
+
+def _ngrams(key: str) -> frozenset:
+    if len(key) <= NGRAM_SIZE:
+        return frozenset([key]) if key else frozenset()
+    return frozenset(key[i : i + NGRAM_SIZE] for i in range(len(key) - NGRAM_SIZE + 1))
+
+
+def _max_edits(length: int, threshold: float) -> int:
+    """길이 length 인 두 키 중 긴 쪽 기준으로 점수 threshold 이상이 되기 위한 최대 편집 횟수"""
+    return math.floor((1 - threshold) * length + 1e-9)
+
+
+def _max_edits_for_entry(length: int, threshold: float) -> int:
+    """
+    생두명 길이만 알 때 허용되는 최대 편집 횟수 (역색인 등록용)
+    품목명이 더 길면 길이 차이만큼 편집이 늘어나므로 d ≤ (1 - t)(L + d) → d ≤ (1 - t) / t · L
+    """
+    return math.floor((1 - threshold) / threshold * length + 1e-9)
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    편집 거리 (Levenshtein)
+    - limit 을 넘는 것이 확실해지면 계산을 멈추고 limit + 1 반환
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j - 1] + (x != y), previous[j] + 1, current[j - 1] + 1))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+@dataclass(frozen=True)
+class BeanCandidate:
+    bean_id: int
+    name: str
+    field: str
+    score: float
+
+
+@dataclass(frozen=True)
+class BeanNameMatch:
+    bean_id: Optional[int]
+    name: Optional[str]  # 매칭된 생두의 대표명 (로그용)
+    field: str  # "name", "name_en", "name_ko", "new"
+    method: str  # "exact", "case_insensitive", "new"
+    score: Optional[float] = None  # 유사도 (정확/정규화 일치는 1.0)
+    candidates: Tuple[
+        BeanCandidate, ...
+    ] = ()  # 매칭되지 않은 경우의 유사 일치 후보 (점수 내림차순)
+
+    @property
+    def matched(self) -> bool:
+        return self.bean_id is not None
+
+
+NO_MATCH = BeanNameMatch(None, None, "new", "new")
+
+
+class _FuzzyEntry:
+    __slots__ = ("bean_id", "name", "field", "key", "grams", "digits")
+
+    def __init__(self, bean_id: int, name: str, field: str, key: str, digits: frozenset):
+        self.bean_id = bean_id
+        self.name = name
+        self.field = field
+        self.key = key
+        self.grams = _ngrams(key)
+        self.digits = digits  # 생두의 모든 이름에 나온 숫자
+
+
+class _BatchCheckIndex:
+    """
+    원두 일괄 확인(POST /beans/check-batch)용 조회 테이블 - 기존 전체 순회와 같은 결과
+    - 정확 일치: name_ko(공백 제거) 또는 name_en/name(소문자, 공백 제거)이 입력과 같으면
+      순서상 첫 생두
+    - 아니면 name_ko(공백 제거, 대소문자 유지)에 입력이 포함된 생두 중 순서상 마지막 생두
+      (입력의 bigram 중 가장 드문 것의 목록만 뒤에서부터 확인)
+    """
+
+    def __init__(self, rows: List[Tuple[int, str, Optional[str], Optional[str]]]):
+        self.beans: List[Tuple[int, str]] = []  # 위치 → (id, 표시 이름)
+        self.exact: Dict[str, int] = {}
+        self.texts: Dict[int, str] = {}  # 위치 → 공백 제거한 name_ko
+        self.with_name_ko: List[int] = []
+        self.chars: Dict[str, List[int]] = {}
+        self.pairs: Dict[str, List[int]] = {}
+        for position, (bean_id, name, name_en, name_ko) in enumerate(rows):
+            self.beans.append((bean_id, name_ko or name))
+            keys = []
+            if name_ko:
+                keys.append(name_ko.strip().replace(" ", ""))
+            if name_en:
+                keys.append(name_en.strip().lower().replace(" ", ""))
+            if name:
+                keys.append(name.strip().lower().replace(" ", ""))
+            for key in keys:
+                self.exact.setdefault(key, position)
+
+            if name_ko:
+                text = name_ko.replace(" ", "")
+                self.texts[position] = text
+                self.with_name_ko.append(position)
+                for char in set(text):
+                    self.chars.setdefault(char, []).append(position)
+                for pair in {text[i : i + 2] for i in range(len(text) - 1)}:
+                    self.pairs.setdefault(pair, []).append(position)
+
+    def find(self, name: str) -> Optional[Tuple[int, str]]:
+        key = name.strip().lower().replace(" ", "")
+        position = self.exact.get(key)
+        if position is not None:
+            return self.beans[position]
+
+        if not key:
+            candidates = self.with_name_ko
+        elif len(key) == 1:
+            candidates = self.chars.get(key, [])
+        else:
+            candidates = min(
+                (self.pairs.get(key[i : i + 2], []) for i in range(len(key) - 1)), key=len
+            )
+        for position in reversed(candidates):
+            if key in self.texts[position]:
+                return self.beans[position]
+        return None
+
+
+class _Snapshot:
+    """생두 이름 → (id, 대표명) 조회 테이블 + n-gram 역색인 (생성 후 변경하지 않음)"""
+
+    def __init__(
+        self,
+        rows: Iterable[Tuple[int, str, Optional[str], Optional[str]]],
+        fuzzy_threshold: Optional[float] = None,
+        fuzzy_margin: float = 0.0,
+    ):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzzy_margin = fuzzy_margin
+        self.exact: Dict[str, Dict[str, Tuple[int, str]]] = {field: {} for field in MATCH_FIELDS}
+        self.normalized: Dict[str, Dict[str, Tuple[int, str]]] = {
+            field: {} for field in MATCH_FIELDS
+        }
+        self.entries: List[_FuzzyEntry] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.count = 0
+        self.max_id = 0
+        self.rows = sorted(rows, key=lambda r: r[0])
+        self._batch_check: Optional[_BatchCheckIndex] = None
+        for row in self.rows:
+            bean_id, name = row[0], row[1]
+            self.count += 1
+            self.max_id = max(self.max_id, bean_id)
+            fuzzy_keys: Dict[str, str] = {}
+            for field, value in zip(MATCH_FIELDS, row[1:]):
+                if not value:
+                    continue
+                self.exact[field].setdefault(value, (bean_id, name))
+                key = normalize_bean_name(value)
+                if key:
+                    self.normalized[field].setdefault(key, (bean_id, name))
+                fuzzy_keys.setdefault(fuzzy_key(value), field)
+            digits = frozenset(d for key in fuzzy_keys for d in _DIGITS.findall(key))
+            for key, field in fuzzy_keys.items():
+                if len(key) >= FUZZY_MIN_KEY_LENGTH:
+                    self.entries.append(_FuzzyEntry(bean_id, name, field, key, digits))
+        if fuzzy_threshold:
+            self._build_postings(fuzzy_threshold)
+        self.built_at = time.monotonic()
+
+    @property
+    def batch_check(self) -> _BatchCheckIndex:
+        if self._batch_check is None:
+            self._batch_check = _BatchCheckIndex(self.rows)
+        return self._batch_check
+
+    def _build_postings(self, threshold: float) -> None:
+        """
+        역색인에는 이름마다 가장 드문 bigram 2·E + 1 개만 등록
+        (E = 허용 편집 횟수, prefix filtering)
+        - 편집 1회는 bigram 을 최대 2개 바꾸므로, 이 중 하나도 품목명에 없으면 편집이 E 회를 넘는다
+        - "에티오피아"처럼 흔한 bigram 의 긴 목록을 조회하지 않아도 후보를 놓치지 않음
+        """
+        frequency = Counter(gram for entry in self.entries for gram in entry.grams)
+        for position, entry in enumerate(self.entries):
+            prefix = 2 * _max_edits_for_entry(len(entry.key), threshold) + 1
+            for gram in sorted(entry.grams, key=lambda g: (frequency[g], g))[:prefix]:
+                self.postings.setdefault(gram, []).append(position)
+
+    def fuzzy(self, bean_name: str, limit: int = FUZZY_CANDIDATE_LIMIT) -> List[BeanCandidate]:
+        """유사 일치 후보 (threshold 이상, 생두별 최고 점수, 점수 내림차순)"""
+        return [
+            BeanCandidate(entry.bean_id, entry.name, entry.field, round(score, 4))
+            for score, entry in self._rank_fuzzy(bean_name)[:limit]
+        ]
+
+    def _rank_fuzzy(self, bean_name: str) -> List[Tuple[float, _FuzzyEntry]]:
+        """
+        유사 일치 (점수, 이름) 목록
+        - 한쪽에만 있는 bigram 수 m, 길이 차이 Δ 로 편집 거리 ≥ max(⌈m/2⌉, Δ) → 점수 상한을 구해
+          상한이 높은 후보부터 최대 FUZZY_VERIFY_LIMIT 개만 편집 거리 계산
+        """
+        threshold = self.fuzzy_threshold
+        key = fuzzy_key(bean_name)
+        grams = _ngrams(key)
+        if not threshold or not grams:
+            return []
+        digits = frozenset(_DIGITS.findall(key))
+
+        positions = set()
+        for gram in grams:
+            positions.update(self.postings.get(gram, ()))
+
+        bounded = []
+        for position in positions:
+            entry = self.entries[position]
+            # 품목명에 숫자가 있으면 생두 이름의 숫자가 모두 들어 있어야 함
+            if digits and not entry.digits <= digits:
+                continue
+            longest = max(len(key), len(entry.key))
+            missing = max(len(entry.grams - grams), len(grams - entry.grams))
+            lower = max(math.ceil(missing / NGRAM_SIZE), abs(len(key) - len(entry.key)))
+            upper = 1 - lower / longest
+            if upper >= threshold:
+                bounded.append((upper, len(entry.key), position))
+        bounded.sort(reverse=True)
+
+        best: Dict[int, Tuple[float, _FuzzyEntry]] = {}
+        top_score = 0.0
+        for upper, _, position in bounded[:FUZZY_VERIFY_LIMIT]:
+            if upper < top_score - self.fuzzy_margin:
+                break  # 남은 후보는 1위와 경합할 수 없음
+            entry = self.entries[position]
+            longest = max(len(key), len(entry.key))
+            limit = _max_edits(longest, threshold)
+            if entry.key in key or key in entry.key:
+                distance = abs(len(key) - len(entry.key))  # 앞뒤 글자 추가/삭제만
+            else:
+                distance = _edit_distance(entry.key, key, limit)
+            if distance > limit:
+                continue
+            score = 1 - distance / longest
+            current = best.get(entry.bean_id)
+            if current is None or (score, len(entry.key)) > (current[0], len(current[1].key)):
+                best[entry.bean_id] = (score, entry)
+            top_score = max(top_score, score)
+
+        # 같은 점수면 더 긴(구체적인) 이름 우선, 1위와 margin 이상 차이나는 후보 제외
+        ranked = sorted(
+            best.values(), key=lambda item: (-item[0], -len(item[1].key), item[1].bean_id)
+        )
+        return [item for item in ranked if item[0] >= top_score - self.fuzzy_margin]
+
+    def match(self, bean_name: Optional[str]) -> BeanNameMatch:
+        if not bean_name:
+            return NO_MATCH
+        for field in MATCH_FIELDS:
+            hit = self.exact[field].get(bean_name)
+            if hit:
+                return BeanNameMatch(hit[0], hit[1], field, "exact", 1.0)
+        key = normalize_bean_name(bean_name)
+        if key:
+            for field in MATCH_FIELDS:
+                hit = self.normalized[field].get(key)
+                if hit:
+                    return BeanNameMatch(hit[0], hit[1], field, "case_insensitive", 1.0)
+
+        # 유사 일치는 자동 매칭하지 않음: 후보만 제공하고 검토 화면에서 사용자가 선택
+        candidates = tuple(self.fuzzy(bean_name))
+        if not candidates:
+            return NO_MATCH
+        return BeanNameMatch(None, None, "new", "new", candidates=candidates)
+
+
+class BeanNameIndex:
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        fuzzy_threshold: Optional[float] = 0.85,
+        fuzzy_margin: float = 0.05,
+    ):
+        self.ttl = ttl
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzzy_margin = fuzzy_margin
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self._bind_ref: Optional[weakref.ref] = None
+        # 무효화 세대: 재생성 도중 무효화가 일어나면 그 결과는 보관하지 않음
+        self._generation = 0
+        self._stats = {"lookups": 0, "rebuilds": 0, "invalidations": 0}
+
+    def _snapshot_from(
+        self, rows: Iterable[Tuple[int, str, Optional[str], Optional[str]]]
+    ) -> _Snapshot:
+        return _Snapshot(rows, self.fuzzy_threshold, self.fuzzy_margin)
+
+    def _load(self, db: Session) -> _Snapshot:
+        return self._snapshot_from(db.query(Bean.id, Bean.name, Bean.name_en, Bean.name_ko).all())
+
+    def snapshot(self, db: Session, verify: bool = False) -> _Snapshot:
+        """
+        현재 인덱스 (없거나 만료/무효화되었으면 재생성)
+        - 세션에 아직 commit 되지 않은 생두 이름 변경이 있으면 그 세션 전용으로 새로 만든다
+        - verify=True: 생두 수/최대 id 를 조회해 다른 프로세스의 추가/삭제를 확인
+        """
+        if db.info.get(_DIRTY_KEY):
+            return self._load(db)
+
+        bind = db.get_bind()
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and (
+                self._bind_ref is None
+                or self._bind_ref() is not bind
+                or time.monotonic() - snapshot.built_at > self.ttl
+            ):
+                snapshot = None
+            generation = self._generation
+
+        if snapshot is not None and verify:
+            count, max_id = db.query(func.count(Bean.id), func.max(Bean.id)).one()
+            if (count, max_id or 0) != (snapshot.count, snapshot.max_id):
+                snapshot = None
+
+        if snapshot is None:
+            snapshot = self._load(db)
+            with self._lock:
+                self._stats["rebuilds"] += 1
+                if generation == self._generation:
+                    self._snapshot = snapshot
+                    self._bind_ref = weakref.ref(bind)
+            logger.debug(f"Bean name index rebuilt: {snapshot.count} beans")
+        return snapshot
+
+    def match_many(
+        self, bean_names: List[Optional[str]], db: Session, verify: bool = False
+    ) -> List[BeanNameMatch]:
+        """품목명 목록을 한 번에 매칭 (입력 순서대로 결과 반환)"""
+        snapshot = self.snapshot(db, verify=verify)
+        with self._lock:
+            self._stats["lookups"] += len(bean_names)
+        return [snapshot.match(name) for name in bean_names]
+
+    def check_many(
+        self, names: List[str], db: Session, verify: bool = True
+    ) -> List[Optional[Tuple[int, str]]]:
+        """원두 일괄 확인: 이름별 (id, 표시 이름) 또는 None (_BatchCheckIndex 규칙)"""
+        batch_check = self.snapshot(db, verify=verify).batch_check
+        with self._lock:
+            self._stats["lookups"] += len(names)
+        return [batch_check.find(name) for name in names]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self._stats,
+                "size": self._snapshot.count if self._snapshot else 0,
+                "ttl_seconds": self.ttl,
+                "fuzzy_threshold": self.fuzzy_threshold,
+            }
+
+
+bean_name_index = BeanNameIndex(
+    ttl=settings.BEAN_NAME_INDEX_TTL_SECONDS,
+    fuzzy_threshold=settings.BEAN_FUZZY_MATCH_THRESHOLD,
+    fuzzy_margin=settings.BEAN_FUZZY_MATCH_MARGIN,
+)
+
+
+def _names_changed(bean: Bean) -> bool:
+    state = inspect(bean)
+    return any(state.attrs[field].history.has_changes() for field in MATCH_FIELDS)
+
+
+@event.listens_for(Session, "before_flush")
+def _track_bean_name_writes(session: Session, flush_context, instances) -> None:
+    if session.info.get(_DIRTY_KEY):
+        return
+    if any(isinstance(obj, Bean) for obj in session.new) or any(
+        isinstance(obj, Bean) for obj in session.deleted
+    ):
+        session.info[_DIRTY_KEY] = True
+        return
+    if any(isinstance(obj, Bean) and _names_changed(obj) for obj in session.dirty):
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_DIRTY_KEY, None):
+        bean_name_index.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -3,10 +3,12 @@ Bean CRUD 서비스 (Refactored for Clean Architecture)
 
 Ref: Documents/Planning/Themoon_Rostings_v2.md
 """
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from app.models.bean import Bean
 from app.schemas.bean import BeanCreate, BeanUpdate
 from app.repositories.bean_repository import BeanRepository
+from app.services.bean_name_index import bean_name_index
+from app.services.cache_service import cache_service
 
 class BeanService:
     def __init__(self, repository: BeanRepository):
@@ -16,10 +18,18 @@ class BeanService:
         """ID로 원두 조회"""
         return self.repository.get(bean_id)
 
+    def get_beans_by_ids(self, bean_ids: List[int]) -> Dict[int, Bean]:
+        """여러 ID의 원두를 한 번에 조회 (id -> Bean)"""
+        return {bean.id: bean for bean in self.repository.get_by_ids(list(set(bean_ids)))}
+
     def get_bean_by_sku(self, sku: str) -> Optional[Bean]:
         """SKU로 원두 조회"""
         return self.repository.get_by_sku(sku)
 
+    def get_beans_by_skus(self, skus: List[str]) -> Dict[str, Bean]:
+        """여러 SKU의 원두를 한 번에 조회 (sku -> Bean)"""
+        return {bean.sku: bean for bean in self.repository.get_by_skus(list(set(skus)))}
+
     def get_unique_origins(self) -> List[str]:
         """모든 원산지 목록 조회"""
         return self.repository.get_unique_origins()
@@ -47,8 +57,28 @@ class BeanService:
             exclude_blend=exclude_blend,
         )
 
+    def get_beans_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        bean_types: Optional[List[str]] = None,
+        origin: Optional[str] = None,
+        exclude_blend: bool = False,
+    ) -> Tuple[List[Bean], int]:
+        """원두 목록 + 전체 건수 (단일 쿼리)"""
+        return self.repository.search_beans_with_total(
+            skip=skip,
+            limit=limit,
+            search=search,
+            bean_types=bean_types,
+            origin=origin,
+            exclude_blend=exclude_blend,
+        )
+
     def create_bean(self, bean: BeanCreate) -> Bean:
         """새 원두 등록"""
+        cache_service.invalidate_on_commit(self.repository.db, "beans")
         return self.repository.create(bean)
 
     def update_bean(self, bean_id: int, bean: BeanUpdate) -> Optional[Bean]:
@@ -56,10 +86,12 @@ class BeanService:
         db_bean = self.repository.get(bean_id)
         if not db_bean:
             return None
+        cache_service.invalidate_on_commit(self.repository.db, "beans")
         return self.repository.update(db_bean, bean)
 
     def delete_bean(self, bean_id: int) -> bool:
         """원두 삭제"""
+        cache_service.invalidate_on_commit(self.repository.db, "beans")
         obj = self.repository.remove(bean_id)
         return bool(obj)
 
@@ -88,7 +120,8 @@ class BeanService:
         new_quantity = db_bean.quantity_kg + quantity_change
         if new_quantity < 0:
             new_quantity = 0
-            
+
+        cache_service.invalidate_on_commit(self.repository.db, "beans")
         return self.repository.update(db_bean, {"quantity_kg": new_quantity})
 
     def get_total_stock(self) -> float:
@@ -104,40 +137,17 @@ class BeanService:
         return self.repository.count_low_stock_beans(threshold)
 
     def check_existing_beans(self, names: List[str]) -> List[dict]:
-        """여러 원두 이름에 대해 DB 존재 여부 확인"""
+        """여러 원두 이름에 대해 DB 존재 여부 확인 (생두 이름 인덱스로 이름당 해시 조회)"""
         results = []
-        all_beans = self.repository.get_all_for_check()
-
-        for name in names:
-            name_clean = name.strip().lower().replace(" ", "")
-            found = None
-
-            for bean in all_beans:
-                # Check Korean Name
-                if (
-                    bean.name_ko and bean.name_ko.strip().replace(" ", "") == name_clean
-                ):
-                    found = bean
-                    break
-                # Check English Name
-                if bean.name_en and bean.name_en.strip().lower().replace(" ", "") == name_clean:
-                    found = bean
-                    break
-                # Check Main Name
-                if bean.name and bean.name.strip().lower().replace(" ", "") == name_clean:
-                    found = bean
-                    break
-                
-                if bean.name_ko and name_clean in bean.name_ko.replace(" ", ""):
-                    found = bean
-
+        for name, found in zip(names, bean_name_index.check_many(names, self.repository.db)):
             if found:
+                bean_id, bean_name = found
                 results.append(
                     {
                         "input_name": name,
                         "status": "MATCH",
-                        "bean_id": found.id,
-                        "bean_name": found.name_ko or found.name,
+                        "bean_id": bean_id,
+                        "bean_name": bean_name,
                     }
                 )
             else:
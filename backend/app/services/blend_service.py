@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.models.blend import Blend
 from app.schemas.blend import BlendCreate, BlendUpdate
+from app.services.cache_service import cache_service
 
 
 class BlendService:
@@ -20,6 +21,7 @@ class BlendService:
 
         db_blend = Blend(**blend_data)
         db.add(db_blend)
+        cache_service.invalidate_on_commit(db, "blends")
         db.commit()
         db.refresh(db_blend)
         return db_blend
@@ -35,6 +37,7 @@ class BlendService:
         for key, value in update_data.items():
             setattr(db_blend, key, value)
 
+        cache_service.invalidate_on_commit(db, "blends")
         db.commit()
         db.refresh(db_blend)
         return db_blend
@@ -45,6 +48,7 @@ class BlendService:
             return False
 
         db.delete(db_blend)
+        cache_service.invalidate_on_commit(db, "blends")
         db.commit()
         return True
 
@@ -0,0 +1,179 @@
+"""
+조회 결과 캐시 서비스 (In-process TTL + LRU)
+
+대시보드/통계 API처럼 자주 폴링되지만 쓰기 사이에는 결과가 바뀌지 않는 조회를 메모리에 보관한다.
+- 키: namespace(엔드포인트) + 정규화된 파라미터
+- 용량 초과 시 가장 오래 사용되지 않은 항목부터 제거 (LRU), 항목별 TTL 만료
+- 쓰기 서비스가 태그(beans, blends, inventory, roasting, inbound) 단위로 무효화
+  → 트랜잭션 commit 이후에 무효화되도록 invalidate_on_commit 사용
+"""
+
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PENDING_TAGS_KEY = "cache_pending_invalidations"
+
+
+def _normalize(value: Any) -> Hashable:
+    """캐시 키용 파라미터 정규화"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(sorted((_normalize(v) for v in value), key=repr))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    return value
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "tags")
+
+    def __init__(self, value: Any, expires_at: float, tags: frozenset):
+        self.value = value
+        self.expires_at = expires_at
+        self.tags = tags
+
+
+class CacheService:
+    def __init__(self, max_entries: int = 256, default_ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 무효화 세대: 조회 도중 무효화가 일어나면 그 결과는 저장하지 않음
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @staticmethod
+    def make_key(namespace: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+        return (namespace, _normalize(params or {}))
+
+    def get_or_set(
+        self,
+        namespace: str,
+        params: Optional[Dict[str, Any]],
+        loader: Callable[[], Any],
+        tags: Iterable[str] = (),
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """캐시 조회, 없거나 만료되었으면 loader 실행 후 저장"""
+        key = self.make_key(namespace, params)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry.value
+                del self._entries[key]
+                self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            generation = self._generation
+
+        value = loader()
+
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = _Entry(value, expires_at, frozenset(tags))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return value
+
+    def cached(self, namespace: str, tags: Iterable[str] = (), ttl: Optional[float] = None):
+        """
+        함수/메서드 결과 캐시 데코레이터
+        - 키는 인자 값으로 만들며 db 세션과 self는 제외
+        """
+        tags = tuple(tags)
+
+        def decorator(func):
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                params = {
+                    name: value
+                    for name, value in bound.arguments.items()
+                    if name not in ("self", "db")
+                }
+                return self.get_or_set(
+                    namespace, params, lambda: func(*args, **kwargs), tags=tags, ttl=ttl
+                )
+
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, *tags: str) -> int:
+        """태그가 하나라도 겹치는 항목 제거, 제거된 개수 반환"""
+        targets = set(tags)
+        with self._lock:
+            self._generation += 1
+            keys = [key for key, entry in self._entries.items() if entry.tags & targets]
+            for key in keys:
+                del self._entries[key]
+            self._stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def invalidate_on_commit(self, db: Session, *tags: str) -> None:
+        """세션의 다음 commit 이후 무효화 (rollback 시 취소)"""
+        db.info.setdefault(_PENDING_TAGS_KEY, set()).update(tags)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 캐시 지표"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "default_ttl_seconds": self.default_ttl,
+            }
+
+
+cache_service = CacheService(
+    max_entries=settings.CACHE_MAX_ENTRIES, default_ttl=settings.CACHE_TTL_SECONDS
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    tags = session.info.pop(_PENDING_TAGS_KEY, None)
+    if tags:
+        cache_service.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_TAGS_KEY, None)
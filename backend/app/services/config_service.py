@@ -1,7 +1,7 @@
 import json
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional
 
 from app.schemas.config import (
     ImageProcessingConfig,
@@ -21,6 +21,8 @@ class ConfigService:
     _instance = None
     _config: Optional[SystemConfig] = None
     _config_path: Path = Path(__file__).parent.parent / "configs" / "system_config.json"
+    # 설정 변경 시 호출할 콜백 (OCR 캐시 무효화 등)
+    _listeners: List[Callable[[SystemConfig], None]] = []
 
     def __new__(cls):
         if cls._instance is None:
@@ -60,9 +62,22 @@ class ConfigService:
         """OCR 설정 반환"""
         return self.get_system_config().ocr
 
+    def add_listener(self, callback: Callable[[SystemConfig], None]) -> None:
+        """설정 변경(save/reload) 후 새 설정으로 호출될 콜백 등록"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def _notify_listeners(self) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(self.get_system_config())
+            except Exception as e:
+                logger.error(f"Config listener failed: {str(e)}")
+
     def reload_config(self) -> None:
         """설정 강제 리로드"""
         self._load_config()
+        self._notify_listeners()
 
     def save_config(self, new_config: SystemConfig) -> None:
         """설정 저장 (Admin 용)"""
@@ -77,6 +92,7 @@ class ConfigService:
             # 3. Reload
             self._config = new_config
             logger.info("System configuration updated and saved")
+            self._notify_listeners()
 
         except Exception as e:
             logger.error(f"Failed to save system config: {str(e)}")
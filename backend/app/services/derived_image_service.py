@@ -0,0 +1,223 @@
+"""
+웹뷰/썸네일 지연 생성 + 파생 이미지 캐시
+
+명세서 업로드 시에는 원본 단계만 저장하고,
+웹뷰/썸네일은 /static/uploads/... 로 처음 요청될 때 만든다.
+(확정되지 않고 버려지는 명세서의 인코딩 작업을 생략)
+- 요청 경로 → 원본 경로: 파일명 접미사(_web/_thumb)와 단계 디렉토리(webview/thumbnail) 규칙으로 역산
+- 캐시 키: 원본 내용 해시 + 단계 설정(크기/품질/형식) → 같은 원본은 한 번만 생성 (content-addressed)
+- 용량 제한: IMAGE_DERIVED_CACHE_MAX_BYTES 초과 시 가장 오래 사용되지 않은 파일부터 삭제
+  (mtime 기준 LRU, 최근 EVICTION_GRACE_SECONDS 안에 사용한 파일은 제공 중일 수 있어 제외)
+- 이전 방식으로 미리 저장된 파일은 StaticFiles 가 그대로 제공 (이 서비스는 404 일 때만 호출)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+from app.services.image_service import ImageService, image_service
+
+logger = logging.getLogger(__name__)
+
+DIGEST_MEMO_SIZE = 4096
+LOCK_STRIPES = 64
+# resolve() 가 경로를 반환한 뒤 응답이 파일을 열기 전에 다른 요청의 정리로 삭제되지 않도록
+# 최근 사용(생성/조회)한 파일은 용량을 넘어도 이 시간 동안 삭제하지 않음
+EVICTION_GRACE_SECONDS = 30.0
+
+
+def _file_ext(profile: Dict[str, Any]) -> str:
+    ext = str(profile["format"]).lower()
+    return "jpg" if ext == "jpeg" else ext
+
+
+class DerivedImageService:
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int,
+        images: Optional[ImageService] = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.images = images or image_service
+        self._lock = threading.Lock()
+        # 같은 파생 이미지를 동시에 두 번 만들지 않도록 키별 잠금 (고정 개수로 분할)
+        self._key_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        # 원본 경로 → (mtime_ns, size, sha256) : 요청마다 원본을 다시 해시하지 않도록
+        self._digests: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._total_bytes: Optional[int] = None
+        self._stats = {"hits": 0, "generated": 0, "evictions": 0}
+
+    # --- 경로 ---
+
+    def source_for(self, requested: Path) -> Optional[Tuple[str, Path]]:
+        """웹뷰/썸네일 요청 경로 → (단계, 원본 경로), 해당 없으면 None"""
+        profiles = self.images.profiles
+        original_profile = profiles["original"]
+        for tier, profile in profiles.items():
+            if tier == "original":
+                continue
+            ending = f"{profile['suffix']}.{_file_ext(profile)}"
+            if not requested.name.endswith(ending) or requested.name == ending:
+                continue
+            original_name = (
+                requested.name[: -len(ending)]
+                + f"{original_profile['suffix']}.{_file_ext(original_profile)}"
+            )
+            if requested.parent.name == tier:
+                # 기본 구조: YYYY/MM/<tier>/파일
+                return tier, requested.parent.parent / "original" / original_name
+            # output_dir 지정 시 평면 구조: 같은 디렉토리
+            return tier, requested.parent / original_name
+        return None
+
+    def _cache_path(self, key: str, tier: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.{_file_ext(self.images.profiles[tier])}"
+
+    def _digest(self, path: Path) -> str:
+        stat = path.stat()
+        memo_key = str(path)
+        with self._lock:
+            cached = self._digests.get(memo_key)
+            if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._digests.move_to_end(memo_key)
+                return cached[2]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        value = digest.hexdigest()
+
+        with self._lock:
+            self._digests[memo_key] = (stat.st_mtime_ns, stat.st_size, value)
+            while len(self._digests) > DIGEST_MEMO_SIZE:
+                self._digests.popitem(last=False)
+        return value
+
+    def cache_key(self, original: Path, tier: str) -> str:
+        profile = self.images.profiles[tier]
+        signature = json.dumps(
+            [tier, list(profile["max_size"]), profile["quality"], profile["format"]]
+        )
+        return hashlib.sha256(f"{self._digest(original)}\n{signature}".encode()).hexdigest()
+
+    # --- 조회/생성 ---
+
+    def resolve(self, requested: Path) -> Optional[Path]:
+        """
+        없는 웹뷰/썸네일 요청에 대한 캐시 파일 경로 (필요 시 원본에서 생성)
+        - 업로드 디렉토리 밖 경로, 원본이 없는 경우는 None (404)
+        """
+        try:
+            requested.resolve().relative_to(self.images.base_dir.resolve())
+        except ValueError:
+            return None
+        source = self.source_for(requested)
+        if source is None:
+            return None
+        tier, original = source
+        if not original.is_file() or not self.images._validate_path_security(original):
+            return None
+
+        key = self.cache_key(original, tier)
+        cache_path = self._cache_path(key, tier)
+
+        with self._key_locks[int(key[:8], 16) % LOCK_STRIPES]:
+            if cache_path.exists():
+                os.utime(cache_path)  # LRU: 사용 시각 갱신
+                self._stats["hits"] += 1
+                return cache_path
+            self._generate(original, tier, cache_path)
+
+        self._evict(keep=cache_path)
+        return cache_path
+
+    def _generate(self, original: Path, tier: str, cache_path: Path) -> None:
+        with open(original, "rb") as f:
+            content = f.read()
+        with self.images.open(content, original.name) as decoded:
+            data = self.images.encode_tiers(decoded, [tier])[tier]
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_fd, temp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(temp_fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, cache_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data)
+            self._stats["generated"] += 1
+        logger.info(f"Derived image generated: {original.name} → {tier} ({len(data)} bytes)")
+
+    # --- 용량 관리 ---
+
+    def _cache_files(self):
+        if not self.cache_dir.exists():
+            return []
+        return [
+            p for p in self.cache_dir.glob("*/*") if p.is_file() and not p.name.startswith(".tmp_")
+        ]
+
+    def _evict(self, keep: Optional[Path] = None) -> None:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(p.stat().st_size for p in self._cache_files())
+            if self._total_bytes <= self.max_bytes:
+                return
+
+            entries = []
+            for path in self._cache_files():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+
+            total = sum(size for _, size, _ in entries)
+            recent = time.time() - EVICTION_GRACE_SECONDS
+            for mtime, size, path in entries:
+                if total <= self.max_bytes or mtime >= recent:
+                    break  # mtime 순 정렬: 이후 파일은 모두 최근 사용
+                if path == keep:
+                    continue
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self._stats["evictions"] += 1
+            self._total_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(p.stat().st_size for p in self._cache_files())
+            return {
+                **self._stats,
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "cache_dir": str(self.cache_dir),
+            }
+
+
+derived_image_service = DerivedImageService(
+    cache_dir=settings.IMAGE_DERIVED_CACHE_DIR,
+    max_bytes=settings.IMAGE_DERIVED_CACHE_MAX_BYTES,
+)
@@ -0,0 +1,279 @@
+"""
+FIFO Lot Ledger 서비스
+
+원두별 입고 lot(InboundItem)과 소진 커서(FifoCursor)를 증분 유지하여,
+원가 견적 시 전체 입출고 이력을 재계산하지 않고 요청 수량이 걸치는 lot만 조회한다.
+
+- 커서는 입고 확정 / 로스팅 차감 / 재고 로그 생성·수정·삭제 시 갱신된다.
+  (커서가 없는 원두는 이때 이력 전체로 한 번 재구성(rebuild)하여 저장)
+- 원가 견적은 읽기 전용: 커서가 없으면 이력으로 계산만 하고 저장하지 않는다.
+- 도입 이전 원두는 서버 시작 시 backfill 로 커서를 한 번에 만든다.
+- commit은 호출하는 쪽에서 처리한다 (flush만 수행).
+"""
+
+import logging
+from typing import List, Optional
+
+from app.models.fifo_cursor import FifoCursor
+from app.models.inbound_item import InboundItem
+from app.repositories.fifo_ledger_repository import FifoLedgerRepository
+
+logger = logging.getLogger(__name__)
+
+# 부동소수점 누적 오차로 남는 극소량은 소진된 것으로 간주
+_EPSILON = 1e-9
+
+
+def usage_amount(change_amount: Optional[float]) -> float:
+    """재고 로그 변동량 중 FIFO 사용량으로 집계되는 부분 (음수 변동의 절대값)"""
+    if change_amount is None or change_amount >= 0:
+        return 0.0
+    return -change_amount
+
+
+class FifoLedgerService:
+    def __init__(self, repository: FifoLedgerRepository):
+        self.repository = repository
+
+    # --- 커서 관리 ---
+
+    def _replay(self, cursor: FifoCursor) -> FifoCursor:
+        """입출고 이력 전체로 커서 위치 계산"""
+        bean_id = cursor.bean_id
+        total_used = self.repository.get_total_usage(bean_id)
+
+        head: Optional[InboundItem] = None
+        head_consumed = 0.0
+        accumulated = 0.0
+        for lot in self.repository.get_all_lots(bean_id):
+            qty = lot.quantity or 0.0
+            if accumulated + qty > total_used:
+                head = lot
+                head_consumed = total_used - accumulated
+                break
+            accumulated += qty
+
+        cursor.consumed_qty = total_used
+        cursor.head_item_id = head.id if head else None
+        cursor.head_consumed_qty = head_consumed
+        cursor.overflow_qty = 0.0 if head else max(total_used - accumulated, 0.0)
+        return cursor
+
+    def rebuild(self, bean_id: int) -> FifoCursor:
+        """입출고 이력 전체로 커서를 재구성하여 저장 (최초 생성 또는 정합성 복구용)"""
+        cursor = self.repository.get_cursor(bean_id) or FifoCursor(bean_id=bean_id)
+        return self.repository.save_cursor(self._replay(cursor))
+
+    def get_cursor(self, bean_id: int) -> FifoCursor:
+        """커서 조회 (읽기 전용: 없으면 이력으로 계산한 임시 커서, 저장하지 않음)"""
+        cursor = self.repository.get_cursor(bean_id)
+        if cursor is None:
+            cursor = self._replay(FifoCursor(bean_id=bean_id))
+        return cursor
+
+    def _materialized_cursor(self, bean_id: int) -> FifoCursor:
+        """
+        쓰기 경로용 커서 (없으면 재구성하여 저장)
+        - 사용량 이벤트는 해당 재고 로그를 쓰기 전에 반영되므로 재구성 결과는 이벤트 이전 상태
+        """
+        cursor = self.repository.get_cursor(bean_id)
+        if cursor is None:
+            cursor = self.rebuild(bean_id)
+        return cursor
+
+    def backfill(self) -> int:
+        """입출고 이력은 있지만 커서가 없는 원두의 커서를 일괄 생성 (서버 시작 시 1회)"""
+        bean_ids = self.repository.get_bean_ids_without_cursor()
+        for bean_id in bean_ids:
+            self.rebuild(bean_id)
+        return len(bean_ids)
+
+    def _advance(self, cursor: FifoCursor, amount: float) -> None:
+        """head를 amount만큼 앞으로 이동 (사용량 증가)"""
+        remaining = amount
+        lot = self.repository.get_lot(cursor.head_item_id) if cursor.head_item_id else None
+
+        while remaining > 0 and lot is not None:
+            available = (lot.quantity or 0.0) - cursor.head_consumed_qty
+            if remaining < available - _EPSILON:
+                cursor.head_consumed_qty += remaining
+                remaining = 0.0
+                break
+
+            remaining = max(remaining - max(available, 0.0), 0.0)
+            lot = self.repository.get_next_lot(lot)
+            cursor.head_item_id = lot.id if lot else None
+            cursor.head_consumed_qty = 0.0
+
+        if remaining > _EPSILON:
+            cursor.overflow_qty += remaining
+
+    def _rewind(self, cursor: FifoCursor, amount: float) -> None:
+        """head를 amount만큼 뒤로 이동 (사용량 감소: 로그 수정/삭제)"""
+        remaining = amount
+
+        # 입고 이력을 초과한 사용량부터 되돌림
+        restored = min(cursor.overflow_qty, remaining)
+        cursor.overflow_qty -= restored
+        remaining -= restored
+        if remaining <= _EPSILON:
+            return
+
+        if cursor.head_item_id:
+            lot = self.repository.get_lot(cursor.head_item_id)
+        else:
+            lot = self.repository.get_last_lot(cursor.bean_id)
+            if lot is None:
+                return
+            cursor.head_item_id = lot.id
+            cursor.head_consumed_qty = lot.quantity or 0.0
+
+        while remaining > 0:
+            if cursor.head_consumed_qty >= remaining:
+                cursor.head_consumed_qty -= remaining
+                break
+
+            remaining -= cursor.head_consumed_qty
+            prev_lot = self.repository.get_prev_lot(lot)
+            if prev_lot is None:
+                cursor.head_consumed_qty = 0.0
+                break
+            lot = prev_lot
+            cursor.head_item_id = lot.id
+            cursor.head_consumed_qty = lot.quantity or 0.0
+
+    # --- 이벤트 반영 ---
+
+    def record_usage(self, bean_id: int, quantity: float) -> None:
+        """사용량 증가 반영 (로스팅 차감, 출고 등)"""
+        if quantity <= 0:
+            return
+        cursor = self._materialized_cursor(bean_id)
+        cursor.consumed_qty += quantity
+        self._advance(cursor, quantity)
+        self.repository.save_cursor(cursor)
+
+    def release_usage(self, bean_id: int, quantity: float) -> None:
+        """사용량 감소 반영 (음수 로그 수정/삭제)"""
+        if quantity <= 0:
+            return
+        cursor = self._materialized_cursor(bean_id)
+        cursor.consumed_qty = max(cursor.consumed_qty - quantity, 0.0)
+        self._rewind(cursor, quantity)
+        self.repository.save_cursor(cursor)
+
+    def apply_log_change(
+        self, bean_id: int, old_amount: Optional[float], new_amount: Optional[float]
+    ) -> None:
+        """
+        재고 로그 생성/수정/삭제를 사용량 변화로 환산하여 반영
+
+        Args:
+            old_amount: 변경 전 change_amount (생성 시 None)
+            new_amount: 변경 후 change_amount (삭제 시 None)
+        """
+        delta = usage_amount(new_amount) - usage_amount(old_amount)
+        if delta > 0:
+            self.record_usage(bean_id, delta)
+        elif delta < 0:
+            self.release_usage(bean_id, -delta)
+
+    def add_lot(self, item: InboundItem) -> None:
+        """신규 입고 품목을 lot 목록 끝에 추가"""
+        if not item.bean_id:
+            return
+        if item.id is None:
+            self.repository.db.flush()
+
+        cursor = self.repository.get_cursor(item.bean_id)
+        if cursor is None:
+            # 첫 입고/도입 이전 원두: 새 lot 을 포함한 이력으로 커서 생성
+            self.rebuild(item.bean_id)
+            return
+
+        if self.repository.get_next_lot(item) is not None:
+            # 기존 lot보다 앞선 일자로 입고된 경우 순서가 바뀌므로 전체 재구성
+            self.rebuild(item.bean_id)
+            return
+
+        if cursor.head_item_id:
+            # head 이후에 추가되는 lot은 커서에 영향 없음
+            return
+
+        # 전량 소진 상태였다면 새 lot이 head가 되고, 초과 사용량을 먼저 흡수
+        overflow = cursor.overflow_qty
+        cursor.head_item_id = item.id
+        cursor.head_consumed_qty = 0.0
+        cursor.overflow_qty = 0.0
+        self._advance(cursor, overflow)
+        self.repository.save_cursor(cursor)
+
+    def add_lots(self, items: List[InboundItem]) -> None:
+        """
+        입고 확정 품목 일괄 추가 (커서 조회 1회)
+        - 커서가 있는 원두는 품목별 반영, 없는 원두는 원두당 1회 재구성
+        """
+        bean_ids = list(dict.fromkeys(item.bean_id for item in items if item.bean_id))
+        cursors = self.repository.get_cursors(bean_ids)
+        for item in items:
+            if item.bean_id in cursors:
+                self.add_lot(item)
+        for bean_id in bean_ids:
+            if bean_id not in cursors:
+                self.rebuild(bean_id)
+
+    # --- 조회 ---
+
+    def get_open_lots(self, bean_id: int) -> List[dict]:
+        """잔여 수량이 있는 lot 목록 (오래된 순)"""
+        cursor = self.get_cursor(bean_id)
+        if not cursor.head_item_id:
+            return []
+
+        head = self.repository.get_lot(cursor.head_item_id)
+        offset = cursor.head_consumed_qty
+        lots = []
+        for lot in self.repository.iter_lots_from(head):
+            remaining = (lot.quantity or 0.0) - offset
+            offset = 0.0
+            if remaining > 0:
+                lots.append(
+                    {
+                        "inbound_item_id": lot.id,
+                        "unit_price": lot.unit_price,
+                        "remaining_qty": remaining,
+                    }
+                )
+        return lots
+
+    def quote(self, bean_id: int, quantity: float, fallback_price: float) -> float:
+        """
+        요청 수량의 FIFO 총 원가 계산 (head부터 필요한 lot까지만 조회)
+
+        Args:
+            fallback_price: 단가 없는 lot 또는 재고 부족분에 적용할 단가 (보통 avg_price)
+        """
+        cursor = self.get_cursor(bean_id)
+        total_cost = 0.0
+        qty_needed = quantity
+
+        if cursor.head_item_id:
+            head = self.repository.get_lot(cursor.head_item_id)
+            offset = cursor.head_consumed_qty
+            for lot in self.repository.iter_lots_from(head):
+                if qty_needed <= 0:
+                    break
+                available = (lot.quantity or 0.0) - offset
+                offset = 0.0
+
+                take_qty = min(qty_needed, available)
+                if take_qty <= 0:
+                    continue
+                total_cost += take_qty * (lot.unit_price or fallback_price)
+                qty_needed -= take_qty
+
+        if qty_needed > 0:
+            # 입고 이력으로 충당되지 않는 부족분은 fallback 단가 적용
+            total_cost += qty_needed * fallback_price
+
+        return total_cost
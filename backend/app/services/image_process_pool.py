@@ -0,0 +1,163 @@
+"""
+이미지 CPU 작업 프로세스 풀
+
+OCR 전처리(LANCZOS 업스케일/선명화/필터)와 3단계 JPEG/WEBP 인코딩은 순수 CPU 작업이라
+스레드에서 돌리면 GIL 을 두고 요청 처리와 경쟁한다. 별도 프로세스에서 실행하여
+업로드가 몰려도 여러 코어로 분산하고 다른 API 응답 시간에 영향을 주지 않도록 한다.
+
+- 워커 수 상한: IMAGE_PROCESS_POOL_WORKERS (0 이면 프로세스 풀 없이 스레드에서 실행)
+- 입력 전달: 큰 업로드는 공유 메모리(SharedMemory)로 넘겨 pickle/파이프 복사 생략
+  (SpooledUpload 는 임시 파일에서 공유 메모리로 청크 단위 복사)
+- 출력: 압축된 바이트만 반환 (OCR 입력 + 3단계 이미지), 파일 저장은 부모 프로세스에서
+- 이미지 처리 설정은 부모가 읽어 전달 (워커마다 ConfigService 를 따로 두지 않음)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple, Union
+
+from app.config import settings
+from app.schemas.config import ImageProcessingConfig
+from app.services.image_service import PreparedImage, image_service
+from app.services.upload_service import CHUNK_SIZE, SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+# 워커에 넘기는 입력: bytes 그대로 또는 ("shm", 공유 메모리 이름, 크기)
+UploadSource = Union[bytes, Tuple[str, str, int]]
+
+
+def _prepare_in_worker(
+    source: UploadSource,
+    filename: str,
+    mime_type: str,
+    processing_config: Optional[ImageProcessingConfig],
+    ocr: bool = True,
+) -> PreparedImage:
+    """워커 프로세스 진입점 (모듈 최상위 함수여야 pickle 가능)"""
+    if isinstance(source, tuple):
+        _, name, size = source
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            content = bytes(shm.buf[:size])
+        finally:
+            shm.close()
+    else:
+        content = source
+    return image_service.prepare_upload(content, filename, mime_type, processing_config, ocr)
+
+
+class ImageProcessPool:
+    def __init__(
+        self,
+        workers: int,
+        shared_memory_threshold: int = 256 * 1024,
+        max_tasks_per_child: Optional[int] = None,
+    ):
+        self.workers = max(0, workers)
+        self.shared_memory_threshold = shared_memory_threshold
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stats = {"submitted": 0, "shared_memory": 0, "failed": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # fork 는 이벤트 루프/스레드 상태를 복제하므로 spawn 사용 (첫 요청 시 생성)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+            logger.info(f"Image process pool started: {self.workers} workers")
+        return self._executor
+
+    async def prepare_upload(
+        self,
+        content: Union[bytes, SpooledUpload],
+        filename: str,
+        mime_type: str,
+        processing_config: Optional[ImageProcessingConfig] = None,
+        ocr: bool = True,
+    ) -> PreparedImage:
+        """디코딩 1회로 OCR 입력 + 3단계 이미지 준비 (ImageService.prepare_upload)"""
+        if processing_config is None:
+            from app.services.config_service import config_service
+
+            processing_config = config_service.get_image_processing_config()
+
+        self._stats["submitted"] += 1
+        if self.workers == 0:
+            if isinstance(content, SpooledUpload):
+                content = content.read()
+            return await asyncio.to_thread(
+                image_service.prepare_upload, content, filename, mime_type, processing_config, ocr
+            )
+
+        size = content.size if isinstance(content, SpooledUpload) else len(content)
+        shm = None
+        source: UploadSource
+        if size >= self.shared_memory_threshold:
+            shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            self._write_shared(shm, content, size)
+            source = ("shm", shm.name, size)
+            self._stats["shared_memory"] += 1
+        else:
+            source = content.read() if isinstance(content, SpooledUpload) else content
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(),
+                _prepare_in_worker,
+                source,
+                filename,
+                mime_type,
+                processing_config,
+                ocr,
+            )
+        except BrokenProcessPool:
+            # 워커가 비정상 종료되면 다음 요청에서 새 풀 생성
+            self._stats["failed"] += 1
+            self._executor = None
+            raise
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    @staticmethod
+    def _write_shared(
+        shm: shared_memory.SharedMemory, content: Union[bytes, SpooledUpload], size: int
+    ) -> None:
+        if not isinstance(content, SpooledUpload):
+            shm.buf[:size] = content
+            return
+        content.file.seek(0)
+        offset = 0
+        while offset < size:
+            read = content.file.readinto(shm.buf[offset : min(offset + CHUNK_SIZE, size)])
+            if not read:
+                break
+            offset += read
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "workers": self.workers, "started": self._executor is not None}
+
+
+image_process_pool = ImageProcessPool(
+    workers=settings.IMAGE_PROCESS_POOL_WORKERS,
+    shared_memory_threshold=settings.IMAGE_PROCESS_POOL_SHM_THRESHOLD,
+    max_tasks_per_child=settings.IMAGE_PROCESS_POOL_MAX_TASKS_PER_CHILD,
+)
@@ -4,18 +4,96 @@ import logging
 import os
 import time
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
 
 import magic
 from PIL import Image, ImageEnhance, ImageFilter, ImageOps, ImageStat
 from PIL.Image import Image as PILImage
 
 from app.config import settings
+from app.schemas.config import ImageProcessingConfig
 
 logger = logging.getLogger(__name__)
 
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+class InvalidImageError(ValueError):
+    """디코딩할 수 없는 (손상된) 이미지"""
+
+
+@dataclass
+class PreparedImage:
+    """디코딩 1회로 만든 OCR 입력 + 3단계 인코딩 결과 (프로세스 간 전달용, 압축된 바이트만 포함)"""
+
+    ocr_bytes: bytes
+    ocr_mime_type: str
+    width: int
+    height: int
+    file_size_bytes: int
+    tiers: Dict[str, bytes] = field(default_factory=dict)
+
+
+class DecodedImage:
+    """
+    업로드 1건의 디코딩 결과 (검증 → OCR 전처리 → 3단계 저장이 공유)
+
+    - 최초 접근 시 한 번만 디코딩하고, EXIF 방향 적용/메타데이터 제거도 한 번만 수행
+    - 이후 단계는 같은 이미지 객체를 읽기만 함 (변경 금지, 필요하면 새 이미지를 만들 것)
+    """
+
+    def __init__(
+        self, content: bytes, filename: str, mime_type: str = "image/jpeg", strip_exif=None
+    ):
+        self.content = content
+        self.filename = filename
+        self.mime_type = mime_type
+        self.original_size: Optional[Tuple[int, int]] = None
+        self._strip_exif = strip_exif
+        self._image: Optional[PILImage] = None
+
+    @property
+    def image(self) -> PILImage:
+        if self._image is None:
+            img = Image.open(io.BytesIO(self.content))
+            try:
+                img.load()
+            except Exception:
+                img.close()
+                raise
+            self.original_size = img.size
+            if self._strip_exif:
+                try:
+                    img = self._strip_exif(img)
+                except Exception as e:
+                    logger.warning(f"Failed to strip EXIF data: {e}")
+            self._image = img
+        return self._image
+
+    def close(self) -> None:
+        if self._image is not None:
+            self._image.close()
+            self._image = None
+
+    def __enter__(self) -> "DecodedImage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _fit_size(size: Tuple[int, int], max_size: Tuple[int, int]) -> Tuple[int, int]:
+    """max_size 안에 들어가는 크기 (비율 유지, 확대하지 않음)"""
+    width, height = size
+    max_width, max_height = max_size
+    if width <= max_width and height <= max_height:
+        return size
+    scale = min(max_width / width, max_height / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
 
 class ImageService:
     def __init__(self, upload_base_dir: Optional[str] = None):
@@ -47,17 +125,24 @@ class ImageService:
         }
 
     def _strip_sensitive_exif(self, img: PILImage) -> PILImage:
-        """EXIF 민감 데이터 제거 (GPS, 카메라 정보 등)"""
+        """
+        EXIF 민감 데이터 제거 (GPS, 카메라 정보 등)
+
+        픽셀은 C 버퍼 그대로 두고 메타데이터만 제거 (픽셀을 Python 객체로 풀어 복사하지 않음).
+        전달된 이미지를 직접 수정하므로 디코딩 직후의 (호출자 소유) 이미지에만 사용.
+        """
 
-        # 1. 방향 정보 적용 (회전)
-        img = ImageOps.exif_transpose(img)
+        # 1. 방향 정보 적용 (회전이 필요할 때만 새 버퍼)
+        ImageOps.exif_transpose(img, in_place=True)
 
-        # 2. 모든 EXIF 데이터 제거
-        data = list(img.getdata())
-        img_without_exif = Image.new(img.mode, img.size)
-        img_without_exif.putdata(data)
+        # 2. 모든 EXIF/메타데이터 제거 (팔레트 투명도는 픽셀 해석에 필요하므로 유지)
+        transparency = img.info.get("transparency")
+        img.info.clear()
+        img.getexif().clear()
+        if transparency is not None:
+            img.info["transparency"] = transparency
 
-        return img_without_exif
+        return img
 
     def preprocess_for_ocr(
         self,
@@ -71,7 +156,8 @@ class ImageService:
         enhance_sharpness: bool = True,
         sharpness_factor: float = 2.0,
         upscale_image: bool = True,
-        auto_rotate: bool = True
+        auto_rotate: bool = True,
+        processing_config: Optional[ImageProcessingConfig] = None,
     ) -> PILImage:
         """
         OCR 정확도를 높이기 위한 이미지 전처리 (옵션화 + Hot-reload Config 적용)
@@ -84,13 +170,14 @@ class ImageService:
         Args:
             img: PIL Image 객체
             (이하 인자는 Config 파일이 없을 경우의 Fallback 값으로 동작합니다)
+            processing_config: 전달 시 ConfigService 대신 사용 (프로세스 풀 워커는 부모가 읽은 설정을 받음)
         """
 
         # 0. Hot-reload Configuration (via ConfigService)
         try:
             from app.services.config_service import config_service
 
-            config = config_service.get_image_processing_config()
+            config = processing_config or config_service.get_image_processing_config()
 
             # Override defaults with config values
             to_grayscale = config.to_grayscale
@@ -108,7 +195,8 @@ class ImageService:
 
         # 1. 자동 회전 및 수평 보정 (Auto-Deskew with EXIF)
         # LLM은 비뚤어진 텍스트도 잘 읽지만, 정면을 향할 때 표 인식률이 높아짐
-        if auto_rotate:
+        # (이미 방향이 적용된 이미지는 복사 없이 그대로 사용)
+        if auto_rotate and img.getexif().get(EXIF_ORIENTATION_TAG, 1) != 1:
             img = ImageOps.exif_transpose(img)
 
         # 2. 업스케일링 (Low Resolution Enhancement)
@@ -231,8 +319,8 @@ class ImageService:
 
         logger.debug(f"Disk space OK: {free_gb:.2f}GB free")
 
-    def _save_atomic(self, img: PILImage, target_path: Path, **save_kwargs) -> None:
-        """원자적 이미지 저장 (임시 파일 + rename)"""
+    def _save_atomic(self, img: Union[PILImage, bytes], target_path: Path, **save_kwargs) -> None:
+        """원자적 이미지 저장 (임시 파일 + rename), 이미 인코딩된 bytes 는 그대로 기록"""
         import tempfile
 
         # 1. 임시 파일 생성 (같은 디렉토리)
@@ -243,7 +331,10 @@ class ImageService:
         try:
             # 2. 임시 파일에 저장
             with os.fdopen(temp_fd, "wb") as f:
-                img.save(f, **save_kwargs)
+                if isinstance(img, bytes):
+                    f.write(img)
+                else:
+                    img.save(f, **save_kwargs)
 
             # 3. 원자적 rename
             os.replace(temp_path, target_path)
@@ -265,24 +356,50 @@ class ImageService:
                 except Exception as e:
                     logger.warning(f"Failed to cleanup {path}: {e}")
 
-    def validate_image(self, file_content: bytes, filename: str) -> Tuple[bool, str]:
-        """
-        Validates the image for security and integrity.
-        Returns (success, error_message)
-        """
-        # 1. Size check
-        if len(file_content) > self.max_file_size:
-            return False, f"File size exceeds limit ({self.max_file_size // (1024*1024)}MB)"
+    def open(self, file_content: bytes, filename: str, mime_type: str = "image/jpeg") -> DecodedImage:
+        """검증/전처리/저장이 공유하는 디코딩 이미지 (디코딩은 첫 사용 시 1회)"""
+        return DecodedImage(file_content, filename, mime_type, strip_exif=self._strip_sensitive_exif)
+
+    def size_error(self, size: int) -> Optional[str]:
+        if size > self.max_file_size:
+            return f"File size exceeds limit ({self.max_file_size // (1024*1024)}MB)"
+        return None
 
-        # 2. Extension check
+    def extension_error(self, filename: str) -> Optional[str]:
         ext = os.path.splitext(filename)[1].lower()
         if ext not in self.allowed_extensions:
-            return False, f"Unsupported file extension: {ext}"
+            return f"Unsupported file extension: {ext}"
+        return None
 
-        # 3. Magic bytes / MIME type check
-        mime = magic.from_buffer(file_content, mime=True)
+    def content_type_error(self, head: bytes) -> Optional[str]:
+        """매직 바이트 검사 (파일 앞부분만으로 충분)"""
+        mime = magic.from_buffer(head, mime=True)
         if mime not in self.allowed_mime_types:
-            return False, f"Invalid file content type: {mime}"
+            return f"Invalid file content type: {mime}"
+        return None
+
+    def validate_content(self, file_content: bytes, filename: str) -> Tuple[bool, str]:
+        """크기/확장자/매직 바이트 검사 (디코딩 없음)"""
+        error = (
+            # 1. Size check
+            self.size_error(len(file_content))
+            # 2. Extension check
+            or self.extension_error(filename)
+            # 3. Magic bytes / MIME type check
+            or self.content_type_error(file_content)
+        )
+        if error:
+            return False, error
+        return True, ""
+
+    def validate_image(self, file_content: bytes, filename: str) -> Tuple[bool, str]:
+        """
+        Validates the image for security and integrity.
+        Returns (success, error_message)
+        """
+        is_valid, error_msg = self.validate_content(file_content, filename)
+        if not is_valid:
+            return is_valid, error_msg
 
         # 4. Image integrity check using Pillow
         try:
@@ -294,6 +411,34 @@ class ImageService:
 
         return True, ""
 
+    def validate_decoded(self, decoded: DecodedImage) -> Tuple[bool, str]:
+        """validate_image 와 같은 검사, 무결성은 verify() 대신 실제 디코딩으로 확인 (결과는 이후 단계에서 재사용)"""
+        is_valid, error_msg = self.validate_content(decoded.content, decoded.filename)
+        if not is_valid:
+            return is_valid, error_msg
+
+        try:
+            decoded.image
+        except Exception as e:
+            logger.error(f"Image integrity check failed: {str(e)}")
+            return False, "Corrupted or invalid image file"
+
+        return True, ""
+
+    def encode_for_ocr(
+        self, decoded: DecodedImage, processing_config: Optional[ImageProcessingConfig] = None
+    ) -> Tuple[bytes, str]:
+        """OCR 전처리 이미지를 한 번만 인코딩 (전처리로 바뀐 것이 없으면 원본 바이트 그대로 사용)"""
+        processed_img = self.preprocess_for_ocr(decoded.image, processing_config=processing_config)
+        if processed_img is decoded.image and decoded.mime_type in self.allowed_mime_types:
+            return decoded.content, decoded.mime_type
+
+        if processed_img.mode not in ("RGB", "L"):
+            processed_img = processed_img.convert("RGB")
+        output = io.BytesIO()
+        processed_img.save(output, format="JPEG", quality=settings.IMAGE_OCR_QUALITY)
+        return output.getvalue(), "image/jpeg"
+
     def process_and_save(
         self,
         file_content: bytes,
@@ -311,6 +456,146 @@ class ImageService:
             output_dir: Optional absolute path to save images (overrides default year/month logic)
             custom_filename: Optional base filename to use (overrides random generation)
         """
+        with self.open(file_content, original_filename) as decoded:
+            return self.save_decoded(decoded, output_dir=output_dir, custom_filename=custom_filename)
+
+    def _tier_images(
+        self, decoded: DecodedImage, tiers: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any], PILImage]]:
+        """
+        단계별 (tier, profile, 저장할 이미지), tiers 지정 시 해당 단계만
+        - 각 단계는 직전 단계의 축소본에서 다시 축소 (원본 크기 복사본을 단계마다 만들지 않음)
+        """
+        img = decoded.image
+
+        # 팔레트 이미지는 LANCZOS 축소 전에 한 번만 변환 (P 모드 resize 는 NEAREST 로 동작)
+        if img.mode in ("P", "1"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+        # 축소 원본: 목표 크기 이상인 가장 작은 이미지 (처음엔 디코딩 원본)
+        source = img
+        for tier, config in self.profiles.items():
+            if tiers is not None and tier not in tiers:
+                continue
+            target_size = _fit_size(img.size, config["max_size"])
+            if source.width < target_size[0] or source.height < target_size[1]:
+                source = img
+            if source.size != target_size:
+                source = source.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+            tier_img = source
+
+            # JPEG는 투명도(RGBA)를 지원하지 않으므로 RGB로 변환
+            if config["format"] == "JPEG" and tier_img.mode in ("RGBA", "P", "LA"):
+                if tier_img.mode == "RGBA":
+                    # 투명 배경을 흰색으로 채움
+                    background = Image.new("RGB", tier_img.size, (255, 255, 255))
+                    background.paste(tier_img, mask=tier_img.split()[3])
+                    tier_img = background
+                else:
+                    tier_img = tier_img.convert("RGB")
+
+            yield tier, config, tier_img
+
+    def encode_tiers(self, decoded: DecodedImage, tiers: Optional[Sequence[str]] = None) -> Dict[str, bytes]:
+        """단계별 이미지를 메모리에서 인코딩 (CPU 작업만, 파일 저장은 save_encoded)"""
+        encoded: Dict[str, bytes] = {}
+        for tier, config, tier_img in self._tier_images(decoded, tiers):
+            output = io.BytesIO()
+            tier_img.save(output, format=config["format"], quality=config["quality"], optimize=True)
+            encoded[tier] = output.getvalue()
+        return encoded
+
+    def prepare_upload(
+        self,
+        file_content: bytes,
+        filename: str,
+        mime_type: str = "image/jpeg",
+        processing_config: Optional[ImageProcessingConfig] = None,
+        ocr: bool = True,
+    ) -> PreparedImage:
+        """
+        디코딩 1회로 무결성 확인 + OCR 전처리 + 3단계 인코딩 (image_process_pool 워커에서 실행)
+        - 크기/확장자/매직 바이트 검사(validate_content)는 호출 전에 끝난 것으로 간주
+        - ocr=False: 저장용 인코딩만 (OCR 결과 캐시 적중 시, ocr_bytes 는 비어 있음)
+        """
+        with self.open(file_content, filename, mime_type) as decoded:
+            try:
+                decoded.image
+            except Exception as e:
+                logger.error(f"Image integrity check failed: {str(e)}")
+                raise InvalidImageError("Corrupted or invalid image file") from e
+
+            try:
+                if ocr:
+                    ocr_bytes, ocr_mime_type = self.encode_for_ocr(decoded, processing_config)
+                else:
+                    ocr_bytes, ocr_mime_type = b"", mime_type
+            except Exception as e:
+                logger.warning(f"Preprocessing failed: {e}", exc_info=True)
+                # Continue with original
+                ocr_bytes, ocr_mime_type = file_content, mime_type
+
+            width, height = decoded.original_size
+            return PreparedImage(
+                ocr_bytes=ocr_bytes,
+                ocr_mime_type=ocr_mime_type,
+                # 지연 생성 모드에서는 원본 단계만 (웹뷰/썸네일은 첫 요청 시 derived_image_service 가 생성)
+                tiers=self.encode_tiers(decoded, ["original"] if settings.IMAGE_LAZY_TIERS else None),
+                width=width,
+                height=height,
+                file_size_bytes=len(file_content),
+            )
+
+    def save_decoded(
+        self,
+        decoded: DecodedImage,
+        output_dir: Optional[Path] = None,
+        custom_filename: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """이미 디코딩된 이미지로 3단계 저장 (process_and_save 와 같은 결과)"""
+        decoded.image
+        width, height = decoded.original_size
+        return self._save_tiers(
+            self._tier_images(decoded),
+            original_filename=decoded.filename,
+            file_size_bytes=len(decoded.content),
+            width=width,
+            height=height,
+            output_dir=output_dir,
+            custom_filename=custom_filename,
+        )
+
+    def save_encoded(
+        self,
+        prepared: PreparedImage,
+        original_filename: str,
+        output_dir: Optional[Path] = None,
+        custom_filename: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        prepare_upload 에서 인코딩한 이미지를 그대로 저장 (재인코딩 없음)
+        - 인코딩되지 않은 단계는 경로만 반환 (/static 요청 시 지연 생성)
+        """
+        return self._save_tiers(
+            ((tier, config, prepared.tiers.get(tier)) for tier, config in self.profiles.items()),
+            original_filename=original_filename,
+            file_size_bytes=prepared.file_size_bytes,
+            width=prepared.width,
+            height=prepared.height,
+            output_dir=output_dir,
+            custom_filename=custom_filename,
+        )
+
+    def _save_tiers(
+        self,
+        tiers: Iterable[Tuple[str, Dict[str, Any], Union[PILImage, bytes, None]]],
+        original_filename: str,
+        file_size_bytes: int,
+        width: int,
+        height: int,
+        output_dir: Optional[Path] = None,
+        custom_filename: Optional[str] = None,
+    ) -> Dict[str, Any]:
         # Determine base filename
         if custom_filename:
             safe_base_name = custom_filename
@@ -339,66 +624,46 @@ class ImageService:
             self._check_disk_space(min_free_gb=settings.IMAGE_MIN_FREE_DISK_SPACE_GB)
 
         results: Dict[str, Any] = {
-            "file_size_bytes": len(file_content),
+            "file_size_bytes": file_size_bytes,
             "original_filename": original_filename,
             "paths": {},
+            # Store original dimensions
+            "width": width,
+            "height": height,
         }
 
         saved_paths: list[Path] = []
         start_time = time.time()
 
         try:
-            with Image.open(io.BytesIO(file_content)) as img:
-                # Store original dimensions
-                results["width"], results["height"] = img.size
-
-                # Strip sensitive EXIF data
-                try:
-                    img = self._strip_sensitive_exif(img)
-                except Exception as e:
-                    logger.warning(f"Failed to strip EXIF data: {e}")
-
-                for tier, config in self.profiles.items():
-                    # For custom output (e.g. batch processing), we might not want all tiers or want flat structure
-                    # But for now, let's keep the logic consistent or adapt based on output_dir presence
-
-                    tier_img = img.copy()
-
-                    # JPEG는 투명도(RGBA)를 지원하지 않으므로 RGB로 변환
-                    if config["format"] == "JPEG" and tier_img.mode in ("RGBA", "P", "LA"):
-                        if tier_img.mode == "RGBA":
-                            # 투명 배경을 흰색으로 채움
-                            background = Image.new("RGB", tier_img.size, (255, 255, 255))
-                            background.paste(tier_img, mask=tier_img.split()[3])
-                            tier_img = background
-                        else:
-                            tier_img = tier_img.convert("RGB")
-
-                    tier_img.thumbnail(config["max_size"], Image.Resampling.LANCZOS)
-
-                    file_ext: str = str(config["format"]).lower()
-                    if file_ext == "jpeg":
-                        file_ext = "jpg"
-
-                    tier_filename = f"{safe_base_name}{config['suffix']}.{file_ext}"
-
-                    if output_dir:
-                        # Flat structure for batch optimization usually
-                        # But let's check if we want flat or tiered.
-                        # For bean images, we probably want them in the same folder.
-                        abs_path = abs_base_dir / tier_filename
-                        rel_path_str = tier_filename  # Just filename
-                    else:
-                        rel_path_obj = rel_dir / tier / tier_filename
-                        abs_path = self.base_dir / rel_path_obj
-                        rel_path_str = str(rel_path_obj)
-
-                    # Security Check: Path Validation
-                    # Skip for custom output_dir as it implies trusted system operation
-                    if not output_dir and not self._validate_path_security(abs_path.parent):
-                        raise ValueError(f"Security check failed for path: {abs_path}")
-
-                    # Save image atomically
+            for tier, config, tier_img in tiers:
+                # For custom output (e.g. batch processing), we might not want all tiers or want flat structure
+                # But for now, let's keep the logic consistent or adapt based on output_dir presence
+
+                file_ext: str = str(config["format"]).lower()
+                if file_ext == "jpeg":
+                    file_ext = "jpg"
+
+                tier_filename = f"{safe_base_name}{config['suffix']}.{file_ext}"
+
+                if output_dir:
+                    # Flat structure for batch optimization usually
+                    # But let's check if we want flat or tiered.
+                    # For bean images, we probably want them in the same folder.
+                    abs_path = abs_base_dir / tier_filename
+                    rel_path_str = tier_filename  # Just filename
+                else:
+                    rel_path_obj = rel_dir / tier / tier_filename
+                    abs_path = self.base_dir / rel_path_obj
+                    rel_path_str = str(rel_path_obj)
+
+                # Security Check: Path Validation
+                # Skip for custom output_dir as it implies trusted system operation
+                if not output_dir and not self._validate_path_security(abs_path.parent):
+                    raise ValueError(f"Security check failed for path: {abs_path}")
+
+                # Save image atomically (지연 생성 단계는 경로만 기록)
+                if tier_img is not None:
                     self._save_atomic(
                         img=tier_img,
                         target_path=abs_path,
@@ -406,11 +671,10 @@ class ImageService:
                         quality=config["quality"],
                         optimize=True,
                     )
-
                     saved_paths.append(abs_path)
 
-                    # Store results (using forward slashes for URL compatibility)
-                    results["paths"][tier] = rel_path_str.replace("\\", "/")
+                # Store results (using forward slashes for URL compatibility)
+                results["paths"][tier] = rel_path_str.replace("\\", "/")
 
             elapsed_ms = (time.time() - start_time) * 1000
 
@@ -418,7 +682,7 @@ class ImageService:
             log_data = {
                 "event": "image_processed",
                 "original_filename": original_filename,
-                "input_size_bytes": len(file_content),
+                "input_size_bytes": file_size_bytes,
                 "processing_time_ms": round(elapsed_ms, 2),
                 "paths": results["paths"],
             }
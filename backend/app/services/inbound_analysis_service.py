@@ -0,0 +1,241 @@
+"""
+명세서 분석 파이프라인 단계
+
+단건 스트리밍 분석(/inbound/analyze)과 일괄 처리 작업(inbound_batch_service)이 공유한다.
+가져오기 → 검증 → 전처리 → OCR → 이미지 저장 → 생두 매칭
+(OCR 도중 도착하는 품목은 build_partial 로 먼저 매칭하여 미리보기로 전달)
+
+업로드/다운로드는 크기 제한과 형식 검사를 거치며 SpooledUpload 로 청크 단위 수신한다.
+
+전처리와 3단계 이미지 인코딩은 디코딩 1회로 프로세스 풀에서 함께 수행하고(prepare),
+OCR 성공 후 인코딩된 결과를 그대로 저장한다(save_image).
+"""
+
+import cgi
+import logging
+import re
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.services import upload_service
+from app.services.bean_name_index import BeanNameMatch
+from app.services.image_process_pool import image_process_pool
+from app.services.image_service import InvalidImageError, PreparedImage, image_service
+from app.services.inbound_service import inbound_service
+from app.services.upload_service import SpooledUpload, UploadRejectedError
+
+logger = logging.getLogger(__name__)
+
+DRIVE_LINK_PATTERN = (
+    r"(?:https?:\/\/)?(?:drive|docs)\.google\.com\/(?:file\/d\/|open\?id=|uc\?id=)([a-zA-Z0-9_-]+)"
+)
+IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".webp"]
+
+
+class AnalysisError(Exception):
+    """사용자에게 그대로 보여줄 수 있는 분석 단계 오류"""
+
+
+def drive_download_url(url: str) -> Optional[str]:
+    """Google Drive 공유 링크면 직접 다운로드 URL 반환"""
+    match = re.search(DRIVE_LINK_PATTERN, url)
+    if match:
+        return f"https://drive.google.com/uc?export=download&id={match.group(1)}"
+    return None
+
+
+def _filename_from_headers(headers: httpx.Headers) -> str:
+    content_disposition = headers.get("content-disposition")
+    if not content_disposition:
+        return "gdrive_upload.jpg"
+    try:
+        _, params = cgi.parse_header(content_disposition)
+        if "filename" not in params:
+            return "gdrive_upload.jpg"
+        filename = params["filename"]
+        if not any(filename.lower().endswith(ext) for ext in IMAGE_EXTENSIONS):
+            filename += ".jpg"
+        return filename
+    except Exception:
+        return "gdrive_upload.jpg"
+
+
+async def receive_upload(file: UploadFile) -> SpooledUpload:
+    """업로드 파일을 크기 제한/형식 검사와 함께 청크 단위로 수신"""
+    try:
+        return await upload_service.receive_upload(file)
+    except UploadRejectedError as e:
+        raise AnalysisError(f"유효하지 않은 이미지: {str(e)}") from e
+
+
+async def fetch_url(url: str) -> Tuple[SpooledUpload, str, str]:
+    """외부 URL(Google Drive 링크 포함)에서 이미지 다운로드 → (upload, filename, mime_type)"""
+    try:
+        fetch_target = drive_download_url(url) or url
+        upload, headers = await upload_service.download(fetch_target)
+    except UploadRejectedError as e:
+        raise AnalysisError(f"유효하지 않은 이미지: {str(e)}") from e
+    except Exception as e:
+        raise AnalysisError(f"이미지 다운로드 실패: {str(e)}") from e
+    upload.filename = _filename_from_headers(headers)
+    return upload, upload.filename, upload.mime_type
+
+
+def open_staged(path: str, filename: str, mime_type: str) -> SpooledUpload:
+    try:
+        return upload_service.spool_file(path, filename, mime_type)
+    except UploadRejectedError as e:
+        raise AnalysisError(f"유효하지 않은 이미지: {str(e)}") from e
+
+
+def validate(upload: SpooledUpload) -> None:
+    """
+    확장자 검사
+    (크기/매직 바이트는 수신 중에 이미 검사, 디코딩 무결성은 prepare 단계에서 확인)
+    """
+    if not upload.size:
+        raise AnalysisError("이미지 데이터가 비어있습니다.")
+    error_msg = image_service.extension_error(upload.filename)
+    if error_msg:
+        raise AnalysisError(f"유효하지 않은 이미지: {error_msg}")
+
+
+async def prepare(upload: SpooledUpload, ocr: bool = True) -> PreparedImage:
+    """
+    OCR용 전처리 이미지 + 3단계 저장 이미지 (전처리 실패 시 OCR 에는 원본 사용)
+    - ocr=False: OCR 결과 캐시 적중 시 저장용 이미지만 준비
+    """
+    try:
+        return await image_process_pool.prepare_upload(
+            upload, upload.filename, upload.mime_type, ocr=ocr
+        )
+    except InvalidImageError as e:
+        raise AnalysisError(f"유효하지 않은 이미지: {str(e)}") from e
+    except Exception as e:
+        raise AnalysisError(f"이미지 처리 실패: {str(e)}") from e
+
+
+def check_ocr_result(ocr_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not ocr_result:
+        raise AnalysisError("OCR 분석 결과가 없습니다.")
+    if ocr_result.get("error") == "INVALID_DOCUMENT":
+        raise AnalysisError("INVALID_DOCUMENT: 명세서 형식이 아닙니다.")
+    return ocr_result
+
+
+def save_image(prepared: PreparedImage, filename: str) -> Dict[str, Any]:
+    try:
+        return image_service.save_encoded(prepared, filename)
+    except Exception as e:
+        raise AnalysisError(f"이미지 저장 실패: {str(e)}") from e
+
+
+def _apply_match(item_data: Dict[str, Any], match: BeanNameMatch) -> Dict[str, Any]:
+    item_data["matched"] = match.matched
+    item_data["match_field"] = match.field
+    item_data["match_method"] = match.method
+    item_data["bean_id"] = match.bean_id
+    item_data["match_score"] = match.score
+    item_data["match_candidates"] = [
+        {"bean_id": c.bean_id, "name": c.name, "score": c.score} for c in match.candidates
+    ]
+    return item_data
+
+
+def build_partial(update: Dict[str, Any], db: Session) -> Optional[Dict[str, Any]]:
+    """
+    OCR 부분 결과(품목 1건/공급자/금액) → 미리보기 이벤트
+    - 품목은 도착하는 즉시 생두 매칭 (메모리 인덱스)
+    - 스키마에 맞지 않는 블록은 None (최종 결과에서 처리)
+    """
+    from app.schemas.inbound import AmountsInfo, OCRItem, SupplierInfo
+
+    section, data = update.get("section"), update.get("data")
+    if not isinstance(data, dict):
+        return None
+    try:
+        if section == "items":
+            match = inbound_service.match_beans([data.get("bean_name")], db)[0]
+            data = OCRItem(**_apply_match(dict(data), match)).model_dump()
+        elif section == "supplier":
+            data = SupplierInfo(**data).model_dump()
+        elif section == "amounts":
+            data = AmountsInfo(**data).model_dump()
+        else:
+            return None
+    except ValidationError:
+        return None
+    return {**update, "data": data}
+
+
+def build_response(
+    ocr_result: Dict[str, Any], image_data: Dict[str, Any], db: Session
+) -> Dict[str, Any]:
+    """OCR 결과 + 저장 이미지 정보 + 생두 매칭 → OCRResponse dict"""
+    from app.schemas.inbound import (
+        AdditionalInfo,
+        AmountsInfo,
+        DocumentInfo,
+        OCRResponse,
+        ReceiverInfo,
+        SupplierInfo,
+    )
+
+    document_info = (
+        DocumentInfo(**ocr_result.get("document_info", {}))
+        if "document_info" in ocr_result
+        else None
+    )
+    supplier_info = (
+        SupplierInfo(**ocr_result.get("supplier", {})) if "supplier" in ocr_result else None
+    )
+    receiver_info = (
+        ReceiverInfo(**ocr_result.get("receiver", {})) if "receiver" in ocr_result else None
+    )
+    amounts_info = AmountsInfo(**ocr_result.get("amounts", {})) if "amounts" in ocr_result else None
+    additional_info = (
+        AdditionalInfo(**ocr_result.get("additional_info", {}))
+        if "additional_info" in ocr_result
+        else None
+    )
+
+    items_with_match_info = []
+    items = ocr_result.get("items", [])
+    # Use InboundService for matching (품목 전체를 메모리 인덱스로 한 번에)
+    matches = inbound_service.match_beans([item.get("bean_name") for item in items], db)
+    for item_data, match in zip(items, matches):
+        items_with_match_info.append(_apply_match(item_data, match))
+
+    drive_link = f"/static/uploads/inbound/{image_data['paths']['original']}"
+
+    final_response = OCRResponse(
+        debug_raw_text=ocr_result.get("debug_raw_text"),
+        document_info=document_info,
+        supplier=supplier_info,
+        receiver=receiver_info,
+        amounts=amounts_info,
+        items=items_with_match_info,
+        additional_info=additional_info,
+        has_multiple_orders=ocr_result.get("has_multiple_orders", False),
+        total_order_count=ocr_result.get("total_order_count", 0),
+        order_groups=ocr_result.get("order_groups", []),
+        supplier_name=ocr_result.get("supplier", {}).get("name"),
+        contract_number=ocr_result.get("document_info", {}).get("contract_number"),
+        supplier_phone=ocr_result.get("supplier", {}).get("phone"),
+        supplier_email=ocr_result.get("supplier", {}).get("email"),
+        receiver_name=ocr_result.get("receiver", {}).get("name"),
+        invoice_date=ocr_result.get("document_info", {}).get("invoice_date"),
+        total_amount=ocr_result.get("amounts", {}).get("total_amount"),
+        drive_link=drive_link,
+        original_image_path=image_data["paths"].get("original"),
+        webview_image_path=image_data["paths"].get("webview"),
+        thumbnail_image_path=image_data["paths"].get("thumbnail"),
+        image_width=image_data.get("width"),
+        image_height=image_data.get("height"),
+        file_size_bytes=image_data.get("file_size_bytes"),
+    )
+    return final_response.model_dump()
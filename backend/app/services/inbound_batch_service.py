@@ -0,0 +1,311 @@
+"""
+명세서 일괄 분석 작업 큐
+
+월말처럼 명세서 수십 장을 한 번에 올릴 때, 요청은 작업 등록만 하고 바로 반환한다.
+- 작업은 inbound_jobs 테이블에 영속 (서버 재시작 시 미완료 작업 재개)
+- 시도 횟수가 INBOUND_BATCH_MAX_ATTEMPTS 를 넘는 작업은 재개하지 않고 실패 처리
+- 고정 크기 워커 풀이 가져오기 → 검증 → 전처리 → OCR → 저장 → 매칭 순으로 처리
+- 단계별 동시 실행 수 제한 (CPU 단계는 소수, OCR 단계는 공급자 한도에 맞춤)
+- 진행 상황/결과는 배치·작업 단위로 조회 후 검토하여 /inbound/confirm 으로 확정
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.inbound_job import TERMINAL_JOB_STATUSES, InboundJob, InboundJobStatus
+from app.repositories.inbound_job_repository import InboundJobRepository
+from app.services import inbound_analysis_service as analysis
+from app.services.upload_service import SpooledUpload
+from app.utils.timezone import get_kst_now
+
+logger = logging.getLogger(__name__)
+
+
+class InboundBatchService:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        ocr_service=None,
+        workers: int = 4,
+        stage_limits: Optional[Dict[str, int]] = None,
+        staging_dir: str = "",
+        max_attempts: int = 3,
+    ):
+        self.session_factory = session_factory
+        self._ocr_service = ocr_service
+        self.workers = workers
+        self.staging_dir = staging_dir
+        self.max_attempts = max_attempts
+        self.stage_limits = {
+            "fetch": 4,
+            "preprocess": 2,
+            "ocr": 4,
+            "save": 2,
+            "match": 2,
+            **(stage_limits or {}),
+        }
+        self._stages = {name: asyncio.Semaphore(limit) for name, limit in self.stage_limits.items()}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def ocr_service(self):
+        if self._ocr_service is None:
+            from app.services.ocr_service import ocr_service
+
+            self._ocr_service = ocr_service
+        return self._ocr_service
+
+    # --- 작업 등록 ---
+
+    def _stage_file(self, upload: SpooledUpload) -> str:
+        os.makedirs(self.staging_dir, exist_ok=True)
+        path = os.path.join(self.staging_dir, uuid.uuid4().hex)
+        with open(path, "wb") as f:
+            upload.copy_to(f)
+        return path
+
+    def submit(
+        self,
+        db: Session,
+        files: List[SpooledUpload],
+        urls: List[str],
+    ) -> Tuple[str, List[InboundJob]]:
+        """
+        업로드 파일 / URL 목록을 작업으로 등록하고 큐에 추가
+        - 업로드 파일은 임시 디렉토리에 저장 (워커가 나중에 읽음)
+        """
+        batch_id = uuid.uuid4().hex
+        sources: List[Dict[str, Any]] = []
+        for upload in files:
+            sources.append(
+                {
+                    "source_type": "file",
+                    "source": upload.filename,
+                    "mime_type": upload.mime_type,
+                    "staged_path": self._stage_file(upload),
+                }
+            )
+        for url in urls:
+            sources.append({"source_type": "url", "source": url})
+
+        jobs = InboundJobRepository(db).create_many(batch_id, sources)
+        for job in jobs:
+            self.enqueue(job.id)
+        return batch_id, jobs
+
+    def enqueue(self, job_id: int) -> None:
+        # 워커가 실행 중이 아니면 다음 start() 때 미완료 작업으로 재개됨
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+
+    # --- 워커 풀 ---
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        with self.session_factory() as db:
+            for job_id in InboundJobRepository(db).requeue_unfinished():
+                self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"Inbound batch workers started: {self.workers}")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.process_job(job_id)
+            except Exception as e:
+                logger.error(f"Inbound batch job {job_id} crashed: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    # --- 작업 처리 ---
+
+    def _update(self, job_id: int, **fields: Any) -> None:
+        with self.session_factory() as db:
+            repo = InboundJobRepository(db)
+            job = repo.get(job_id)
+            if job:
+                repo.update(job, **fields)
+
+    async def _save(self, job_id: int, **fields: Any) -> None:
+        # DB 쓰기는 스레드에서 실행 (이벤트 루프에서 다른 작업의 OCR 스트림을 막지 않도록)
+        await asyncio.to_thread(self._update, job_id, **fields)
+
+    @asynccontextmanager
+    async def _stage(self, job_id: int, name: str, status: InboundJobStatus, message: str):
+        async with self._stages[name]:
+            await self._save(job_id, status=status, progress_message=message)
+            yield
+
+    def _load(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self.session_factory() as db:
+            job = InboundJobRepository(db).get(job_id)
+            if job is None or job.status in TERMINAL_JOB_STATUSES:
+                return None
+            return {
+                "source_type": job.source_type,
+                "source": job.source,
+                "staged_path": job.staged_path,
+                "mime_type": job.mime_type or "image/jpeg",
+                "attempts": (job.attempts or 0) + 1,
+            }
+
+    async def process_job(self, job_id: int) -> None:
+        job = await asyncio.to_thread(self._load, job_id)
+        if job is None:
+            return
+        source_type, source = job["source_type"], job["source"]
+        staged_path, mime_type = job["staged_path"], job["mime_type"]
+
+        if job["attempts"] > self.max_attempts:
+            # 처리 도중 서버가 계속 중단되는 작업은 재시작마다 다시 큐에 들어오므로 횟수로 끊음
+            await self._finish(
+                job_id,
+                InboundJobStatus.FAILED,
+                staged_path,
+                error=f"재시도 횟수 초과 ({self.max_attempts}회)",
+            )
+            return
+
+        await self._save(job_id, attempts=job["attempts"], started_at=get_kst_now(), error=None)
+
+        upload = None
+        try:
+            async with self._stage(
+                job_id, "fetch", InboundJobStatus.FETCHING, "이미지를 가져오는 중..."
+            ):
+                if source_type == "file":
+                    upload = await asyncio.to_thread(
+                        analysis.open_staged, staged_path, source, mime_type
+                    )
+                else:
+                    upload, _, _ = await analysis.fetch_url(source)
+
+            async with self._stage(
+                job_id, "preprocess", InboundJobStatus.VALIDATING, "이미지 보안 및 품질 검증 중..."
+            ):
+                analysis.validate(upload)
+
+            # 같은 원본이면 캐시된 OCR 결과 사용 (디코딩 전 조회 → 전처리/모델 호출 생략)
+            ocr_result = await asyncio.to_thread(
+                self.ocr_service.cached_result, upload.content_hash
+            )
+
+            async with self._stage(
+                job_id,
+                "preprocess",
+                InboundJobStatus.PREPROCESSING,
+                "OCR 최적화를 위한 전처리 중..." if ocr_result is None else "이미지 준비 중...",
+            ):
+                # 캐시 적중 시 저장용 인코딩만
+                prepared = await analysis.prepare(upload, ocr=ocr_result is None)
+
+            if ocr_result is None:
+                async with self._stage(job_id, "ocr", InboundJobStatus.OCR, "OCR 분석 중..."):
+                    # 일괄 작업은 최종 결과만 저장
+                    # (진행 메시지/부분 결과는 건마다 DB 쓰기가 늘어나므로 저장하지 않음)
+                    stream = self.ocr_service.analyze_image_stream(
+                        prepared.ocr_bytes, prepared.ocr_mime_type, source_hash=upload.content_hash
+                    )
+                    async for update in stream:
+                        if update["status"] == "complete":
+                            ocr_result = update["data"]
+                        elif update["status"] == "error":
+                            raise analysis.AnalysisError(update["message"])
+            ocr_result = analysis.check_ocr_result(ocr_result)
+
+            async with self._stage(job_id, "save", InboundJobStatus.SAVING, "이미지 저장 중..."):
+                image_data = await asyncio.to_thread(analysis.save_image, prepared, upload.filename)
+
+            async with self._stage(
+                job_id, "match", InboundJobStatus.MATCHING, "생두 데이터베이스 매칭 중..."
+            ):
+                result = await asyncio.to_thread(self._match, ocr_result, image_data)
+
+            await self._finish(
+                job_id,
+                InboundJobStatus.COMPLETED,
+                staged_path,
+                result=result,
+                progress_message="분석 완료",
+            )
+
+        except analysis.AnalysisError as e:
+            await self._finish(job_id, InboundJobStatus.FAILED, staged_path, error=str(e))
+        except Exception as e:
+            logger.error(f"Inbound batch job {job_id} failed: {e}", exc_info=True)
+            await self._finish(
+                job_id, InboundJobStatus.FAILED, staged_path, error=f"서버 내부 오류: {str(e)}"
+            )
+        finally:
+            if upload is not None:
+                upload.close()
+
+    def _match(self, ocr_result: Dict[str, Any], image_data: Dict[str, Any]) -> Dict[str, Any]:
+        with self.session_factory() as db:
+            return analysis.build_response(ocr_result, image_data, db)
+
+    def _finish_sync(
+        self, job_id: int, status: InboundJobStatus, staged_path: Optional[str], **fields: Any
+    ) -> None:
+        self._update(job_id, status=status, finished_at=get_kst_now(), **fields)
+        if staged_path and os.path.exists(staged_path):
+            os.remove(staged_path)
+
+    async def _finish(
+        self, job_id: int, status: InboundJobStatus, staged_path: Optional[str], **fields: Any
+    ) -> None:
+        await asyncio.to_thread(self._finish_sync, job_id, status, staged_path, **fields)
+
+    # --- 조회 ---
+
+    def get_batch_status(self, db: Session, batch_id: str) -> Optional[Dict[str, Any]]:
+        jobs = InboundJobRepository(db).get_batch(batch_id)
+        if not jobs:
+            return None
+        counts: Dict[str, int] = {}
+        for job in jobs:
+            counts[job.status.value] = counts.get(job.status.value, 0) + 1
+        finished = sum(1 for job in jobs if job.status in TERMINAL_JOB_STATUSES)
+        return {
+            "batch_id": batch_id,
+            "total": len(jobs),
+            "finished": finished,
+            "completed": counts.get(InboundJobStatus.COMPLETED.value, 0),
+            "failed": counts.get(InboundJobStatus.FAILED.value, 0),
+            "done": finished == len(jobs),
+            "status_counts": counts,
+            "jobs": jobs,
+        }
+
+
+inbound_batch_service = InboundBatchService(
+    workers=settings.INBOUND_BATCH_WORKERS,
+    stage_limits={
+        "fetch": settings.INBOUND_BATCH_FETCH_CONCURRENCY,
+        "preprocess": settings.INBOUND_BATCH_PREPROCESS_CONCURRENCY,
+        "ocr": settings.INBOUND_BATCH_OCR_CONCURRENCY,
+        "save": settings.INBOUND_BATCH_SAVE_CONCURRENCY,
+        "match": settings.INBOUND_BATCH_MATCH_CONCURRENCY,
+    },
+    staging_dir=settings.INBOUND_BATCH_STAGING_DIR,
+    max_attempts=settings.INBOUND_BATCH_MAX_ATTEMPTS,
+)
@@ -2,14 +2,18 @@ import logging
 import re
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.models.bean import Bean, BeanType
 from app.models.inventory_log import InventoryChangeType
+from app.repositories.fifo_ledger_repository import FifoLedgerRepository
 from app.repositories.inbound_repository import InboundRepository
 from app.repositories.inventory_repository import InventoryRepository
-from app.schemas.inventory_log import InventoryLogCreate
+from app.repositories.bean_repository import BeanRepository
+from app.repositories.unit_of_work import UnitOfWork
 from app.schemas.inbound import InboundConfirmRequest, InboundConfirmResponse
+from app.services.bean_name_index import BeanNameMatch, bean_name_index, normalize_bean_name
+from app.services.cache_service import cache_service
+from app.services.fifo_ledger_service import FifoLedgerService
 
 logger = logging.getLogger(__name__)
 
@@ -18,48 +22,37 @@ class InboundService:
         # Repositories are initialized per request usually, but here we can pass DB session to methods
         pass
 
+    def match_beans(
+        self, bean_names: List[Optional[str]], db: Session, verify: bool = False
+    ) -> List[BeanNameMatch]:
+        """
+        명세서 품목명 목록을 한 번에 생두와 매칭 (메모리 인덱스, 품목별 DB 조회 없음)
+        - 우선순위: 정확 일치(name → name_en → name_ko) → 정규화 일치(대소문자/공백/한글 NFC 무시)
+        - 유사 일치(오타 등, BEAN_FUZZY_MATCH_THRESHOLD 이상)는 매칭하지 않고 candidates 로만 반환
+        """
+        return bean_name_index.match_many(bean_names, db, verify=verify)
+
     def match_bean_multi_field(self, bean_name: str, db: Session) -> tuple[Bean | None, str, str]:
         """
         다중 필드로 생두 매칭 시도 (대소문자 무시)
         """
-        if not bean_name:
+        match = self.match_beans([bean_name], db)[0]
+        if not match.matched:
             return None, "new", "new"
-
-        # 1. Exact match 시도 (Bean.name)
-        bean = db.query(Bean).filter(Bean.name == bean_name).first()
-        if bean:
-            return bean, "name", "exact"
-
-        # 2. Exact match 시도 (Bean.name_en)
-        bean = db.query(Bean).filter(Bean.name_en == bean_name).first()
-        if bean:
-            return bean, "name_en", "exact"
-
-        # 3. Exact match 시도 (Bean.name_ko)
-        bean = db.query(Bean).filter(Bean.name_ko == bean_name).first()
-        if bean:
-            return bean, "name_ko", "exact"
-
-        # 4. Case-insensitive match 시도 (Bean.name)
-        bean = db.query(Bean).filter(func.lower(Bean.name) == bean_name.lower()).first()
-        if bean:
-            return bean, "name", "case_insensitive"
-
-        # 5. Case-insensitive match 시도 (Bean.name_en)
-        bean = db.query(Bean).filter(func.lower(Bean.name_en) == bean_name.lower()).first()
-        if bean:
-            return bean, "name_en", "case_insensitive"
-
-        # 6. Case-insensitive match 시도 (Bean.name_ko)
-        bean = db.query(Bean).filter(func.lower(Bean.name_ko) == bean_name.lower()).first()
-        if bean:
-            return bean, "name_ko", "case_insensitive"
-
-        return None, "new", "new"
+        return db.get(Bean, match.bean_id), match.field, match.method
 
     def confirm_inbound(self, db: Session, request: InboundConfirmRequest) -> dict:
+        """
+        입고 확정: 명세서/상세/수신자 + 품목/재고 로그 저장을 한 트랜잭션으로 처리 (commit 1회)
+        """
+        cache_service.invalidate_on_commit(db, "inbound", "inventory", "beans")
+        with UnitOfWork(db):
+            new_doc = self._create_document(db, request)
+            self._create_items(db, request, new_doc)
+        return {"status": "success", "document_id": new_doc.id, "supplier_id": new_doc.supplier_id}
+
+    def _create_document(self, db: Session, request: InboundConfirmRequest):
         inbound_repo = InboundRepository(db)
-        inventory_repo = InventoryRepository(db)
 
         # 0. Check Duplicate Check
         if request.document.contract_number:
@@ -142,50 +135,95 @@ class InboundService:
                 "contact_person": request.receiver.contact_person,
             })
 
-        # 3. Process Items
-        for idx, item in enumerate(request.items):
-            bean_name = item.bean_name
-            quantity = item.quantity or 0.0
-
-            # Find Bean (다중 필드 매칭)
-            bean, match_field, match_method = self.match_bean_multi_field(bean_name, db)
-
-            if not bean:
-                logger.info(f"Creating new bean: {bean_name} (no match found)")
-                # Bean Creation should ideally be in BeanRepository, but for now using DB directly or assuming simple
-                # Let's use DB session directly here as it's a specific 'create on fly' logic
-                bean = Bean(
-                    name=bean_name,
-                    name_en=bean_name,
-                    quantity_kg=0.0,
-                    origin=item.origin or "Unknown",
-                    type=BeanType.GREEN_BEAN,
-                )
-                db.add(bean)
-                db.flush()
-            else:
+        return new_doc
+
+    def _create_items(self, db: Session, request: InboundConfirmRequest, new_doc) -> None:
+        """
+        품목 일괄 저장 (품목 수와 관계없이 쿼리 수 일정)
+        1. 생두 매칭은 품목 전체를 한 번에 (생성 전 최신 여부 확인: verify=True),
+           이름이 일치하지 않으면 검토 화면에서 선택한 생두(bean_id) 사용
+        2. 매칭되지 않은 생두는 한 번에 생성 (같은 이름의 품목은 한 생두로, 다건 INSERT ... RETURNING)
+        3. 원두별 입고량 합계를 UPDATE 한 번으로 재고에 반영
+        4. 재고 로그 executemany / 입고 품목 INSERT ... RETURNING
+        5. FIFO lot 추가 (커서가 있는 원두만)
+        """
+        items = request.items
+        if not items:
+            return
+        inbound_repo = InboundRepository(db)
+        inventory_repo = InventoryRepository(db)
+        fifo_ledger = FifoLedgerService(FifoLedgerRepository(db))
+
+        # 1~2. 생두 매칭 / 생성
+        # 서버에서는 이름 정확/정규화 일치만 매칭 (유사 일치는 자동 선택하지 않음),
+        # 그 외에는 검토 화면에서 후보 중 고른 생두(item.bean_id) 또는 새 생두
+        bean_repo = BeanRepository(db)
+        matches = self.match_beans([item.bean_name for item in items], db, verify=True)
+        selected = {
+            item.bean_id for item, match in zip(items, matches) if not match.matched and item.bean_id
+        }
+        if selected:
+            missing = selected - {bean.id for bean in bean_repo.get_by_ids(list(selected))}
+            if missing:
+                raise ValueError(f"선택한 생두를 찾을 수 없습니다: {sorted(missing)}")
+
+        bean_ids: list[Optional[int]] = []
+        new_beans: dict[str, dict] = {}
+        for item, match in zip(items, matches):
+            if match.matched:
                 logger.info(
-                    f"Matched bean: {bean_name} -> {bean.name} (ID: {bean.id}, field: {match_field})"
+                    f"Matched bean: {item.bean_name} -> {match.name} "
+                    f"(ID: {match.bean_id}, field: {match.field}, method: {match.method})"
                 )
-
-            # Create Inventory Log (using InventoryRepository mostly, but need specific fields)
-            # InventoryLogService uses InventoryRepository. Here we are inside InboundService.
-            # We can use InventoryRepository directly.
-            
-            log = InventoryLogCreate(
-                bean_id=bean.id,
-                change_type=InventoryChangeType.PURCHASE.value,
-                change_amount=quantity,
-                inbound_document_id=new_doc.id,
-                notes=f"Inbound from {new_doc.supplier_name} (Contract: {new_doc.contract_number or 'N/A'})"
-            )
-            
-            # Using InventoryRepository to create log and update stock
-            # Note: InventoryRepository.create_log handles stock update
-            inventory_repo.create_log(log)
-
-            # Create InboundItem
-            inbound_repo.create_item({
+                bean_ids.append(match.bean_id)
+                continue
+            if item.bean_id:
+                logger.info(f"Selected bean: {item.bean_name} -> ID {item.bean_id} (user choice)")
+                bean_ids.append(item.bean_id)
+                continue
+            bean_ids.append(None)
+            key = normalize_bean_name(item.bean_name)
+            if key not in new_beans:
+                logger.info(f"Creating new bean: {item.bean_name} (no match found)")
+                new_beans[key] = {
+                    "name": item.bean_name,
+                    "name_en": item.bean_name,
+                    "quantity_kg": 0.0,
+                    "origin": item.origin or "Unknown",
+                    "type": BeanType.GREEN_BEAN,
+                }
+
+        if new_beans:
+            created = bean_repo.create_many(list(new_beans.values()))
+            created_ids = {key: bean.id for key, bean in zip(new_beans, created)}
+            bean_ids = [
+                bean_id if bean_id is not None else created_ids[normalize_bean_name(item.bean_name)]
+                for item, bean_id in zip(items, bean_ids)
+            ]
+
+        # 3. 재고 반영 (원두별 합계 1회 UPDATE, 로그의 변동 후 잔고는 품목 순서대로 누적)
+        quantities = [item.quantity or 0.0 for item in items]
+        changes: dict[int, float] = {}
+        for bean_id, quantity in zip(bean_ids, quantities):
+            changes[bean_id] = changes.get(bean_id, 0.0) + quantity
+        totals = inventory_repo.apply_stock_changes(changes)
+        balances = {bean_id: totals[bean_id] - change for bean_id, change in changes.items()}
+
+        # 4. 재고 로그 / 입고 품목
+        notes = f"Inbound from {new_doc.supplier_name} (Contract: {new_doc.contract_number or 'N/A'})"
+        log_rows = []
+        item_rows = []
+        for idx, (item, bean_id, quantity) in enumerate(zip(items, bean_ids, quantities)):
+            balances[bean_id] += quantity
+            log_rows.append({
+                "bean_id": bean_id,
+                "change_type": InventoryChangeType.PURCHASE,
+                "change_amount": quantity,
+                "current_quantity": balances[bean_id],
+                "inbound_document_id": new_doc.id,
+                "notes": notes,
+            })
+            item_rows.append({
                 "inbound_document_id": new_doc.id,
                 "item_order": idx,
                 "bean_name": item.bean_name,
@@ -199,10 +237,12 @@ class InboundService:
                 "tax_amount": None,
                 "notes": item.note,
                 "order_number": item.order_number,
-                "bean_id": bean.id # Link to the matched bean
+                "bean_id": bean_id,  # Link to the matched bean
             })
+        inventory_repo.create_logs(log_rows)
+        inbound_items = inbound_repo.create_items(item_rows)
 
-        db.commit()
-        return {"status": "success", "document_id": new_doc.id, "supplier_id": supplier_id}
+        # 5. Append as new FIFO lots
+        fifo_ledger.add_lots(inbound_items)
 
 inbound_service = InboundService()
@@ -1,11 +1,15 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
 from app.models.bean import Bean
 from app.models.inventory_log import InventoryLog
 from app.schemas.inventory_log import InventoryLogCreate
+from app.repositories.fifo_ledger_repository import FifoLedgerRepository
 from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.pagination import KeysetPage
+from app.services.cache_service import cache_service
+from app.services.fifo_ledger_service import FifoLedgerService
 
 
 class InventoryLogService:
@@ -21,6 +25,33 @@ class InventoryLogService:
         repo = InventoryRepository(db)
         return repo.get_logs(bean_id, change_types, search, skip, limit)
 
+    def get_logs_page(
+        self,
+        db: Session,
+        bean_id: Optional[int] = None,
+        change_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Tuple[List[InventoryLog], int]:
+        """목록 + 전체 건수 (단일 쿼리)"""
+        repo = InventoryRepository(db)
+        return repo.get_logs_with_total(bean_id, change_types, search, skip, limit)
+
+    def get_logs_by_cursor(
+        self,
+        db: Session,
+        bean_id: Optional[int] = None,
+        change_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        with_total: bool = False,
+    ) -> KeysetPage:
+        """커서 기반 목록 (깊은 페이지도 OFFSET 없이 조회)"""
+        repo = InventoryRepository(db)
+        return repo.get_logs_by_cursor(bean_id, change_types, search, cursor, limit, with_total)
+
     def get_logs_count(
         self,
         db: Session,
@@ -33,6 +64,7 @@ class InventoryLogService:
 
     def create_log(self, db: Session, log: InventoryLogCreate) -> InventoryLog:
         repo = InventoryRepository(db)
+        cache_service.invalidate_on_commit(db, "inventory", "beans")
         
         # Bean의 현재 재고량 가져오기
         bean = repo.get_bean(log.bean_id)
@@ -55,12 +87,18 @@ class InventoryLogService:
             notes=log.notes,
         )
 
+        # FIFO lot ledger 반영 (음수 변동 = 사용량)
+        FifoLedgerService(FifoLedgerRepository(db)).apply_log_change(
+            log.bean_id, None, log.change_amount
+        )
+
         return repo.create_log(db_log)
 
     def update_log(
         self, db: Session, log_id: int, change_amount: float, notes: Optional[str] = None
     ) -> Optional[InventoryLog]:
         repo = InventoryRepository(db)
+        cache_service.invalidate_on_commit(db, "inventory", "beans")
         
         # 기존 로그 조회
         db_log = repo.get_log(log_id)
@@ -88,6 +126,10 @@ class InventoryLogService:
         # Given the repo `create_log` does commit, let's add `update_log` or `commit` to repo.
         # For now, let's keep direct object modification and use a repo method to save/commit.
         
+        FifoLedgerService(FifoLedgerRepository(db)).apply_log_change(
+            db_log.bean_id, db_log.change_amount, change_amount
+        )
+
         db_log.change_amount = change_amount
         db_log.current_quantity = new_quantity
         if notes is not None:
@@ -102,6 +144,7 @@ class InventoryLogService:
 
     def delete_log(self, db: Session, log_id: int) -> bool:
         repo = InventoryRepository(db)
+        cache_service.invalidate_on_commit(db, "inventory", "beans")
         
         # 기존 로그 조회
         db_log = repo.get_log(log_id)
@@ -120,6 +163,10 @@ class InventoryLogService:
 
         bean.quantity_kg = new_quantity
 
+        FifoLedgerService(FifoLedgerRepository(db)).apply_log_change(
+            db_log.bean_id, db_log.change_amount, None
+        )
+
         # 로그 삭제
         repo.delete_log(db_log)
         return True
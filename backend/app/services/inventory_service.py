@@ -1,8 +1,9 @@
 import logging
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
 
 from app.repositories.inbound_repository import InboundRepository
 from app.repositories.inventory_log_repository import InventoryLogRepository
+from app.services.fifo_ledger_service import FifoLedgerService
 
 logger = logging.getLogger(__name__)
 
@@ -12,9 +13,11 @@ class InventoryService:
         self,
         inbound_repo: InboundRepository,
         inventory_log_repo: InventoryLogRepository,
+        fifo_ledger: Optional[FifoLedgerService] = None,
     ):
         self.inbound_repo = inbound_repo
         self.inventory_log_repo = inventory_log_repo
+        self.fifo_ledger = fifo_ledger
 
     def calculate_fifo_cost(self, bean_id: int, quantity: float) -> Tuple[float, float]:
         """
@@ -92,3 +95,93 @@ class InventoryService:
             logger.warning(
                 f"Inventory shortage deduction for bean {bean_id}: requested {quantity}, missing {remaining_to_deduct}"
             )
+
+        # FIFO lot ledger 커서 이동 (원가 견적용)
+        if self.fifo_ledger:
+            self.fifo_ledger.record_usage(bean_id, quantity)
+
+    def consume_fifo_batch(self, quantities: Dict[int, float]) -> Dict[int, Tuple[float, float]]:
+        """
+        여러 원두의 FIFO 원가 계산 + 실제 차감을 한 번에 수행 (블렌드 로스팅용)
+
+        1. 모든 원두의 후보 입고 항목을 한 번의 쿼리로 잠금 조회
+        2. 원두별 FIFO 원가 계산
+        3. 잔여 수량 차감 후 일괄 flush
+
+        Args:
+            quantities: {bean_id: 소모할 수량(kg)}
+
+        Returns:
+            {bean_id: (weighted_avg_cost_per_kg, total_cost)}
+        """
+        return self.consume_fifo_batches([quantities])[0]
+
+    def consume_fifo_batches(
+        self, demands: List[Dict[int, float]]
+    ) -> List[Dict[int, Tuple[float, float]]]:
+        """
+        여러 배치의 FIFO 차감을 순서대로 수행 (일괄 로스팅용)
+        - 앞선 배치가 오래된 입고 항목부터 소진하고, 다음 배치는 남은 항목에서 이어서 소진
+        - 후보 입고 항목 조회 1회 + flush 1회
+
+        Args:
+            demands: 배치별 {bean_id: 소모할 수량(kg)} 목록
+
+        Returns:
+            배치별 {bean_id: (weighted_avg_cost_per_kg, total_cost)} 목록 (demands와 같은 순서)
+        """
+        results: List[Dict[int, Tuple[float, float]]] = [
+            {bean_id: (0.0, 0.0) for bean_id in quantities} for quantities in demands
+        ]
+        bean_ids = sorted({
+            bean_id
+            for quantities in demands
+            for bean_id, qty in quantities.items()
+            if qty > 0
+        })
+        if not bean_ids:
+            return results
+
+        items_by_bean: Dict[int, List] = {bean_id: [] for bean_id in bean_ids}
+        for item in self.inbound_repo.get_fifo_candidates_bulk(bean_ids):
+            items_by_bean[item.bean_id].append(item)
+
+        # 원두별 현재 소진 위치 (입고 항목 인덱스)
+        positions = {bean_id: 0 for bean_id in bean_ids}
+        usage_by_bean = {bean_id: 0.0 for bean_id in bean_ids}
+
+        for quantities, batch_result in zip(demands, results):
+            for bean_id, quantity in quantities.items():
+                if quantity <= 0:
+                    continue
+
+                items = items_by_bean[bean_id]
+                remaining_to_deduct = quantity
+                total_cost = 0.0
+
+                while remaining_to_deduct > 0 and positions[bean_id] < len(items):
+                    item = items[positions[bean_id]]
+                    deduct_amount = min(item.remaining_quantity, remaining_to_deduct)
+                    total_cost += (item.unit_price or 0.0) * deduct_amount
+                    item.remaining_quantity -= deduct_amount
+                    remaining_to_deduct -= deduct_amount
+                    if item.remaining_quantity <= 0:
+                        positions[bean_id] += 1
+
+                if remaining_to_deduct > 0:
+                    logger.warning(
+                        f"Inventory shortage deduction for bean {bean_id}: requested {quantity}, missing {remaining_to_deduct}"
+                    )
+
+                batch_result[bean_id] = (total_cost / quantity, total_cost)
+                usage_by_bean[bean_id] += quantity
+
+        # 변경된 입고 항목 일괄 반영 (commit은 Service 호출자가 처리)
+        self.inbound_repo.db.flush()
+
+        # FIFO lot ledger 커서 이동 (원두별 1회)
+        if self.fifo_ledger:
+            for bean_id, quantity in usage_by_bean.items():
+                self.fifo_ledger.record_usage(bean_id, quantity)
+
+        return results
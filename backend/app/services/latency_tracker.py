@@ -0,0 +1,74 @@
+"""
+모델별 응답 지연 히스토그램
+
+최근 N건(슬라이딩 윈도우)의 성공 응답 시간으로 백분위(p50/p90 등)를 계산한다.
+OCR 헤징(hedging)에서 "주 모델이 p90 안에 응답하지 않으면 보조 모델 병렬 요청" 기준으로 사용.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# 모니터링용 고정 버킷 (초)
+HISTOGRAM_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 60)
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def record_failure(self, key: str) -> None:
+        with self._lock:
+            self._failures[key] = self._failures.get(key, 0) + 1
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            return len(self._samples.get(key, ()))
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        """q (0~1) 백분위 응답 시간, 샘플이 없으면 None (nearest-rank)"""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        rank = max(1, math.ceil(q * len(samples)))
+        return samples[rank - 1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """모델별 샘플 수, 백분위, 버킷 히스토그램"""
+        with self._lock:
+            keys = set(self._samples) | set(self._failures)
+        result = {}
+        for key in sorted(keys):
+            with self._lock:
+                samples = list(self._samples.get(key, ()))
+                failures = self._failures.get(key, 0)
+            buckets = {
+                f"le_{bound}": sum(1 for s in samples if s <= bound) for bound in HISTOGRAM_BUCKETS
+            }
+            buckets["le_inf"] = len(samples)
+            result[key] = {
+                "count": len(samples),
+                "failures": failures,
+                "p50": self.percentile(key, 0.5),
+                "p90": self.percentile(key, 0.9),
+                "p99": self.percentile(key, 0.99),
+                "buckets": buckets,
+            }
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._failures.clear()
+
+
+ocr_latency_tracker = LatencyTracker()
@@ -0,0 +1,220 @@
+"""
+OCR 결과 캐시 서비스 (SQLite 파일, 영속)
+
+같은 명세서 사진/Drive 링크를 다시 분석할 때 LLM 호출(수 초)을 생략한다.
+- 키: 업로드 원본 내용 해시 + 프롬프트 해시 + 모델 우선순위 목록
+  (원본 기준이므로 디코딩/전처리 전에 조회 가능, 해시는 수신 중에 계산: SpooledUpload.content_hash)
+- 용량 제한: 항목 수/결과 JSON 총 크기 초과 시 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+- 설정 변경(ConfigService) 시 새 프롬프트/모델 목록과 맞지 않는 항목 제거
+- 앱 DB와 분리된 로컬 파일이므로 운영 DB 종류(PostgreSQL)와 무관
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def prompt_fingerprint(prompt: str, models: Sequence[Tuple[str, str]]) -> Tuple[str, str]:
+    """(프롬프트 해시, 모델 목록 문자열)"""
+    return _sha256(prompt.encode("utf-8")), json.dumps([list(m) for m in models])
+
+
+class OCRCacheService:
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 500,
+        max_bytes: int = 50 * 1024 * 1024,
+        enabled: bool = True,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ocr_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    image_hash TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    models TEXT NOT NULL,
+                    model_name TEXT,
+                    result_json TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+                """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_ocr_cache_last_used ON ocr_cache (last_used_at)"
+            )
+            self._initialized = True
+        return conn
+
+    def _run(self, operation, default=None):
+        """캐시 오류는 OCR 흐름을 막지 않도록 로그만 남기고 default 반환"""
+        if not self.enabled:
+            return default
+        try:
+            with self._lock:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = self._connect()
+                try:
+                    with conn:
+                        return operation(conn)
+                finally:
+                    conn.close()
+        except Exception as e:
+            logger.warning(f"OCR cache unavailable: {e}")
+            return default
+
+    @staticmethod
+    def make_key(image_hash: str, prompt_hash: str, models: str) -> str:
+        return _sha256(f"{image_hash}\n{prompt_hash}\n{models}".encode("utf-8"))
+
+    def get(
+        self, image_hash: str, prompt: str, models: Sequence[Tuple[str, str]]
+    ) -> Optional[Dict[str, Any]]:
+        prompt_hash, models_key = prompt_fingerprint(prompt, models)
+        key = self.make_key(image_hash, prompt_hash, models_key)
+
+        def operation(conn):
+            row = conn.execute(
+                "SELECT result_json FROM ocr_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            conn.execute(
+                "UPDATE ocr_cache SET last_used_at = ? WHERE cache_key = ?", (time.time(), key)
+            )
+            self._stats["hits"] += 1
+            return json.loads(row[0])
+
+        return self._run(operation)
+
+    def set(
+        self,
+        image_hash: str,
+        prompt: str,
+        models: Sequence[Tuple[str, str]],
+        result: Dict[str, Any],
+        model_name: Optional[str] = None,
+    ) -> None:
+        prompt_hash, models_key = prompt_fingerprint(prompt, models)
+        key = self.make_key(image_hash, prompt_hash, models_key)
+        payload = json.dumps(result, ensure_ascii=False)
+        size_bytes = len(payload.encode("utf-8"))
+        if size_bytes > self.max_bytes:
+            return
+
+        def operation(conn):
+            now = time.time()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO ocr_cache
+                    (cache_key, image_hash, prompt_hash, models, model_name,
+                     result_json, size_bytes, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    image_hash,
+                    prompt_hash,
+                    models_key,
+                    model_name,
+                    payload,
+                    size_bytes,
+                    now,
+                    now,
+                ),
+            )
+            self._stats["stores"] += 1
+            self._evict(conn)
+
+        self._run(operation)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        count, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM ocr_cache"
+        ).fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        victims: List[str] = []
+        for key, size_bytes in conn.execute(
+            "SELECT cache_key, size_bytes FROM ocr_cache ORDER BY last_used_at ASC"
+        ):
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            victims.append(key)
+            count -= 1
+            total_bytes -= size_bytes
+
+        conn.executemany("DELETE FROM ocr_cache WHERE cache_key = ?", [(k,) for k in victims])
+        self._stats["evictions"] += len(victims)
+
+    def retain_only(self, prompt: str, models: Sequence[Tuple[str, str]]) -> int:
+        """현재 프롬프트/모델 목록과 다른 항목 제거, 제거 개수 반환"""
+        prompt_hash, models_key = prompt_fingerprint(prompt, models)
+
+        def operation(conn):
+            deleted = conn.execute(
+                "DELETE FROM ocr_cache WHERE prompt_hash != ? OR models != ?",
+                (prompt_hash, models_key),
+            ).rowcount
+            self._stats["invalidations"] += deleted
+            return deleted
+
+        return self._run(operation, default=0)
+
+    def clear(self) -> None:
+        self._run(lambda conn: conn.execute("DELETE FROM ocr_cache"))
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 캐시 지표"""
+
+        def operation(conn):
+            return conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM ocr_cache"
+            ).fetchone()
+
+        size, total_bytes = self._run(operation, default=(0, 0))
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "size": size,
+            "total_bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+
+ocr_cache_service = OCRCacheService(
+    path=settings.OCR_CACHE_PATH,
+    max_entries=settings.OCR_CACHE_MAX_ENTRIES,
+    max_bytes=settings.OCR_CACHE_MAX_BYTES,
+    enabled=settings.OCR_CACHE_ENABLED,
+)
@@ -1,7 +1,9 @@
+import asyncio
+import hashlib
 import json
 import os
 import time
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
 from dotenv import load_dotenv
 from google import genai
@@ -12,14 +14,37 @@ load_dotenv()
 import base64
 
 import anthropic
+import httpx
+
+from app.config import settings
+from app.schemas.config import OCRConfig, OCRHedgingConfig, SystemConfig
+from app.services.latency_tracker import ocr_latency_tracker
+from app.services.ocr_cache_service import OCRCacheService, ocr_cache_service
+from app.services.ocr_stream_parser import PartialJSONParser
+from app.services.rate_limiter import RateLimiterRegistry
+
+# 응답 도중 먼저 전달할 블록 (품목 한 줄, 공급자, 금액)
+STREAM_SECTIONS = [("items", "*"), ("supplier",), ("amounts",)]
 
 
 class OCRService:
-    def __init__(self):
-        # 1. Google Gemini Init
+    def __init__(self, cache: Optional[OCRCacheService] = None):
+        # 비동기 클라이언트 공용 커넥션 풀 (스레드 없이 동시 요청 처리)
+        limits = httpx.Limits(
+            max_connections=settings.OCR_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OCR_HTTP_MAX_CONNECTIONS,
+        )
+        timeout = httpx.Timeout(settings.OCR_HTTP_TIMEOUT_SECONDS, connect=10.0)
+
+        # 1. Google Gemini Init (동기: analyze_image, 비동기: client.aio)
         google_api_key = os.getenv("GOOGLE_API_KEY")
         if google_api_key:
-            self.google_client = genai.Client(api_key=google_api_key)
+            self.google_client = genai.Client(
+                api_key=google_api_key,
+                http_options=types.HttpOptions(
+                    async_client_args={"limits": limits, "timeout": timeout}
+                ),
+            )
         else:
             print("Warning: GOOGLE_API_KEY not found.")
             self.google_client = None
@@ -28,11 +53,28 @@ class OCRService:
         anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
         if anthropic_api_key:
             self.anthropic_client = anthropic.Anthropic(api_key=anthropic_api_key)
+            self.anthropic_async_client = anthropic.AsyncAnthropic(
+                api_key=anthropic_api_key,
+                http_client=anthropic.DefaultAsyncHttpxClient(limits=limits, timeout=timeout),
+            )
         else:
             print("Warning: ANTHROPIC_API_KEY not found.")
             self.anthropic_client = None
+            self.anthropic_async_client = None
+
+        # 진행 중인 OCR 모델 호출 수 제한 (헤징 요청 포함)
+        self._call_semaphore = asyncio.Semaphore(settings.OCR_MAX_CONCURRENCY)
 
-    def _get_active_models(self) -> list[tuple[str, str]]:
+        # 3. OCR 결과 캐시 (설정 변경 시 맞지 않는 항목 제거)
+        from app.services.config_service import config_service
+
+        self.cache = cache or ocr_cache_service
+        config_service.add_listener(self._on_config_changed)
+
+        # 4. 모델별 RPM/TPM 한도 + AIMD 동시 실행 제한
+        self.rate_limiters = RateLimiterRegistry(config_service.get_ocr_config().rate_limits)
+
+    def _get_active_models(self, ocr_config: Optional[OCRConfig] = None) -> list[tuple[str, str]]:
         """
         ConfigService에서 우선순위 목록을 가져와
         현재 사용 가능한(API Key가 있는) (provider, model_name) 리스트를 반환
@@ -40,7 +82,7 @@ class OCRService:
         from app.services.config_service import config_service
 
         active_models = []
-        priority_list = config_service.get_ocr_config().model_priority
+        priority_list = (ocr_config or config_service.get_ocr_config()).model_priority
 
         for model_name in priority_list:
             provider = self._resolve_provider(model_name)
@@ -60,11 +102,11 @@ class OCRService:
             return "claude"
         return "gemini"  # Default to gemini for 'gemini-*' or others
 
-    def _generate_prompt(self) -> str:
+    def _generate_prompt(self, ocr_config: Optional[OCRConfig] = None) -> str:
         from app.services.config_service import config_service
 
         # Pydantic model -> dict -> json dump for prompt injection
-        prompt_structure_obj = config_service.get_ocr_config().prompt_structure
+        prompt_structure_obj = (ocr_config or config_service.get_ocr_config()).prompt_structure
         json_structure = prompt_structure_obj.model_dump_json(indent=2)
 
         return f"""
@@ -209,11 +251,22 @@ class OCRService:
         ────────────────────────────────────────
         Return ONLY valid JSON using the following schema.
         Do NOT wrap the code in markdown blocks (```json ... ```).
+        Write the keys in exactly the order of the schema below
+        ("debug_raw_text" LAST, after all items).
 
         JSON SCHEMA:
         {json_structure}
         """
 
+    def _on_config_changed(self, config: SystemConfig) -> None:
+        """설정 저장 후 호출 한도 반영, 새 프롬프트/모델 목록으로 만들 수 없는 캐시 항목 제거"""
+        self.rate_limiters.configure(config.ocr.rate_limits)
+        removed = self.cache.retain_only(
+            self._generate_prompt(config.ocr), self._get_active_models(config.ocr)
+        )
+        if removed:
+            print(f"🧹 [OCR Cache] Config changed, removed {removed} cached results")
+
     def _clean_and_parse_json(self, text_result: str) -> Dict[str, Any]:
         import re
 
@@ -320,32 +373,90 @@ class OCRService:
         )
         return response.text
 
+    def _claude_messages(self, image_bytes: bytes, mime_type: str, prompt: str) -> list:
+        b64_image = base64.b64encode(image_bytes).decode("utf-8")
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image",
+                        "source": {
+                            "type": "base64",
+                            "media_type": mime_type,
+                            "data": b64_image,
+                        },
+                    },
+                    {"type": "text", "text": prompt},
+                ],
+            }
+        ]
+
     def _call_claude_sync(
         self, model_name: str, image_bytes: bytes, mime_type: str, prompt: str
     ) -> str:
-        b64_image = base64.b64encode(image_bytes).decode("utf-8")
         message = self.anthropic_client.messages.create(
             model=model_name,
             max_tokens=4000,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": mime_type,
-                                "data": b64_image,
-                            },
-                        },
-                        {"type": "text", "text": prompt},
-                    ],
-                }
-            ],
+            messages=self._claude_messages(image_bytes, mime_type, prompt),
         )
         return message.content[0].text
 
+    async def _call_gemini_async(
+        self,
+        model_name: str,
+        image_bytes: bytes,
+        mime_type: str,
+        prompt: str,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> tuple[str, Optional[int]]:
+        """(응답 텍스트, 사용 토큰 수), 스트리밍 API 로 받으며 조각마다 on_text 호출"""
+        stream = await self.google_client.aio.models.generate_content_stream(
+            model=model_name,
+            contents=[types.Part.from_bytes(data=image_bytes, mime_type=mime_type), prompt],
+        )
+        parts = []
+        usage = None
+        async for chunk in stream:
+            text = chunk.text
+            if text:
+                parts.append(text)
+                if on_text:
+                    on_text(text)
+            usage = getattr(chunk, "usage_metadata", None) or usage
+        return "".join(parts), getattr(usage, "total_token_count", None)
+
+    async def _call_claude_async(
+        self,
+        model_name: str,
+        image_bytes: bytes,
+        mime_type: str,
+        prompt: str,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> tuple[str, Optional[int]]:
+        """(응답 텍스트, 사용 토큰 수), 스트리밍 API 로 받으며 조각마다 on_text 호출"""
+        async with self.anthropic_async_client.messages.stream(
+            model=model_name,
+            max_tokens=4000,
+            messages=self._claude_messages(image_bytes, mime_type, prompt),
+        ) as stream:
+            async for text in stream.text_stream:
+                if on_text:
+                    on_text(text)
+            message = await stream.get_final_message()
+        usage = getattr(message, "usage", None)
+        used_tokens = usage.input_tokens + usage.output_tokens if usage else None
+        return message.content[0].text, used_tokens
+
+    async def aclose(self) -> None:
+        """비동기 클라이언트 커넥션 풀 정리 (앱 종료 시)"""
+        if self.anthropic_async_client:
+            await self.anthropic_async_client.close()
+        if self.google_client:
+            aclose = getattr(self.google_client.aio, "aclose", None)
+            if aclose:
+                await aclose()
+
     def analyze_image(self, image_bytes: bytes, mime_type: str = "image/jpeg") -> Dict[str, Any]:
         models = self._get_active_models()
         if not models:
@@ -396,9 +507,118 @@ class OCRService:
             print("❌ All models exhausted quotas or failed.")
             raise Exception(f"OCR Failed on all providers: {last_exception}")
 
-    async def analyze_image_stream(self, image_bytes: bytes, mime_type: str = "image/jpeg"):
+    def _hedge_delay(self, model_name: str, hedging: OCRHedgingConfig) -> float:
+        """보조 모델을 병렬 요청하기 전 대기 시간 (모델별 응답 시간 백분위)"""
+        if ocr_latency_tracker.count(model_name) < hedging.min_samples:
+            return hedging.default_delay_seconds
+        delay = ocr_latency_tracker.percentile(model_name, hedging.percentile)
+        return max(hedging.min_delay_seconds, delay or hedging.default_delay_seconds)
+
+    async def _attempt_model(
+        self,
+        provider: str,
+        model_name: str,
+        image_bytes: bytes,
+        mime_type: str,
+        prompt: str,
+        on_partial: Optional[Callable[[tuple, Any], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        단일 모델 호출 + JSON 파싱 (파싱 가능한 응답만 성공으로 간주)
+        on_partial: 응답 도중 STREAM_SECTIONS 블록이 완성될 때마다 (경로, 값) 으로 호출
+        """
+        on_text = None
+        if on_partial:
+            parser = PartialJSONParser(STREAM_SECTIONS)
+
+            def on_text(chunk: str) -> None:
+                for path, value in parser.feed(chunk):
+                    on_partial(path, value)
+
+        limiter = None
+        if self.rate_limiters.config.enabled:
+            limiter = self.rate_limiters.get(model_name)
+
+        try:
+            # 모델별 RPM/TPM 한도 안에서만 요청 (초과 시 대기열에서 순서대로 대기)
+            # 전역 세마포어보다 먼저 확보: 한도에 걸린 모델이 대기하는 동안
+            # 전역 슬롯을 잡고 있으면 다른 모델 요청까지 막힘
+            permit = None
+            if limiter:
+                permit = await limiter.acquire(self.rate_limiters.estimate_tokens(prompt))
+
+            try:
+                # 비동기 SDK 호출 (스레드 미사용), 동시 호출 수는 세마포어로 제한
+                async with self._call_semaphore:
+                    started = time.monotonic()
+                    if provider == "gemini":
+                        text_result, used_tokens = await self._call_gemini_async(
+                            model_name, image_bytes, mime_type, prompt, on_text=on_text
+                        )
+                    else:
+                        text_result, used_tokens = await self._call_claude_async(
+                            model_name, image_bytes, mime_type, prompt, on_text=on_text
+                        )
+                    elapsed = time.monotonic() - started
+            except BaseException as e:
+                if permit:
+                    # 429/529 이면 동시 실행 수 감소 (AIMD)
+                    await limiter.release(permit, error=e)
+                raise
+            if permit:
+                await limiter.release(permit, used_tokens=used_tokens)
+
+            print(
+                f"📄 [OCR Raw] {provider} Response:\n{text_result[:500]}..."
+            )  # Log first 500 chars
+
+            result_json = self._clean_and_parse_json(text_result)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            ocr_latency_tracker.record_failure(model_name)
+            raise
+
+        ocr_latency_tracker.record(model_name, elapsed)
+        return result_json
+
+    def cached_result(self, source_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        업로드 원본 해시로 캐시된 OCR 결과 조회 (현재 프롬프트/모델 목록 기준)
+        - 디코딩/전처리 전에 호출하여 적중 시 이미지 준비 비용까지 생략
+        """
+        models = self._get_active_models()
+        if not models:
+            return None
+        try:
+            prompt = self._generate_prompt()
+        except Exception:
+            return None
+        cached = self.cache.get(source_hash, prompt, models)
+        if cached is not None:
+            print("⚡ [OCR Cache] Hit, skipping preprocessing and model call")
+        return cached
+
+    async def analyze_image_stream(
+        self,
+        image_bytes: bytes,
+        mime_type: str = "image/jpeg",
+        source_hash: Optional[str] = None,
+    ):
         """
         Async Generator that yields status updates and finally the result.
+
+        캐시: source_hash(업로드 원본 해시)를 주면 호출자가 cached_result 로 이미 조회한 것으로 보고
+        결과만 그 키로 저장, 없으면 image_bytes 해시로 조회/저장
+
+        헤징 모드: 진행 중인 모델이 p90 응답 시간 안에 답하지 않으면 다음 모델을 병렬 요청하고,
+        먼저 유효한 JSON을 반환한 결과를 사용 (나머지 요청은 취소).
+
+        부분 결과: 모델 응답 도중 품목/공급자/금액 블록이 완성되면 바로 전달
+        {"status": "partial", "section": "items" | "supplier" | "amounts", "index": 품목 순번, "data": {...}}
+        - 가장 먼저 부분 결과를 보낸 모델(선두)의 것만 전달
+        - 선두 모델이 실패하면 {"status": "reset"} 후 진행 중인 다른 모델의 부분 결과를 다시 전달
+        - 최종 결과는 항상 "complete" 이벤트의 data (부분 결과는 미리보기)
         """
         models = self._get_active_models()
         if not models:
@@ -411,70 +631,187 @@ class OCRService:
             yield {"status": "error", "message": f"Failed to load OCR schema: {e}"}
             return
 
+        # 같은 이미지 + 같은 프롬프트/모델 목록이면 캐시된 결과를 바로 반환
+        cache_key = source_hash
+        if cache_key is None:
+            cache_key = hashlib.sha256(image_bytes).hexdigest()
+            cached_result = self.cache.get(cache_key, prompt, models)
+            if cached_result is not None:
+                print("⚡ [OCR Cache] Hit, skipping model call")
+                yield {"status": "complete", "data": cached_result, "cached": True}
+                return
+
+        from app.services.config_service import config_service
+
+        hedging = config_service.get_ocr_config().hedging
+        max_parallel = hedging.max_parallel if hedging.enabled else 1
+
+        remaining = list(models)
+        pending: Dict[asyncio.Task, tuple[str, str]] = {}
+        last_launched_at = 0.0
         last_exception = None
 
-        for provider, model_name in models:
-            provider_label = "Gemini" if provider == "gemini" else "Claude"
+        # 모델 호출 태스크가 넣는 부분 결과 (모델명, 경로, 값)
+        partials: asyncio.Queue = asyncio.Queue()
+        partial_waiter: Optional[asyncio.Task] = None
+        received: Dict[str, list] = {}
+        leader: Optional[str] = None
+
+        def label(provider: str) -> str:
+            return "Gemini" if provider == "gemini" else "Claude"
+
+        def launch() -> tuple[str, str]:
+            nonlocal last_launched_at
+            provider, model_name = remaining.pop(0)
+            task = asyncio.create_task(
+                self._attempt_model(
+                    provider,
+                    model_name,
+                    image_bytes,
+                    mime_type,
+                    prompt,
+                    on_partial=lambda path, value: partials.put_nowait((model_name, path, value)),
+                )
+            )
+            pending[task] = (provider, model_name)
+            last_launched_at = time.monotonic()
+            return provider, model_name
+
+        def partial_event(path: tuple, value: Any) -> Dict[str, Any]:
+            event = {"status": "partial", "section": path[0], "data": value}
+            if path[0] == "items":
+                event["index"] = path[1]
+            return event
+
+        def drain_partials(first=None) -> list:
+            """대기 중인 부분 결과를 모델별로 보관하고, 선두 모델의 것만 이벤트로"""
+            nonlocal leader
+            batch = [first] if first else []
+            while not partials.empty():
+                batch.append(partials.get_nowait())
+            events = []
+            for model_name, path, value in batch:
+                received.setdefault(model_name, []).append((path, value))
+                if leader is None:
+                    leader = model_name
+                if model_name == leader:
+                    events.append(partial_event(path, value))
+            return events
+
+        try:
+            provider, model_name = launch()
             yield {
                 "status": "progress",
-                "message": f"{provider_label} ({model_name}) 모델로 분석 중...",
+                "message": f"{label(provider)} ({model_name}) 모델로 분석 중...",
             }
 
-            try:
-                text_result = ""
-                # Wrap sync calls in asyncio.to_thread to avoid blocking event loop
-                import asyncio
-
-                if provider == "gemini":
-                    text_result = await asyncio.to_thread(
-                        self._call_gemini_sync, model_name, image_bytes, mime_type, prompt
+            while pending:
+                timeout = None
+                if hedging.enabled and remaining and len(pending) < max_parallel:
+                    newest_model = list(pending.values())[-1][1]
+                    timeout = max(
+                        0.0,
+                        last_launched_at + self._hedge_delay(newest_model, hedging) - time.monotonic(),
                     )
-                elif provider == "claude":
-                    text_result = await asyncio.to_thread(
-                        self._call_claude_sync, model_name, image_bytes, mime_type, prompt
-                    )
-
-                print(
-                    f"📄 [OCR Raw] {provider} Response:\n{text_result[:500]}..."
-                )  # Log first 500 chars
-
-                result_json = self._clean_and_parse_json(text_result)
-
-                # 🆕 후처리: 주문별 그룹화
-                result_json = self._post_process_ocr_result(result_json)
 
-                yield {"status": "complete", "data": result_json}
-                return
-
-            except Exception as e:
-                error_str = str(e)
-                last_exception = e
-
-                retry_codes = [
-                    "429",
-                    "503",
-                    "500",
-                    "529",
-                    "RESOURCE_EXHAUSTED",
-                    "UNAVAILABLE",
-                    "Internal Server Error",
-                    "Overloaded",
-                ]
+                if partial_waiter is None:
+                    partial_waiter = asyncio.ensure_future(partials.get())
+                done, _ = await asyncio.wait(
+                    [*pending.keys(), partial_waiter],
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                # 끝난 모델의 부분 결과는 모두 큐에 들어가 있으므로 결과 처리 전에 먼저 전달
+                first = None
+                if partial_waiter in done:
+                    done.discard(partial_waiter)
+                    first = partial_waiter.result()
+                    partial_waiter = None
+                for event in drain_partials(first):
+                    yield event
+                if first is not None and not done:
+                    continue
 
-                if any(code in error_str for code in retry_codes):
-                    print(f"⚠️ [OCR Stream] Transient Error for {model_name}: {e}")
+                if not done:
+                    # 응답 지연 → 다음 모델 병렬 요청 (헤징)
+                    provider, model_name = launch()
+                    print(f"⏱️ [OCR Stream] Hedging with {model_name}")
                     yield {
                         "status": "progress",
-                        "message": f"{provider_label} 일시적 오류. 다음 모델로 전환합니다...",
+                        "message": f"응답 지연으로 {label(provider)} ({model_name}) 모델 병렬 분석 중...",
                     }
-                    await asyncio.sleep(1)
                     continue
 
-                print(f"❌ [OCR Stream] Error for {model_name}: {e}")
-                yield {
-                    "status": "progress",
-                    "message": f"{provider_label} 분석 실패: {e}. 다음 모델 시도...",
-                }
-                continue
+                for task in done:
+                    provider, model_name = pending.pop(task)
+                    try:
+                        result_json = task.result()
+                    except Exception as e:
+                        error_str = str(e)
+                        last_exception = e
+
+                        retry_codes = [
+                            "429",
+                            "503",
+                            "500",
+                            "529",
+                            "RESOURCE_EXHAUSTED",
+                            "UNAVAILABLE",
+                            "Internal Server Error",
+                            "Overloaded",
+                        ]
+
+                        if any(code in error_str for code in retry_codes):
+                            print(f"⚠️ [OCR Stream] Transient Error for {model_name}: {e}")
+                            yield {
+                                "status": "progress",
+                                "message": f"{label(provider)} 일시적 오류. 다음 모델로 전환합니다...",
+                            }
+                            if not hedging.enabled:
+                                await asyncio.sleep(1)
+                        else:
+                            print(f"❌ [OCR Stream] Error for {model_name}: {e}")
+                            yield {
+                                "status": "progress",
+                                "message": f"{label(provider)} 분석 실패: {e}. 다음 모델 시도...",
+                            }
+
+                        received.pop(model_name, None)
+                        if model_name == leader:
+                            # 실패한 모델의 미리보기 제거, 진행 중인 다른 모델의 부분 결과로 교체
+                            leader = next(
+                                (name for _, name in pending.values() if received.get(name)), None
+                            )
+                            yield {"status": "reset", "message": "부분 결과를 다시 표시합니다..."}
+                            for path, value in received.get(leader, []):
+                                yield partial_event(path, value)
+                        continue
+
+                    # 🆕 후처리: 주문별 그룹화
+                    result_json = self._post_process_ocr_result(result_json)
+
+                    if not result_json.get("error"):
+                        self.cache.set(cache_key, prompt, models, result_json, model_name)
+
+                    yield {"status": "complete", "data": result_json}
+                    return
+
+                # 실패한 요청 대신 다음 모델 시작
+                if not pending and remaining:
+                    provider, model_name = launch()
+                    yield {
+                        "status": "progress",
+                        "message": f"{label(provider)} ({model_name}) 모델로 분석 중...",
+                    }
+
+            yield {"status": "error", "message": f"모든 분석 모델 시도 실패: {last_exception}"}
+        finally:
+            # 먼저 끝난 결과를 사용했거나 스트림이 중단되면 남은 요청 취소
+            for task in pending:
+                task.cancel()
+            if partial_waiter is not None:
+                partial_waiter.cancel()
+
 
-        yield {"status": "error", "message": f"모든 분석 모델 시도 실패: {last_exception}"}
+ocr_service = OCRService()
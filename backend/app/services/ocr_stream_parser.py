@@ -0,0 +1,130 @@
+"""
+OCR 응답 스트리밍 부분 파싱
+
+모델 응답을 토큰 단위로 받는 동안, 지정한 경로의 JSON 객체/배열이 닫히는 즉시 파싱해 돌려준다.
+(전체 응답을 기다리지 않고 품목 한 줄, 공급자, 금액 블록을 먼저 화면에 표시)
+- 새로 받은 부분만 스캔: 문자열/이스케이프/중첩 깊이를 상태로 유지 (응답 전체를 반복 파싱하지 않음)
+- 경로: 키 튜플, 배열 원소는 "*" (예: ("items", "*"), ("supplier",))
+- 첫 "{" 이전 텍스트(```json 등)와 최상위 객체 이후 텍스트는 무시
+- 파싱할 수 없는 값은 건너뜀 (최종 결과는 전체 응답을 다시 파싱하여 사용)
+"""
+
+import json
+import re
+from typing import Any, Iterable, List, Optional, Tuple
+
+WILDCARD = "*"
+
+# 문자열 밖: 구조 문자만, 문자열 안: 종료 따옴표/이스케이프만 찾아 건너뜀
+_STRUCTURAL = re.compile(r'[{}\[\]",]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+Path = Tuple[Any, ...]
+
+
+class _Frame:
+    __slots__ = ("kind", "path", "start", "watched", "key", "expect_key", "index")
+
+    def __init__(self, kind: str, path: Path, start: int, watched: bool):
+        self.kind = kind
+        self.path = path
+        self.start = start
+        self.watched = watched
+        self.key: Optional[str] = None
+        self.expect_key = kind == "{"
+        self.index = 0
+
+
+class PartialJSONParser:
+    def __init__(self, watch: Iterable[Path]):
+        self.watch = [tuple(pattern) for pattern in watch]
+        self.text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._string_start = 0
+        self._finished = False
+
+    def _is_watched(self, path: Path) -> bool:
+        return any(
+            len(pattern) == len(path)
+            and all(p == WILDCARD or p == k for p, k in zip(pattern, path))
+            for pattern in self.watch
+        )
+
+    def feed(self, chunk: str) -> List[Tuple[Path, Any]]:
+        """응답 조각 추가 → 이번 조각에서 완성된 (경로, 값) 목록"""
+        self.text += chunk
+        if self._finished:
+            return []
+
+        text = self.text
+        end = len(text)
+        completed: List[Tuple[Path, Any]] = []
+        i = self._pos
+
+        while i < end:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(text, i)
+                if match is None:
+                    i = end
+                    break
+                i = match.start()
+                if text[i] == "\\":
+                    if i + 1 >= end:
+                        break  # 이스케이프 다음 문자가 아직 도착하지 않음
+                    i += 2
+                    continue
+                self._in_string = False
+                frame = self._stack[-1]
+                if frame.kind == "{" and frame.expect_key:
+                    try:
+                        frame.key = json.loads(text[self._string_start : i + 1])
+                    except ValueError:
+                        frame.key = text[self._string_start + 1 : i]
+                    frame.expect_key = False
+                i += 1
+                continue
+
+            if not self._stack:
+                i = text.find("{", i)
+                if i < 0:
+                    i = end
+                    break
+                self._stack.append(_Frame("{", (), i, self._is_watched(())))
+                i += 1
+                continue
+
+            match = _STRUCTURAL.search(text, i)
+            if match is None:
+                i = end
+                break
+            i = match.start()
+            char = text[i]
+            frame = self._stack[-1]
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                path = frame.path + ((frame.key,) if frame.kind == "{" else (frame.index,))
+                self._stack.append(_Frame(char, path, i, self._is_watched(path)))
+            elif char in "}]":
+                self._stack.pop()
+                if frame.watched:
+                    try:
+                        completed.append((frame.path, json.loads(text[frame.start : i + 1])))
+                    except ValueError:
+                        pass
+                if not self._stack:
+                    self._finished = True
+                    i += 1
+                    break
+            elif frame.kind == "{":  # ","
+                frame.expect_key = True
+            else:
+                frame.index += 1
+            i += 1
+
+        self._pos = i
+        return completed
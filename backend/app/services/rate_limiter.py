@@ -0,0 +1,214 @@
+"""
+OCR 공급자/모델별 호출 한도 관리
+
+- 토큰 버킷: 모델별 RPM(분당 요청), TPM(분당 토큰) 한도를 넘지 않도록
+  요청을 대기열에서 순서대로 내보냄
+  · 요청 전 예상 토큰으로 차감하고, 응답의 실제 사용량으로 보정
+- AIMD 동시 실행 제한: 429/529(한도 초과/과부하) 응답 시 동시 실행 수를 배수로 줄이고,
+  성공할 때마다 조금씩(+1/limit) 늘림
+- 한도 값은 system_config.json 의 ocr.rate_limits 에서 읽고, 설정 변경 시 즉시 반영
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.schemas.config import OCRModelRateLimit, OCRRateLimitConfig
+
+THROTTLE_MARKERS = ("429", "529", "RESOURCE_EXHAUSTED", "rate_limit", "Overloaded")
+
+
+def is_throttle_error(error: Exception) -> bool:
+    """한도 초과/과부하 오류 여부 (SDK 예외의 상태 코드 우선, 없으면 메시지)"""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status in (429, 529):
+        return True
+    message = str(error)
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+
+class TokenBucket:
+    """분당 한도를 초당 보충량으로 환산한 토큰 버킷 (capacity=None 이면 무제한)"""
+
+    def __init__(self, per_minute: Optional[int]):
+        self.tokens = 0.0
+        self.updated_at = time.monotonic()
+        self.configure(per_minute)
+        if self.capacity is not None:
+            self.tokens = self.capacity  # 시작 시 가득 찬 상태
+
+    def configure(self, per_minute: Optional[int]) -> None:
+        self.capacity = float(per_minute) if per_minute else None
+        self.refill_per_second = per_minute / 60.0 if per_minute else 0.0
+        if self.capacity is not None:
+            self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.capacity is not None:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second
+            )
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount 만큼 차감 가능해질 때까지 남은 시간(초)"""
+        if self.capacity is None:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)  # 한도보다 큰 요청도 버킷이 가득 차면 통과
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        """차감 (보정 시 음수 잔량 허용 → 이후 요청이 그만큼 대기)"""
+        if self.capacity is None:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+    def drain(self) -> None:
+        """한도 초과 응답을 받으면 남은 토큰을 비워 잠시 쉬어가도록 함"""
+        if self.capacity is not None:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+class AIMDConcurrency:
+    """가산 증가/배수 감소 동시 실행 제한"""
+
+    def __init__(self, minimum: int, maximum: int, decrease_factor: float = 0.5):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.decrease_factor = decrease_factor
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    def configure(self, minimum: int, maximum: int, decrease_factor: float) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.decrease_factor = decrease_factor
+        self.limit = min(max(self.limit, self.minimum), self.maximum)
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < math.floor(self.limit))
+            self.in_flight += 1
+
+    async def release(self, throttled: bool = False, succeeded: bool = True) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(float(self.minimum), self.limit * self.decrease_factor)
+            elif succeeded:
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            condition.notify_all()
+
+
+@dataclass
+class Permit:
+    estimated_tokens: int
+    acquired_at: float
+
+
+class ModelRateLimiter:
+    def __init__(self, limits: OCRModelRateLimit, decrease_factor: float = 0.5):
+        self.requests = TokenBucket(limits.rpm)
+        self.tokens = TokenBucket(limits.tpm)
+        self.concurrency = AIMDConcurrency(
+            limits.min_concurrency, limits.max_concurrency, decrease_factor
+        )
+        self._queue_lock: Optional[asyncio.Lock] = None
+        self.stats = {"requests": 0, "throttled": 0, "waited_seconds": 0.0}
+
+    def configure(self, limits: OCRModelRateLimit, decrease_factor: float) -> None:
+        self.requests.configure(limits.rpm)
+        self.tokens.configure(limits.tpm)
+        self.concurrency.configure(limits.min_concurrency, limits.max_concurrency, decrease_factor)
+
+    async def acquire(self, estimated_tokens: int) -> Permit:
+        """동시 실행 슬롯 확보 후 RPM/TPM 버킷이 허용할 때까지 대기 (요청 순서대로)"""
+        started = time.monotonic()
+        await self.concurrency.acquire()
+        try:
+            if self._queue_lock is None:
+                self._queue_lock = asyncio.Lock()
+            async with self._queue_lock:
+                while True:
+                    wait = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+                self.requests.consume(1)
+                self.tokens.consume(estimated_tokens)
+        except BaseException:
+            await self.concurrency.release(succeeded=False)
+            raise
+
+        self.stats["requests"] += 1
+        self.stats["waited_seconds"] += time.monotonic() - started
+        return Permit(estimated_tokens=estimated_tokens, acquired_at=time.monotonic())
+
+    async def release(
+        self,
+        permit: Permit,
+        used_tokens: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        throttled = isinstance(error, Exception) and is_throttle_error(error)
+        if throttled:
+            self.stats["throttled"] += 1
+            self.requests.drain()
+        if used_tokens is not None:
+            self.tokens.consume(used_tokens - permit.estimated_tokens)
+        await self.concurrency.release(throttled=throttled, succeeded=error is None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "rpm": self.requests.capacity,
+            "tpm": self.tokens.capacity,
+        }
+
+
+class RateLimiterRegistry:
+    """모델명 → ModelRateLimiter (설정에 없는 모델은 기본 한도)"""
+
+    def __init__(self, config: Optional[OCRRateLimitConfig] = None):
+        self.config = config or OCRRateLimitConfig()
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+
+    def configure(self, config: OCRRateLimitConfig) -> None:
+        self.config = config
+        for model_name, limiter in self._limiters.items():
+            limiter.configure(self._limits_for(model_name), config.decrease_factor)
+
+    def _limits_for(self, model_name: str) -> OCRModelRateLimit:
+        return self.config.models.get(model_name, self.config.default)
+
+    def get(self, model_name: str) -> ModelRateLimiter:
+        limiter = self._limiters.get(model_name)
+        if limiter is None:
+            limiter = ModelRateLimiter(self._limits_for(model_name), self.config.decrease_factor)
+            self._limiters[model_name] = limiter
+        return limiter
+
+    def estimate_tokens(self, prompt: str) -> int:
+        """요청 예상 토큰 (프롬프트 글자 수/4 + 이미지 + 예상 출력)"""
+        return len(prompt) // 4 + self.config.image_tokens + self.config.output_tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: limiter.snapshot() for name, limiter in sorted(self._limiters.items())}
@@ -3,17 +3,36 @@
 Ref: docs/Planning/Themoon_Rostings_v2.md
 """
 
+from contextlib import nullcontext
+from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple
+
 from fastapi import HTTPException
 from app.models.bean import Bean, BeanType, RoastProfile
 from app.models.inventory_log import InventoryChangeType, InventoryLog
 from app.models.roasting_log import RoastingLog
 from app.services.bean_service import BeanService
+from app.services.cache_service import cache_service
 from app.services.inventory_service import InventoryService
+from app.repositories.batch_sequence_repository import BatchSequenceRepository
 from app.repositories.blend_repository import BlendRepository
 from app.repositories.roasting_log_repository import RoastingLogRepository
+from app.repositories.roasting_rollup_repository import RoastingRollupRepository
+from app.repositories.unit_of_work import UnitOfWork
 from app.utils.timezone import get_kst_now
 
 
+def transactional(func):
+    """RoastingService 메서드를 Unit of Work 트랜잭션으로 감싼다 (예외 시 rollback)"""
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._transaction():
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
 class RoastingService:
     def __init__(
         self,
@@ -21,38 +40,111 @@ class RoastingService:
         inventory_service: InventoryService,
         blend_repo: BlendRepository,
         roasting_log_repo: RoastingLogRepository,
+        batch_sequence_repo: BatchSequenceRepository,
+        rollup_repo: RoastingRollupRepository,
+        unit_of_work: Optional[UnitOfWork] = None,
     ):
         self.bean_service = bean_service
         self.inventory_service = inventory_service
         self.blend_repo = blend_repo
         self.roasting_log_repo = roasting_log_repo
+        self.batch_sequence_repo = batch_sequence_repo
+        self.rollup_repo = rollup_repo
+        # 지정 시 로스팅 1건을 단일 트랜잭션으로 처리 (repository는 flush만, 마지막에 1회 commit)
+        # 미지정 시 repository 호출마다 commit (기존 동작)
+        self.unit_of_work = unit_of_work
+
+    def _transaction(self):
+        return self.unit_of_work if self.unit_of_work is not None else nullcontext()
+
+    def _invalidate_caches(self) -> None:
+        """로스팅 기록 commit 후 대시보드/통계 캐시 무효화"""
+        cache_service.invalidate_on_commit(
+            self.roasting_log_repo.db, "roasting", "beans", "inventory"
+        )
+
+    def generate_batch_nos(self, count: int) -> List[str]:
+        """생산 배치 번호 블록 생성 (예: R251225-001, R251225-002, ...)"""
+        prefix = f"R{get_kst_now().strftime('%y%m%d')}"
+        first = self.batch_sequence_repo.reserve(prefix, count)
+        return [f"{prefix}-{seq:03d}" for seq in range(first, first + count)]
 
     def generate_batch_no(self) -> str:
         """생산 배치 번호 생성 (예: R251225-001)"""
-        now = get_kst_now()
-        date_str = now.strftime("%y%m%d")
-        prefix = f"R{date_str}"
-        
-        latest = self.roasting_log_repo.get_latest_batch_no()
-        if latest and latest.startswith(prefix):
-            try:
-                seq = int(latest.split("-")[-1]) + 1
-            except (ValueError, IndexError):
-                seq = 1
-        else:
-            seq = 1
-            
-        return f"{prefix}-{seq:03d}"
+        return self.generate_batch_nos(1)[0]
 
-    def generate_roasted_bean_sku(self, green_bean: Bean, profile: RoastProfile) -> str:
-        """원두 SKU 생성 (예: Yirgacheffe-신콩)"""
-        profile_kr = (
+    @staticmethod
+    def _profile_label(profile: RoastProfile) -> str:
+        return (
             "신콩"
             if profile == RoastProfile.LIGHT
             else "탄콩" if profile == RoastProfile.DARK else "미디엄"
         )
-        return f"{green_bean.name}-{profile_kr}"
 
+    def generate_roasted_bean_sku(self, green_bean: Bean, profile: RoastProfile) -> str:
+        """원두 SKU 생성 (예: Yirgacheffe-신콩)"""
+        return f"{green_bean.name}-{self._profile_label(profile)}"
+
+    def generate_blend_bean_sku(self, blend) -> str:
+        """블렌드 원두 SKU 생성 (예: BLEND-3-TheMoonBlend)"""
+        return f"BLEND-{blend.id}-{blend.name.replace(' ', '')}"
+
+    @staticmethod
+    def _recipe_entries(recipe) -> List[Tuple[int, float]]:
+        """레시피 항목 → [(bean_id, ratio)]"""
+        # item은 dict 또는 BlendRecipeItem pydantic model 일 수 있음
+        return [
+            (
+                item.bean_id if hasattr(item, 'bean_id') else item['bean_id'],
+                item.ratio if hasattr(item, 'ratio') else item['ratio'],
+            )
+            for item in recipe
+        ]
+
+    @staticmethod
+    def _required_input(
+        bean: Bean, ratio: float, output_weight: float, input_weight: Optional[float]
+    ) -> float:
+        """블렌드 구성 원두의 투입 필요량 (투입량 미지정 시 예상 손실률로 역산)"""
+        if input_weight:
+            return input_weight * ratio
+        loss_rate = bean.expected_loss_rate if bean.expected_loss_rate is not None else 0.15
+        return output_weight * ratio / (1 - loss_rate)
+
+    def _single_origin_bean_data(
+        self, green_bean: Bean, roast_profile: RoastProfile, production_cost_per_kg: float
+    ) -> dict:
+        """싱글 오리진 원두 신규 생성 데이터"""
+        return {
+            "name": f"{green_bean.name} {self._profile_label(roast_profile)}",
+            "type": BeanType.ROASTED_BEAN,
+            "sku": self.generate_roasted_bean_sku(green_bean, roast_profile),
+            "origin": green_bean.origin,
+            "variety": green_bean.variety,
+            "grade": green_bean.grade,
+            "processing_method": green_bean.processing_method,
+            "roast_profile": roast_profile,
+            "parent_bean_id": green_bean.id,
+            "quantity_kg": 0.0,
+            "avg_price": production_cost_per_kg,
+            "cost_price": production_cost_per_kg,
+        }
+
+    def _blend_bean_data(self, blend, production_cost_per_kg: float) -> dict:
+        """블렌드 원두 신규 생성 데이터"""
+        return {
+            "name": f"{blend.name}",
+            "type": BeanType.BLEND_BEAN,
+            "sku": self.generate_blend_bean_sku(blend),
+            "origin": "Blend",
+            "roast_profile": RoastProfile.MEDIUM,
+            "quantity_kg": 0.0,
+            "avg_price": production_cost_per_kg,
+            "cost_price": production_cost_per_kg,
+            "notes": f"Blend based on {blend.name}",
+        }
+
+    @transactional
     def create_single_origin_roasting(
         self,
         green_bean_id: int,
@@ -70,6 +162,8 @@ class RoastingService:
         2. 원두 재고 증가 (없으면 생성)
         3. 원가 및 손실률 계산
         """
+        self._invalidate_caches()
+
         # 1. 생두 조회 및 검증
         green_bean = self.bean_service.get_bean(green_bean_id)
         if not green_bean:
@@ -127,25 +221,9 @@ class RoastingService:
 
         if not roasted_bean:
             # 원두 신규 생성
-            profile_kr = (
-                "신콩"
-                if roast_profile == RoastProfile.LIGHT
-                else "탄콩" if roast_profile == RoastProfile.DARK else "미디엄"
+            roasted_bean_data = self._single_origin_bean_data(
+                green_bean, roast_profile, production_cost_per_kg
             )
-            roasted_bean_data = {
-                "name": f"{green_bean.name} {profile_kr}",
-                "type": BeanType.ROASTED_BEAN,
-                "sku": sku,
-                "origin": green_bean.origin,
-                "variety": green_bean.variety,
-                "grade": green_bean.grade,
-                "processing_method": green_bean.processing_method,
-                "roast_profile": roast_profile,
-                "parent_bean_id": green_bean.id,
-                "quantity_kg": 0.0,
-                "avg_price": production_cost_per_kg,
-                "cost_price": production_cost_per_kg,
-            }
             roasted_bean = self.bean_service.repository.create(roasted_bean_data)
         else:
             # 기존 원두: FIFO 기반 가중평균으로 avg_price 업데이트
@@ -161,6 +239,7 @@ class RoastingService:
 
         # Batch Log의 target_bean_id 정확한 ID로 업데이트
         self.roasting_log_repo.update(roasting_log, {"target_bean_id": roasted_bean.id})
+        self.rollup_repo.record_logs([roasting_log])
 
         # 5. 원두 재고 증가 (생산)
         self.bean_service.update_bean_quantity(roasted_bean.id, output_weight)
@@ -177,6 +256,7 @@ class RoastingService:
         })
         return roasted_bean, batch_no
 
+    @transactional
     def create_blend_roasting(
         self,
         blend_id: int,
@@ -189,6 +269,8 @@ class RoastingService:
         1. 블렌드 레시피 기반 생두 투입량 자동 계산 및 차감
         2. 블렌드 원두(Roasted) 생성 및 입고
         """
+        self._invalidate_caches()
+
         # 1. 블렌드 조회
         blend = self.blend_repo.get(blend_id)
         if not blend:
@@ -198,50 +280,38 @@ class RoastingService:
         if not recipe:
             raise HTTPException(status_code=400, detail="Blend recipe is empty")
 
-        # 2. 투입량 계산 및 재고 검증
+        # 2. 투입량 계산 및 재고 검증 (레시피 원두 일괄 조회)
+        # item은 dict 또는 BlendRecipeItem pydantic model 일 수 있음
+        recipe_entries = self._recipe_entries(recipe)
+        beans = self.bean_service.get_beans_by_ids([b_id for b_id, _ in recipe_entries])
+
         input_items = []
-        total_input_cost = 0.0
+        required_by_bean = {}
         total_input_weight = 0.0
 
-        for item in recipe:
-            # item은 dict 또는 BlendRecipeItem pydantic model 일 수 있음
-            b_id = item.bean_id if hasattr(item, 'bean_id') else item['bean_id']
-            ratio = item.ratio if hasattr(item, 'ratio') else item['ratio']
-
-            bean = self.bean_service.get_bean(b_id)
+        for b_id, ratio in recipe_entries:
+            bean = beans.get(b_id)
             if not bean:
                 raise HTTPException(status_code=404, detail=f"Bean ID {b_id} in recipe not found")
 
             # 필요량 계산
-            if input_weight:
-                required_input = input_weight * ratio
-            else:
-                loss_rate = bean.expected_loss_rate if bean.expected_loss_rate is not None else 0.15
-                target_part_weight = output_weight * ratio
-                required_input = target_part_weight / (1 - loss_rate)
+            required_input = self._required_input(bean, ratio, output_weight, input_weight)
 
-            if bean.quantity_kg < required_input:
+            required_by_bean[bean.id] = required_by_bean.get(bean.id, 0.0) + required_input
+            if bean.quantity_kg < required_by_bean[bean.id]:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Not enough stock for {bean.name}. Required: {required_input:.2f}kg, Available: {bean.quantity_kg:.2f}kg",
                 )
 
-            # FIFO 원가 계산
-            fifo_unit_cost, item_cost = self.inventory_service.calculate_fifo_cost(bean.id, required_input)
-
-            input_items.append(
-                {
-                    "bean": bean,
-                    "required_input": required_input,
-                    "cost": item_cost,
-                    "unit_cost": fifo_unit_cost,
-                }
-            )
-
-            total_input_cost += item_cost
+            input_items.append({"bean": bean, "required_input": required_input})
             total_input_weight += required_input
 
-        # 3. 로스팅 로그 (배치) 생성
+        # 3. FIFO 원가 계산 + 입고 lot 차감 (전체 레시피 일괄 처리)
+        fifo_costs = self.inventory_service.consume_fifo_batch(required_by_bean)
+        total_input_cost = sum(total_cost for _, total_cost in fifo_costs.values())
+
+        # 4. 로스팅 로그 (배치) 생성
         batch_no = self.generate_batch_no()
         # 블렌드 원두 생성 전이므로 target_bean_id는 임시로 첫 번째 생두 ID 또는 0
         roasting_log = self.roasting_log_repo.create({
@@ -254,13 +324,12 @@ class RoastingService:
             "notes": notes
         })
 
-        # 4. 재고 차감 실행 (FIFO 원가 기록)
+        # 생두 재고 차감 및 투입 로그 (FIFO 원가 기록)
         for item in input_items:
             bean = item["bean"]
             amount = item["required_input"]
-            unit_cost = item["unit_cost"]
+            unit_cost, _ = fifo_costs[bean.id]
 
-            self.inventory_service.deduct_inventory(bean.id, amount)
             self.bean_service.update_bean_quantity(bean.id, -amount)
 
             self.inventory_service.inventory_log_repo.create({
@@ -275,23 +344,13 @@ class RoastingService:
 
         # 5. 블렌드 원두 생성/업데이트
         production_cost_per_kg = total_input_cost / output_weight if output_weight > 0 else 0
-        sku = f"BLEND-{blend.id}-{blend.name.replace(' ', '')}"
+        sku = self.generate_blend_bean_sku(blend)
 
         # Check if roasted blend bean exists
         roasted_bean = self.bean_service.get_bean_by_sku(sku)
 
         if not roasted_bean:
-            roasted_bean_data = {
-                "name": f"{blend.name}",
-                "type": BeanType.BLEND_BEAN,
-                "sku": sku,
-                "origin": "Blend",
-                "roast_profile": RoastProfile.MEDIUM,
-                "quantity_kg": 0.0,
-                "avg_price": production_cost_per_kg,
-                "cost_price": production_cost_per_kg,
-                "notes": f"Blend based on {blend.name}",
-            }
+            roasted_bean_data = self._blend_bean_data(blend, production_cost_per_kg)
             roasted_bean = self.bean_service.repository.create(roasted_bean_data)
         else:
             current_val = roasted_bean.quantity_kg * roasted_bean.avg_price
@@ -306,6 +365,7 @@ class RoastingService:
 
         # Batch Log의 target_bean_id를 실제 블렌드 원두 ID로 업데이트
         self.roasting_log_repo.update(roasting_log, {"target_bean_id": roasted_bean.id})
+        self.rollup_repo.record_logs([roasting_log])
 
         self.bean_service.update_bean_quantity(roasted_bean.id, output_weight)
 
@@ -321,8 +381,211 @@ class RoastingService:
         })
         return roasted_bean, batch_no
 
+    @transactional
+    def create_bulk_roasting(self, batches: List[Any]) -> List[Dict[str, Any]]:
+        """
+        일괄 로스팅 (하루치 생산 기록을 단일 트랜잭션으로 처리)
+        1. 블렌드/생두 일괄 조회 후 전체 배치의 재고를 사전 검증
+        2. FIFO 원가 계산 + 입고 lot 차감 (배치 순서대로, 조회 1회)
+        3. 배치 번호 블록 할당
+        4. 원두 upsert 및 로스팅 로그/재고 로그 bulk insert
+
+        Args:
+            batches: BulkRoastingBatch 목록
+
+        Returns:
+            배치별 결과 dict 목록 (요청 순서)
+        """
+        if not batches:
+            return []
+        self._invalidate_caches()
+
+        # 1. 블렌드 / 생두 일괄 조회
+        blends = {
+            blend.id: blend
+            for blend in self.blend_repo.get_by_ids(
+                list({batch.blend_id for batch in batches if batch.roasting_type == "blend"})
+            )
+        }
+        bean_ids = [batch.green_bean_id for batch in batches if batch.roasting_type == "single_origin"]
+        for blend in blends.values():
+            bean_ids.extend(b_id for b_id, _ in self._recipe_entries(blend.recipe or []))
+        beans = self.bean_service.get_beans_by_ids(bean_ids)
+
+        # 2. 배치별 투입 계획 수립
+        plans = []
+        for index, batch in enumerate(batches):
+            label = f"Batch #{index + 1}"
+            blend = None
+            if batch.roasting_type == "single_origin":
+                green_bean = beans.get(batch.green_bean_id)
+                if not green_bean:
+                    raise HTTPException(status_code=404, detail=f"{label}: Green bean not found")
+                inputs = [(green_bean, batch.input_weight)]
+            else:
+                blend = blends.get(batch.blend_id)
+                if not blend:
+                    raise HTTPException(status_code=404, detail=f"{label}: Blend not found")
+                if not blend.recipe:
+                    raise HTTPException(status_code=400, detail=f"{label}: Blend recipe is empty")
+                inputs = []
+                for b_id, ratio in self._recipe_entries(blend.recipe):
+                    bean = beans.get(b_id)
+                    if not bean:
+                        raise HTTPException(
+                            status_code=404, detail=f"{label}: Bean ID {b_id} in recipe not found"
+                        )
+                    inputs.append(
+                        (bean, self._required_input(bean, ratio, batch.output_weight, batch.input_weight))
+                    )
+
+            demand: Dict[int, float] = {}
+            for bean, amount in inputs:
+                demand[bean.id] = demand.get(bean.id, 0.0) + amount
+            plans.append({
+                "batch": batch,
+                "blend": blend,
+                "inputs": inputs,
+                "demand": demand,
+                "input_weight": sum(amount for _, amount in inputs),
+            })
+
+        # 전체 배치 합산 재고 검증
+        required_by_bean: Dict[int, float] = {}
+        for plan in plans:
+            for bean_id, amount in plan["demand"].items():
+                required_by_bean[bean_id] = required_by_bean.get(bean_id, 0.0) + amount
+        for bean_id, required in required_by_bean.items():
+            bean = beans[bean_id]
+            if bean.quantity_kg < required:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Not enough stock for {bean.name}. Required: {required:.2f}kg, Available: {bean.quantity_kg:.2f}kg",
+                )
+
+        # 3. FIFO 원가 계산 + 입고 lot 차감
+        fifo_costs = self.inventory_service.consume_fifo_batches([plan["demand"] for plan in plans])
+
+        # 4. 배치 번호 블록 할당
+        batch_nos = self.generate_batch_nos(len(plans))
+
+        # 5. 원두 upsert (SKU 일괄 조회, 신규 원두는 한 번에 생성)
+        for plan, costs in zip(plans, fifo_costs):
+            batch = plan["batch"]
+            plan["total_input_cost"] = sum(total_cost for _, total_cost in costs.values())
+            plan["cost_per_kg"] = (
+                plan["total_input_cost"] / batch.output_weight if batch.output_weight > 0 else 0
+            )
+            if plan["blend"] is not None:
+                plan["sku"] = self.generate_blend_bean_sku(plan["blend"])
+            else:
+                plan["sku"] = self.generate_roasted_bean_sku(plan["inputs"][0][0], batch.roast_profile)
+
+        roasted_beans = self.bean_service.get_beans_by_skus([plan["sku"] for plan in plans])
+        new_bean_data = {}
+        for plan in plans:
+            if plan["sku"] in roasted_beans or plan["sku"] in new_bean_data:
+                continue
+            if plan["blend"] is not None:
+                new_bean_data[plan["sku"]] = self._blend_bean_data(plan["blend"], plan["cost_per_kg"])
+            else:
+                new_bean_data[plan["sku"]] = self._single_origin_bean_data(
+                    plan["inputs"][0][0], plan["batch"].roast_profile, plan["cost_per_kg"]
+                )
+        if new_bean_data:
+            for bean in self.bean_service.repository.create_many(list(new_bean_data.values())):
+                roasted_beans[bean.sku] = bean
+
+        # 6. 재고/단가 갱신 (배치 순서대로 누적, 변경 사항은 아래 bulk insert 시 함께 flush)
+        roasting_log_rows = []
+        inventory_log_rows = []  # (배치 순번, 재고 로그 데이터)
+        results = []
+        for index, (plan, costs, batch_no) in enumerate(zip(plans, fifo_costs, batch_nos)):
+            batch = plan["batch"]
+            blend = plan["blend"]
+            roasted_bean = roasted_beans[plan["sku"]]
+            input_weight = plan["input_weight"]
+            output_weight = batch.output_weight
+            loss_rate = ((input_weight - output_weight) / input_weight * 100) if input_weight > 0 else 0
+
+            for bean, amount in plan["inputs"]:
+                bean.quantity_kg = max(bean.quantity_kg - amount, 0)
+                notes = (
+                    f"Used for Blend: {blend.name} (Batch: {batch_no})"
+                    if blend is not None
+                    else f"Roasting Input to {batch.roast_profile} (Batch: {batch_no})"
+                )
+                inventory_log_rows.append((index, {
+                    "bean_id": bean.id,
+                    "change_type": InventoryChangeType.ROASTING_INPUT,
+                    "change_amount": -amount,
+                    "current_quantity": bean.quantity_kg,
+                    "unit_cost": costs[bean.id][0],
+                    "notes": notes,
+                }))
+
+            # FIFO 기반 가중평균으로 avg_price 업데이트 (신규 원두는 재고 0이므로 생산 원가 그대로)
+            current_value = roasted_bean.quantity_kg * (roasted_bean.avg_price or 0)
+            total_quantity = roasted_bean.quantity_kg + output_weight
+            roasted_bean.cost_price = plan["cost_per_kg"]
+            if total_quantity > 0:
+                roasted_bean.avg_price = (current_value + output_weight * plan["cost_per_kg"]) / total_quantity
+            roasted_bean.quantity_kg = total_quantity
+
+            inventory_log_rows.append((index, {
+                "bean_id": roasted_bean.id,
+                "change_type": InventoryChangeType.ROASTING_OUTPUT,
+                "change_amount": output_weight,
+                "current_quantity": roasted_bean.quantity_kg,
+                "unit_cost": plan["cost_per_kg"],
+                "notes": (
+                    f"Blend Roasting: {blend.name} (Batch: {batch_no})"
+                    if blend is not None
+                    else f"Roasting Output from {plan['inputs'][0][0].name} (Batch: {batch_no})"
+                ),
+            }))
+
+            roasting_log_rows.append({
+                "batch_no": batch_no,
+                "target_bean_id": roasted_bean.id,
+                "input_weight_total": input_weight,
+                "output_weight_total": output_weight,
+                "loss_rate": loss_rate,
+                "production_cost": plan["total_input_cost"],
+                "roast_profile": batch.roast_profile.value if blend is None else None,
+                "roasting_time": batch.roasting_time,
+                "ambient_temp": batch.ambient_temp,
+                "humidity": batch.humidity,
+                "notes": batch.notes,
+            })
+
+            results.append({
+                "index": index,
+                "roasting_type": batch.roasting_type,
+                "batch_no": batch_no,
+                "roasted_bean_id": roasted_bean.id,
+                "roasted_bean_name": roasted_bean.name,
+                "input_weight": round(input_weight, 3),
+                "output_weight": output_weight,
+                "loss_rate_percent": round(loss_rate, 2),
+                "production_cost": round(plan["cost_per_kg"], 2),
+            })
+
+        # 7. 로스팅 로그 / 재고 로그 bulk insert
+        roasting_logs = self.roasting_log_repo.create_many(roasting_log_rows)
+        for index, row in inventory_log_rows:
+            row["roasting_log_id"] = roasting_logs[index].id
+        self.inventory_service.inventory_log_repo.create_many([row for _, row in inventory_log_rows])
+        self.rollup_repo.record_logs(roasting_logs)
+
+        return results
+
+    @cache_service.cached("roasting.dashboard.stats", tags=("roasting", "beans"))
     def get_analytics_summary(self, start_date=None, end_date=None):
-        """로스팅 통계 요약 조회"""
+        """
+        로스팅 통계 요약 조회 (일별/원두별 집계는 roasting_daily_rollup 사용)
+        - 읽기 전용: 집계 도입 이전 로그의 backfill 은 서버 시작 시 수행
+        """
         from app.schemas.analytics import (
             RoastingStatsResponse, DailyProductionStats, BeanUsageStats, LossRateStats
         )
@@ -335,7 +598,7 @@ class RoastingService:
             start_date = end_date - timedelta(days=30)
 
         # 1. 일별 생산량
-        daily_stats = self.roasting_log_repo.get_daily_production_stats(start_date, end_date)
+        daily_stats = self.rollup_repo.get_daily_production_stats(start_date, end_date)
         daily_data = []
         for stat in daily_stats:
             # SAFETY: Defensive date handling
@@ -355,7 +618,7 @@ class RoastingService:
             )
 
         # 2. 원두별 비중
-        bean_usage = self.roasting_log_repo.get_bean_usage_stats(start_date, end_date)
+        bean_usage = self.rollup_repo.get_bean_usage_stats(start_date, end_date)
         total_period_output = sum(item.total_output for item in bean_usage)
         
         usage_data = []
@@ -8,8 +8,14 @@ from sqlalchemy.orm import Session
 from app.models.inbound_document import InboundDocument
 from app.models.inbound_item import InboundItem
 from app.models.bean import Bean
+from app.models.inventory_log import InventoryLog
+from app.services.cache_service import cache_service
 
+# 재고 수량/가치에 영향을 주는 쓰기 이벤트 태그
+_STOCK_TAGS = ("beans", "inventory", "roasting", "inbound")
 
+
+@cache_service.cached("analytics.stats.supplier", tags=("inbound",))
 def get_supplier_stats(
     db: Session, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
 ):
@@ -75,6 +81,7 @@ def get_supplier_stats(
     return final_results
 
 
+@cache_service.cached("analytics.stats.buying.monthly", tags=("inbound",))
 def get_monthly_buying_stats(db: Session, months: int = 12):
     """
     Get monthly buying trends for the last N months.
@@ -95,6 +102,7 @@ def get_monthly_buying_stats(db: Session, months: int = 12):
     return [{"month": r.month, "amount": r.total_amount} for r in results]
 
 
+@cache_service.cached("analytics.stats.item.trends", tags=("inbound", "beans"))
 def get_item_price_trends(
     db: Session,
     bean_name: str,
@@ -127,83 +135,113 @@ def get_item_price_trends(
     ]
 
 
+def _fetch_inventory_lots(db: Session):
+    """
+    전체 입고 lot 일괄 조회 (원두 id, 입고 순서대로 정렬)
+    """
+    return (
+        db.query(
+            InboundItem.bean_id,
+            Bean.name.label("bean_name"),
+            InboundItem.quantity,
+            InboundItem.unit_price,
+            InboundItem.created_at,
+            InboundDocument.supplier_name,
+        )
+        .join(Bean, InboundItem.bean_id == Bean.id)
+        .join(InboundDocument, InboundItem.inbound_document_id == InboundDocument.id)
+        .order_by(Bean.id, InboundItem.created_at, InboundItem.id)
+        .all()
+    )
+
+
+def _fetch_usage_totals(db: Session) -> dict:
+    """
+    원두별 누적 사용량 (음수 재고 로그 합계) 일괄 조회
+    """
+    rows = (
+        db.query(InventoryLog.bean_id, func.sum(InventoryLog.change_amount).label("total"))
+        .filter(InventoryLog.change_amount < 0)
+        .group_by(InventoryLog.bean_id)
+        .all()
+    )
+    return {r.bean_id: -(r.total or 0.0) for r in rows}
+
+
+@cache_service.cached("analytics.stats.inventory", tags=_STOCK_TAGS)
 def get_inventory_stats(
     db: Session, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
 ):
     """
     Calculate the current inventory value of items purchased within a specific date range,
     using FIFO (First-In-First-Out) logic. Returns aggregated stats by bean, supplier, and top items.
-    """
-    from app.models.bean import Bean
-    from app.models.inbound_document import InboundDocument
-    from app.models.inventory_log import InventoryLog
 
-    beans = db.query(Bean).all()
+    All lots and per-bean usage totals are fetched in two bulk queries, then FIFO
+    remaining quantities are attributed in a single pass over the sorted lots.
+    """
+    lots = _fetch_inventory_lots(db)
+    usage_totals = _fetch_usage_totals(db)
 
     bean_results = []
     supplier_results = {}
     total_inventory_value = 0.0
 
-    for bean in beans:
-        # Fetch Inbound History with supplier info joined
-        relevant_inbounds = (
-            db.query(InboundItem)
-            .join(InboundDocument)
-            .filter(InboundItem.bean_id == bean.id)
-            .order_by(InboundItem.created_at)
-            .all()
-        )
-
-        if not relevant_inbounds:
-            continue
-
-        usage_logs = (
-            db.query(InventoryLog)
-            .filter(InventoryLog.bean_id == bean.id, InventoryLog.change_amount < 0)
-            .all()
-        )
-
-        total_used_amount = sum(abs(log.change_amount) for log in usage_logs)
-
-        bean_total_qty = 0.0
-        bean_total_value = 0.0
-        accumulated_qty = 0.0
-
-        for item in relevant_inbounds:
-            qty = item.quantity or 0
-            if accumulated_qty + qty > total_used_amount:
-                remaining_qty = (accumulated_qty + qty) - max(accumulated_qty, total_used_amount)
-
-                is_in_range = True
-                if start_date and item.created_at < start_date:
-                    is_in_range = False
-                if end_date and item.created_at > end_date:
-                    is_in_range = False
-
-                if is_in_range:
-                    item_value = remaining_qty * (item.unit_price or 0)
-                    bean_total_qty += remaining_qty
-                    bean_total_value += item_value
-                    total_inventory_value += item_value
-
-                    # Aggregate by supplier
-                    supplier_name = item.inbound_document.supplier_name or "Unknown"
-                    supplier_results[supplier_name] = (
-                        supplier_results.get(supplier_name, 0.0) + item_value
-                    )
-
-            accumulated_qty += qty
-
-        if bean_total_qty > 0:
+    def _flush_bean(bean_name, qty, value):
+        if qty > 0:
             bean_results.append(
                 {
-                    "bean_name": bean.name,
-                    "quantity_kg": bean_total_qty,
-                    "avg_price": bean_total_value / bean_total_qty,
-                    "total_value": bean_total_value,
+                    "bean_name": bean_name,
+                    "quantity_kg": qty,
+                    "avg_price": value / qty,
+                    "total_value": value,
                 }
             )
 
+    current_bean_id = None
+    current_bean_name = None
+    total_used_amount = 0.0
+    bean_total_qty = 0.0
+    bean_total_value = 0.0
+    accumulated_qty = 0.0
+
+    for lot in lots:
+        if lot.bean_id != current_bean_id:
+            if current_bean_id is not None:
+                _flush_bean(current_bean_name, bean_total_qty, bean_total_value)
+            current_bean_id = lot.bean_id
+            current_bean_name = lot.bean_name
+            total_used_amount = usage_totals.get(lot.bean_id, 0.0)
+            bean_total_qty = 0.0
+            bean_total_value = 0.0
+            accumulated_qty = 0.0
+
+        qty = lot.quantity or 0
+        if accumulated_qty + qty > total_used_amount:
+            remaining_qty = (accumulated_qty + qty) - max(accumulated_qty, total_used_amount)
+
+            is_in_range = True
+            if start_date and lot.created_at < start_date:
+                is_in_range = False
+            if end_date and lot.created_at > end_date:
+                is_in_range = False
+
+            if is_in_range:
+                item_value = remaining_qty * (lot.unit_price or 0)
+                bean_total_qty += remaining_qty
+                bean_total_value += item_value
+                total_inventory_value += item_value
+
+                # Aggregate by supplier
+                supplier_name = lot.supplier_name or "Unknown"
+                supplier_results[supplier_name] = (
+                    supplier_results.get(supplier_name, 0.0) + item_value
+                )
+
+        accumulated_qty += qty
+
+    if current_bean_id is not None:
+        _flush_bean(current_bean_name, bean_total_qty, bean_total_value)
+
     # Sort and refine
     bean_results.sort(key=lambda x: x["total_value"], reverse=True)
 
@@ -229,6 +267,7 @@ def get_inventory_stats(
     }
 
 
+@cache_service.cached("analytics.stats.inventory.summary", tags=_STOCK_TAGS)
 def get_inventory_summary(db: Session) -> dict:
     """
     Get current inventory summary statistics.
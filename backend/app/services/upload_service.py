@@ -0,0 +1,156 @@
+"""
+명세서 이미지 수신 (업로드/URL 다운로드 스트리밍)
+
+요청 본문이나 외부 URL 응답을 한 번에 메모리로 읽지 않고 청크 단위로 임시 파일에 기록한다.
+- 크기 제한(IMAGE_MAX_FILE_SIZE)은 받는 도중에 검사하여 초과 즉시 중단
+- 첫 청크(앞 2KB)로 매직 바이트를 확인하여 이미지가 아니면 나머지를 받지 않음
+- 작은 파일은 메모리, UPLOAD_SPOOL_MAX_MEMORY 초과분은 디스크 (SpooledTemporaryFile)
+- 받는 동안 원본 내용 해시(content_hash)를 계산 (OCR 결과 캐시를 디코딩/전처리 전에 조회)
+"""
+
+import hashlib
+import shutil
+import tempfile
+from typing import IO, AsyncIterator, Optional, Tuple
+
+import httpx
+from fastapi import UploadFile
+
+from app.config import settings
+from app.services.image_service import image_service
+
+CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 2048
+
+
+class UploadRejectedError(ValueError):
+    """크기 초과/이미지가 아닌 업로드"""
+
+
+class SpooledUpload:
+    """청크 단위로 받은 이미지 (크기/형식 검사 통과분만 보관)"""
+
+    def __init__(
+        self,
+        filename: str,
+        mime_type: str = "image/jpeg",
+        max_size: Optional[int] = None,
+        spool_max_memory: Optional[int] = None,
+    ):
+        self.filename = filename
+        self.mime_type = mime_type
+        self.max_size = max_size or image_service.max_file_size
+        self.file = tempfile.SpooledTemporaryFile(
+            max_size=spool_max_memory or settings.UPLOAD_SPOOL_MAX_MEMORY
+        )
+        self.size = 0
+        self._head = b""
+        self._sniffed = False
+        self._digest = hashlib.sha256()
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise UploadRejectedError(f"File size exceeds limit ({self.max_size // (1024*1024)}MB)")
+        if not self._sniffed:
+            self._head += chunk[: SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= SNIFF_BYTES:
+                self._sniff()
+        self._digest.update(chunk)
+        self.file.write(chunk)
+
+    @property
+    def content_hash(self) -> str:
+        """받은 원본 바이트의 SHA-256 (hex)"""
+        return self._digest.hexdigest()
+
+    def _sniff(self) -> None:
+        self._sniffed = True
+        error = image_service.content_type_error(self._head)
+        if error:
+            raise UploadRejectedError(error)
+
+    def finish(self) -> "SpooledUpload":
+        """수신 완료 (2KB 미만 파일은 여기서 형식 검사)"""
+        if not self._sniffed and self.size > 0:
+            self._sniff()
+        self.file.seek(0)
+        return self
+
+    def read(self) -> bytes:
+        self.file.seek(0)
+        return self.file.read()
+
+    def copy_to(self, target: IO[bytes]) -> None:
+        self.file.seek(0)
+        shutil.copyfileobj(self.file, target, CHUNK_SIZE)
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+async def _spool_chunks(upload: SpooledUpload, chunks: AsyncIterator[bytes]) -> SpooledUpload:
+    try:
+        async for chunk in chunks:
+            upload.write(chunk)
+        return upload.finish()
+    except BaseException:
+        upload.close()
+        raise
+
+
+async def receive_upload(file: UploadFile) -> SpooledUpload:
+    """UploadFile → SpooledUpload (요청 종료 후에도 사용 가능)"""
+
+    async def chunks() -> AsyncIterator[bytes]:
+        while chunk := await file.read(CHUNK_SIZE):
+            yield chunk
+
+    upload = SpooledUpload(file.filename or "unknown.jpg", file.content_type or "image/jpeg")
+    return await _spool_chunks(upload, chunks())
+
+
+async def download(
+    url: str, client: Optional[httpx.AsyncClient] = None
+) -> Tuple[SpooledUpload, httpx.Headers]:
+    """URL 응답 본문을 스트리밍으로 수신 (Content-Length 가 한도를 넘으면 본문을 받지 않음)"""
+    owns_client = client is None
+    client = client or httpx.AsyncClient()
+    try:
+        async with client.stream("GET", url, follow_redirects=True) as response:
+            response.raise_for_status()
+            content_length = response.headers.get("content-length")
+            upload = SpooledUpload("download", response.headers.get("content-type", "image/jpeg"))
+            if (
+                content_length
+                and content_length.isdigit()
+                and int(content_length) > upload.max_size
+            ):
+                upload.close()
+                raise UploadRejectedError(
+                    f"File size exceeds limit ({upload.max_size // (1024*1024)}MB)"
+                )
+            upload = await _spool_chunks(upload, response.aiter_bytes(CHUNK_SIZE))
+            return upload, response.headers
+    finally:
+        if owns_client:
+            await client.aclose()
+
+
+def spool_file(path: str, filename: str, mime_type: str) -> SpooledUpload:
+    """디스크에 저장된 (일괄 작업 대기) 파일을 같은 검사를 거쳐 SpooledUpload 로"""
+    upload = SpooledUpload(filename, mime_type)
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                upload.write(chunk)
+        return upload.finish()
+    except BaseException:
+        upload.close()
+        raise
@@ -0,0 +1,23 @@
+-- Migration: NOT NULL sort keys + composite indexes for keyset pagination (PostgreSQL)
+-- Date: 2026-10-18
+-- Purpose: 커서 페이지(ORDER BY sort DESC, id DESC)를 (sort, id) 인덱스 역방향 스캔으로 처리
+--          NULL 정렬 값이 있으면 NULLS LAST 조건 때문에 인덱스를 쓰지 못하고 전체 정렬하므로
+--          NULL 을 가장 오래된 값으로 채운 뒤 NOT NULL 로 변경 (기존과 같이 목록 맨 뒤에 위치)
+
+UPDATE inventory_logs SET created_at = TIMESTAMPTZ '1970-01-01 00:00:00+00' WHERE created_at IS NULL;
+ALTER TABLE inventory_logs ALTER COLUMN created_at SET NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_inventory_logs_created_at_id
+ON inventory_logs(created_at, id);
+
+UPDATE inbound_documents SET created_at = TIMESTAMPTZ '1970-01-01 00:00:00+00' WHERE created_at IS NULL;
+ALTER TABLE inbound_documents ALTER COLUMN created_at SET NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_inbound_documents_created_at_id
+ON inbound_documents(created_at, id);
+
+UPDATE roasting_logs SET roast_date = TIMESTAMPTZ '1970-01-01 00:00:00+00' WHERE roast_date IS NULL;
+ALTER TABLE roasting_logs ALTER COLUMN roast_date SET NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_roasting_logs_roast_date_id
+ON roasting_logs(roast_date, id);
+
+-- Verify (Index Scan Backward, Sort 노드 없음)
+-- EXPLAIN SELECT * FROM inventory_logs ORDER BY created_at DESC, id DESC LIMIT 21;
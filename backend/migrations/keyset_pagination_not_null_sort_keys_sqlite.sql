@@ -0,0 +1,20 @@
+-- Migration: NOT NULL sort keys + composite indexes for keyset pagination (SQLite)
+-- Date: 2026-10-18
+-- Purpose: 커서 페이지(ORDER BY sort DESC, id DESC)를 (sort, id) 인덱스 역방향 스캔으로 처리
+-- SQLite 는 ALTER COLUMN ... SET NOT NULL 을 지원하지 않으므로 NULL 만 채움
+-- (새 행은 애플리케이션 기본값으로 항상 채워짐)
+
+UPDATE inventory_logs SET created_at = '1970-01-01 00:00:00.000000' WHERE created_at IS NULL;
+CREATE INDEX IF NOT EXISTS ix_inventory_logs_created_at_id
+ON inventory_logs(created_at, id);
+
+UPDATE inbound_documents SET created_at = '1970-01-01 00:00:00.000000' WHERE created_at IS NULL;
+CREATE INDEX IF NOT EXISTS ix_inbound_documents_created_at_id
+ON inbound_documents(created_at, id);
+
+UPDATE roasting_logs SET roast_date = '1970-01-01 00:00:00.000000' WHERE roast_date IS NULL;
+CREATE INDEX IF NOT EXISTS ix_roasting_logs_roast_date_id
+ON roasting_logs(roast_date, id);
+
+-- Verification query (uncomment to verify: SCAN ... USING INDEX, no TEMP B-TREE)
+-- EXPLAIN QUERY PLAN SELECT * FROM inventory_logs ORDER BY created_at DESC, id DESC LIMIT 21;
@@ -0,0 +1,140 @@
+"""
+명세서 이미지 파이프라인 벤치마크 (12MP 휴대폰 사진 기준)
+
+- legacy: 단계마다 업로드 바이트를 다시 디코딩 (validate_image → 전처리용 open → process_and_save)
+- shared: DecodedImage 하나를 검증/전처리/3단계 저장이 공유
+
+모드별로 별도 프로세스에서 실행하여 CPU 시간과 최대 RSS(peak memory)를 비교한다.
+
+Usage:
+    cd backend && python scripts/benchmark_image_pipeline.py [--runs 3]
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_phone_photo(width: int = 4000, height: int = 3000) -> bytes:
+    """노이즈가 섞인 12MP JPEG + EXIF(방향/카메라 정보)"""
+    from PIL import Image
+
+    img = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    img = img.resize((width // 4, height // 4)).resize((width, height))  # 사진처럼 부드럽게
+    exif = Image.Exif()
+    exif[0x0112] = 6  # 90도 회전
+    exif[0x010F] = "Phone Maker"
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=92, exif=exif)
+    return buf.getvalue()
+
+
+def run_legacy(service, content: bytes) -> None:
+    from PIL import Image
+
+    service.validate_image(content, "photo.jpg")
+    with Image.open(io.BytesIO(content)) as img:
+        img.load()
+        processed = service.preprocess_for_ocr(img)
+        output = io.BytesIO()
+        processed.save(output, format="JPEG", quality=95)
+    service.process_and_save(content, "photo.jpg")
+
+
+def run_shared(service, content: bytes) -> None:
+    with service.open(content, "photo.jpg") as decoded:
+        service.validate_decoded(decoded)
+        service.encode_for_ocr(decoded)
+        service.save_decoded(decoded)
+
+
+def worker(mode: str, photo_path: str, runs: int) -> None:
+    from app.services.image_service import ImageService
+
+    with open(photo_path, "rb") as f:
+        content = f.read()
+
+    with tempfile.TemporaryDirectory() as upload_dir:
+        service = ImageService(upload_base_dir=upload_dir)
+        service._check_disk_space = lambda min_free_gb=0: None
+        run = run_legacy if mode == "legacy" else run_shared
+
+        baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        for _ in range(runs):
+            run(service, content)
+        cpu = (time.process_time() - cpu_started) / runs
+        wall = (time.perf_counter() - wall_started) / runs
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss: Linux KB, macOS bytes
+    scale = 1024 if sys.platform != "darwin" else 1
+    print(
+        json.dumps(
+            {
+                "mode": mode,
+                "cpu_seconds": round(cpu, 3),
+                "wall_seconds": round(wall, 3),
+                "peak_rss_mb": round(peak_rss * scale / 1024 / 1024, 1),
+                "peak_rss_delta_mb": round((peak_rss - baseline_rss) * scale / 1024 / 1024, 1),
+            }
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--worker", choices=["legacy", "shared"])
+    parser.add_argument("--photo")
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.photo, args.runs)
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as f:
+        f.write(make_phone_photo())
+        photo_path = f.name
+
+    try:
+        results = {}
+        for mode in ("legacy", "shared"):
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--worker",
+                    mode,
+                    "--photo",
+                    photo_path,
+                    "--runs",
+                    str(args.runs),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+            print(results[mode])
+    finally:
+        os.unlink(photo_path)
+
+    legacy, shared = results["legacy"], results["shared"]
+    print(
+        f"CPU: {legacy['cpu_seconds']}s → {shared['cpu_seconds']}s "
+        f"({(1 - shared['cpu_seconds'] / legacy['cpu_seconds']) * 100:.0f}% 감소), "
+        f"peak RSS: {legacy['peak_rss_mb']}MB → {shared['peak_rss_mb']}MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.database import Base
 from app.api.deps import get_db
+from app.services.cache_service import cache_service
 
 # Use in-memory SQLite for speed and isolation
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -37,3 +38,11 @@ def db_session(engine, tables):
     # Rollback the transaction
     transaction.rollback()
     connection.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_query_cache():
+    """테스트마다 DB가 rollback되므로 조회 캐시도 비움"""
+    cache_service.clear()
+    yield
+    cache_service.clear()
@@ -92,3 +92,91 @@ def test_path_traversal_protection(image_service):
     
     # Valid path
     assert image_service._validate_path_security(Path(image_service.base_dir) / "2024/01/test.jpg")
+
+def test_decoded_image_is_shared_across_pipeline(image_service, monkeypatch):
+    """검증 → OCR 전처리 → 3단계 저장이 디코딩 1회를 공유"""
+    import app.services.image_service as image_module
+
+    # 세로 사진을 가로로 저장하고 EXIF 방향(6 = 90도 회전)만 기록한 휴대폰 사진 형태
+    img = Image.new('RGB', (1600, 1200), color='white')
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    buf = io.BytesIO()
+    img.save(buf, format='JPEG', exif=exif)
+    content = buf.getvalue()
+
+    open_calls = []
+    original_open = image_module.Image.open
+
+    def counting_open(*args, **kwargs):
+        open_calls.append(args)
+        return original_open(*args, **kwargs)
+
+    monkeypatch.setattr(image_module.Image, 'open', counting_open)
+
+    with image_service.open(content, "photo.jpg") as decoded:
+        assert image_service.validate_decoded(decoded) == (True, "")
+        ocr_bytes, mime_type = image_service.encode_for_ocr(decoded)
+        result = image_service.save_decoded(decoded)
+
+    assert len(open_calls) == 1
+    assert mime_type == "image/jpeg"
+    assert result['width'] == 1600 and result['height'] == 1200  # 원본 기준 크기 유지
+
+    monkeypatch.setattr(image_module.Image, 'open', original_open)
+    with Image.open(io.BytesIO(ocr_bytes)) as ocr_img:
+        assert ocr_img.width < ocr_img.height  # 방향 적용됨
+    base = Path(image_service.base_dir)
+    with Image.open(base / result['paths']['webview']) as web_img:
+        assert web_img.size == (1200, 1600)
+    with Image.open(base / result['paths']['thumbnail']) as thumb_img:
+        assert thumb_img.size == (300, 400)
+        assert not thumb_img.getexif()
+
+def test_validate_decoded_rejects_corrupted_image(image_service, test_image_bytes):
+    truncated = test_image_bytes[:200]
+    with image_service.open(truncated, "test.jpg") as decoded:
+        is_valid, error = image_service.validate_decoded(decoded)
+    assert not is_valid
+    assert "Corrupted" in error
+
+def _phone_photo(size=(2000, 1500), orientation=6):
+    img = Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3))
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    exif[0x010F] = "Phone Maker"
+    buf = io.BytesIO()
+    img.save(buf, format='JPEG', exif=exif)
+    return buf.getvalue()
+
+@pytest.mark.parametrize("orientation", [1, 6])
+def test_strip_sensitive_exif_keeps_pixels_identical(image_service, orientation):
+    from PIL import ImageOps
+
+    content = _phone_photo(orientation=orientation)
+    with Image.open(io.BytesIO(content)) as reference:
+        expected = ImageOps.exif_transpose(reference)
+    img = Image.open(io.BytesIO(content))
+    img.load()
+
+    stripped = image_service._strip_sensitive_exif(img)
+
+    assert stripped.mode == expected.mode
+    assert stripped.size == expected.size
+    assert stripped.tobytes() == expected.tobytes()
+    assert "exif" not in stripped.info
+    assert not stripped.getexif()
+
+def test_strip_sensitive_exif_memory_benchmark(image_service):
+    """3MP 사진 기준 Python 힙 사용량 (getdata()/putdata() 방식은 픽셀당 튜플로 수백 MB)"""
+    import tracemalloc
+
+    img = Image.open(io.BytesIO(_phone_photo(orientation=1)))
+    img.load()
+
+    tracemalloc.start()
+    image_service._strip_sensitive_exif(img)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < 1024 * 1024
@@ -0,0 +1,49 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.roasting_log import RoastingLog
+from app.repositories.batch_sequence_repository import BatchSequenceRepository
+
+
+def test_reserve_allocates_consecutive_blocks(db_session):
+    repo = BatchSequenceRepository(db_session)
+
+    assert repo.reserve("R251225") == 1
+    assert repo.reserve("R251225", 3) == 2  # 2, 3, 4 예약
+    assert repo.reserve("R251225") == 5
+    assert repo.reserve("R251226") == 1  # 일자별 독립 시퀀스
+
+
+def test_reserve_seeds_from_existing_batches(db_session):
+    for batch_no in ("R251227-002", "R251227-011", "R251228-050"):
+        db_session.add(
+            RoastingLog(
+                batch_no=batch_no,
+                target_bean_id=1,
+                input_weight_total=10.0,
+                output_weight_total=8.5,
+            )
+        )
+    db_session.flush()
+
+    repo = BatchSequenceRepository(db_session)
+    assert repo.reserve("R251227") == 12
+
+
+def test_reservation_survives_caller_rollback(tmp_path, monkeypatch):
+    """예약은 별도 트랜잭션에서 바로 commit → 로스팅이 rollback 되어도 번호 재사용 없음"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'batch_seq.db'}")
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(
+        BatchSequenceRepository, "_uses_own_transaction", staticmethod(lambda bind: True)
+    )
+    session = sessionmaker(bind=engine)()
+    try:
+        repo = BatchSequenceRepository(session)
+        assert repo.reserve("R251229") == 1
+        session.rollback()
+        assert repo.reserve("R251229") == 2
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from functools import partial
+
+import pytest
+
+from app.models.bean import Bean, BeanType
+from app.models.inventory_log import InventoryLog
+from app.models.roasting_log import RoastingLog
+from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.repositories.roasting_log_repository import RoastingLogRepository
+
+
+def walk(fetch, limit):
+    """next_cursor를 따라 끝까지 조회"""
+    ids, cursor = [], None
+    while True:
+        page = fetch(cursor=cursor, limit=limit)
+        ids.extend(item.id for item in page.items)
+        if not page.has_more:
+            return ids
+        cursor = page.next_cursor
+
+
+def test_inventory_cursor_matches_offset_order(db_session):
+    bean = Bean(name="Cursor Bean", type=BeanType.GREEN_BEAN, quantity_kg=0)
+    db_session.add(bean)
+    db_session.flush()
+
+    base = datetime(2025, 6, 1, 9)
+    old = base - timedelta(days=30)
+    # 같은 시각의 로그 여러 건 (id 로 순서 결정)
+    for created_at in [
+        base,
+        base,
+        base + timedelta(hours=1),
+        old,
+        base,
+        base + timedelta(hours=2),
+        old,
+    ]:
+        db_session.add(
+            InventoryLog(
+                bean_id=bean.id,
+                change_type="PURCHASE",
+                change_amount=1.0,
+                current_quantity=1.0,
+                created_at=created_at,
+            )
+        )
+    db_session.commit()
+    repo = InventoryRepository(db_session)
+
+    expected = [log.id for log in repo.get_logs(bean_id=bean.id, limit=100)]
+    fetch = partial(repo.get_logs_by_cursor, bean_id=bean.id)
+
+    assert len(expected) == 7
+    assert walk(fetch, 2) == expected
+    assert walk(fetch, 7) == expected
+
+    page = repo.get_logs_by_cursor(bean_id=bean.id, limit=3, with_total=True)
+    assert (page.total, page.total_is_estimate) == (7, False)
+
+
+def test_roasting_history_cursor_with_filters(db_session):
+    repo = RoastingLogRepository(db_session)
+    base = datetime(2025, 6, 1, 9)
+    for idx in range(5):
+        db_session.add(
+            RoastingLog(
+                batch_no=f"R250601-{idx:03d}",
+                target_bean_id=1 if idx % 2 else 2,
+                roast_date=base + timedelta(days=idx),
+                input_weight_total=10,
+                output_weight_total=8,
+            )
+        )
+    db_session.commit()
+
+    fetch = partial(repo.get_multi_by_cursor, filters={"bean_id": 2})
+
+    assert walk(fetch, 1) == [log.id for log in repo.get_multi(filters={"bean_id": 2})]
+
+
+def test_cursor_roundtrip_and_invalid_cursor():
+    value = datetime(2025, 6, 1, 9, 30, 0, 123456)
+    assert decode_cursor(encode_cursor(value, 42)) == (value, 42)
+
+    null_cursor = "W251bGwsN10"  # [null, 7]: 정렬 값이 없는 커서
+    for bad in ["not-a-cursor", encode_cursor(value, 1)[:-3], null_cursor]:
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(bad)
@@ -46,13 +46,3 @@ def test_get_multi_with_filters(db_session):
     logs = repo.get_multi(filters={"bean_id": 2})
     assert len(logs) == 1
     assert logs[0].batch_no == "B00Z"
-
-def test_get_latest_batch_no(db_session):
-    repo = RoastingLogRepository(db_session)
-    repo.create({
-        "batch_no": "BATCH_99", "target_bean_id": 1, "roast_date": datetime.now(),
-        "input_weight_total": 10, "output_weight_total": 9
-    })
-    
-    latest = repo.get_latest_batch_no()
-    assert latest == "BATCH_99"
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean, BeanType
+from app.repositories.bean_repository import BeanRepository
+from app.repositories.unit_of_work import UnitOfWork, is_unit_of_work_active
+
+
+@pytest.fixture
+def commit_calls(db_session: Session, monkeypatch):
+    calls = []
+    original_commit = db_session.commit
+
+    def _commit():
+        calls.append(True)
+        original_commit()
+
+    monkeypatch.setattr(db_session, "commit", _commit)
+    return calls
+
+
+def test_repository_commits_per_call_by_default(db_session: Session, commit_calls):
+    repo = BeanRepository(db_session)
+    bean = repo.create({"name": "UoW Default", "type": BeanType.GREEN_BEAN, "quantity_kg": 1.0})
+    repo.update(bean, {"quantity_kg": 2.0})
+
+    assert len(commit_calls) == 2
+
+
+def test_unit_of_work_commits_once(db_session: Session, commit_calls):
+    repo = BeanRepository(db_session)
+
+    with UnitOfWork(db_session):
+        bean = repo.create({"name": "UoW Bean", "type": BeanType.GREEN_BEAN, "quantity_kg": 1.0})
+        assert bean.id is not None  # flush로 PK 할당
+        repo.update(bean, {"quantity_kg": 3.0})
+        with UnitOfWork(db_session):  # 중첩 블록은 commit 하지 않음
+            repo.update(bean, {"quantity_kg": 4.0})
+        assert commit_calls == []
+
+    assert len(commit_calls) == 1
+    assert not is_unit_of_work_active(db_session)
+    assert db_session.get(Bean, bean.id).quantity_kg == 4.0
+
+
+def test_unit_of_work_rolls_back_on_error(db_session: Session, commit_calls):
+    repo = BeanRepository(db_session)
+
+    with pytest.raises(ValueError):
+        with UnitOfWork(db_session):
+            repo.create({"name": "UoW Rollback", "type": BeanType.GREEN_BEAN, "quantity_kg": 1.0})
+            raise ValueError("boom")
+
+    assert commit_calls == []
+    assert not is_unit_of_work_active(db_session)
+    assert repo.get_by_name("UoW Rollback") is None
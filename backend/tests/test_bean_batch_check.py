@@ -0,0 +1,120 @@
+import random
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean, BeanType
+from app.repositories.bean_repository import BeanRepository
+from app.services.bean_service import BeanService
+
+
+def legacy_check(beans, names):
+    """인덱스 도입 이전의 이름 × 생두 전체 순회"""
+    results = []
+    for name in names:
+        name_clean = name.strip().lower().replace(" ", "")
+        found = None
+        for bean in beans:
+            if bean.name_ko and bean.name_ko.strip().replace(" ", "") == name_clean:
+                found = bean
+                break
+            if bean.name_en and bean.name_en.strip().lower().replace(" ", "") == name_clean:
+                found = bean
+                break
+            if bean.name and bean.name.strip().lower().replace(" ", "") == name_clean:
+                found = bean
+                break
+            if bean.name_ko and name_clean in bean.name_ko.replace(" ", ""):
+                found = bean
+        if found:
+            results.append(
+                {
+                    "input_name": name,
+                    "status": "MATCH",
+                    "bean_id": found.id,
+                    "bean_name": found.name_ko or found.name,
+                }
+            )
+        else:
+            results.append(
+                {"input_name": name, "status": "NEW", "bean_id": None, "bean_name": None}
+            )
+    return results
+
+
+@pytest.fixture
+def beans(db_session: Session):
+    rows = [
+        Bean(
+            name="예가체프 G1",
+            name_en="Yirgacheffe G1",
+            name_ko="예가체프 G1",
+            type=BeanType.GREEN_BEAN,
+        ),
+        Bean(
+            name="예가체프",
+            name_en="Ethiopia G2 Yirgacheffe",
+            name_ko="예가체프",
+            type=BeanType.GREEN_BEAN,
+        ),
+        Bean(
+            name="디카페 SM",
+            name_en="Colombia Decaf",
+            name_ko="디카페 SM",
+            type=BeanType.GREEN_BEAN,
+        ),
+        Bean(name="Kenya AA", name_en=None, name_ko=None, type=BeanType.GREEN_BEAN),
+        Bean(
+            name="블렌드",
+            name_en="House Blend",
+            name_ko="하우스 블렌드 예가",
+            type=BeanType.BLEND_BEAN,
+        ),
+    ]
+    random.seed(7)
+    syllables = ["가", "체", "프", "예", "시", "다", "모", "케", "냐", "A"]
+    for i in range(200):
+        ko = "".join(random.choices(syllables, k=random.randint(2, 6)))
+        rows.append(
+            Bean(name=f"생두 {i}", name_en=f"Bean {i}", name_ko=ko, type=BeanType.GREEN_BEAN)
+        )
+    db_session.add_all(rows)
+    db_session.commit()
+    return sorted(db_session.query(Bean).all(), key=lambda b: b.id)
+
+
+def test_check_existing_beans_matches_legacy_scan(db_session: Session, beans):
+    names = [
+        "예가체프 G1",
+        "예가체프g1",
+        "yirgacheffe g1",
+        "예가",
+        "체프",
+        "예",
+        "디카페 SM",
+        "디카페 sm",
+        "kenya aa",
+        "KENYA AA",
+        "블렌드",
+        "하우스",
+        "없는 원두",
+        "",
+        "   ",
+        "A",
+        "a",
+    ]
+    random.seed(11)
+    syllables = ["가", "체", "프", "예", "시", "다", "모", "케", "냐", "A", "x"]
+    names += ["".join(random.choices(syllables, k=random.randint(1, 4))) for _ in range(300)]
+
+    service = BeanService(BeanRepository(db_session))
+    assert service.check_existing_beans(names) == legacy_check(beans, names)
+
+
+def test_check_existing_beans_sees_new_beans(db_session: Session, beans):
+    service = BeanService(BeanRepository(db_session))
+    assert service.check_existing_beans(["게이샤"])[0]["status"] == "NEW"
+
+    db_session.add(Bean(name="게이샤", name_ko="게이샤", type=BeanType.GREEN_BEAN))
+    db_session.commit()
+    assert service.check_existing_beans(["게이샤"])[0]["status"] == "MATCH"
@@ -0,0 +1,152 @@
+import time
+import unicodedata
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean, BeanType
+from app.services.bean_name_index import BeanNameIndex, bean_name_index, normalize_bean_name
+from app.services.inbound_service import inbound_service
+
+
+@pytest.fixture
+def beans(db_session: Session):
+    rows = [
+        Bean(
+            name="예가체프 G1",
+            name_en="Yirgacheffe G1",
+            name_ko="예가체프",
+            type=BeanType.GREEN_BEAN,
+        ),
+        Bean(name="Supremo", name_en="Colombia Supremo", type=BeanType.GREEN_BEAN),
+        Bean(name="Colombia Supremo", type=BeanType.GREEN_BEAN),
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+def count_queries(db_session: Session):
+    statements = []
+    event.listen(
+        db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    return statements
+
+
+def test_normalize_bean_name():
+    assert normalize_bean_name("  Yirgacheffe\tG1 ") == "yirgacheffeg1"
+    assert normalize_bean_name(unicodedata.normalize("NFD", "예가 체프")) == "예가체프"
+    assert normalize_bean_name(None) == ""
+
+
+def test_match_priority_and_no_queries_per_item(db_session: Session, beans):
+    index = BeanNameIndex()
+    index.snapshot(db_session)  # 인덱스 생성 (1회 조회)
+    statements = count_queries(db_session)
+
+    names = [
+        "Colombia Supremo",  # name 정확 일치가 name_en 정확 일치보다 우선
+        "yirgacheffe  g1",  # 정규화 일치 (name_en)
+        unicodedata.normalize("NFD", "예가체프"),  # 한글 NFD → name_ko 정규화 일치
+        "SUPREMO",
+        "없는 생두",
+        None,
+    ]
+    matches = index.match_many(names, db_session)
+
+    assert statements == []
+    assert [(m.bean_id, m.field, m.method) for m in matches] == [
+        (beans[2].id, "name", "exact"),
+        (beans[0].id, "name_en", "case_insensitive"),
+        (beans[0].id, "name_ko", "case_insensitive"),
+        (beans[1].id, "name", "case_insensitive"),
+        (None, "new", "new"),
+        (None, "new", "new"),
+    ]
+
+
+def test_index_rebuilds_after_name_changes_only(db_session: Session, beans):
+    bean_name_index.invalidate()
+    assert inbound_service.match_bean_multi_field("케냐 AA", db_session)[0] is None
+
+    before = bean_name_index.stats()
+    beans[1].quantity_kg = 10.0  # 재고 수량 변경은 인덱스에 영향 없음
+    db_session.commit()
+    assert bean_name_index.stats()["invalidations"] == before["invalidations"]
+
+    beans[1].name_ko = "케냐 AA"
+    db_session.flush()
+    # commit 전에도 같은 세션에서는 변경된 이름으로 매칭
+    bean, field, method = inbound_service.match_bean_multi_field("케냐AA", db_session)
+    assert (bean.id, field, method) == (beans[1].id, "name_ko", "case_insensitive")
+
+    db_session.commit()
+    assert bean_name_index.stats()["invalidations"] == before["invalidations"] + 1
+    match = inbound_service.match_beans(["케냐 AA"], db_session)[0]
+    assert (match.bean_id, match.method) == (beans[1].id, "exact")
+
+
+def test_verify_detects_beans_added_elsewhere(db_session: Session, beans):
+    index = BeanNameIndex()
+    index.snapshot(db_session)
+    # 다른 프로세스가 추가한 생두처럼: 인덱스 무효화 없이 행만 추가
+    db_session.execute(
+        Bean.__table__.insert().values(name="Kenya AA", type=BeanType.GREEN_BEAN, quantity_kg=0)
+    )
+
+    assert not index.match_many(["kenya aa"], db_session)[0].matched
+    assert index.match_many(["kenya aa"], db_session, verify=True)[0].matched
+
+
+CATALOG = [
+    (1, "예가체프 G1", "Ethiopia Yirgacheffe G1", "예가체프 G1"),
+    (2, "예가체프", "Ethiopia G2 Yirgacheffe Washed", "예가체프"),
+    (3, "콜롬비아 수프리모", "Colombia Supremo", None),
+    (4, "후일라", "Colombia Supremo Huila", "후일라"),
+    (5, "우라가", "Ethiopia G1 Guji Uraga Washed", "우라가"),
+    (6, "브라질", "Brazil", None),
+]
+
+
+@pytest.mark.parametrize(
+    "bean_name, expected_id",
+    [
+        ("예가채프 G1", 1),  # 자모 하나 오타
+        ("Ethiopia G2 Yirgachefe Washed", 2),
+        ("예가체프 G3", None),  # 등급이 다른 생두는 제외
+        ("Colombia Suprem", 3),
+        ("Colombia Supremo Huilla", 4),
+        ("Ethiopia G1 Guji Hambela Washed", None),  # 농장명이 다르면 새 생두
+        ("Brazil Santos NY2 17/18", None),  # 품목명의 남는 글자도 감점 (일반명 "Brazil" 아님)
+        ("브라질 세하도 FC", None),
+        ("에티오피아 예가체프 G1 코체레", None),
+    ],
+)
+def test_fuzzy_match_only_suggests_candidates(bean_name, expected_id):
+    snapshot = BeanNameIndex()._snapshot_from(CATALOG)
+    match = snapshot.match(bean_name)
+
+    # 유사 일치는 자동 매칭하지 않음 (검토 화면에서 후보 선택)
+    assert not match.matched and match.method == "new"
+    if expected_id:
+        assert match.candidates[0].bean_id == expected_id
+        assert 0.85 <= match.candidates[0].score < 1.0
+    else:
+        assert match.candidates == ()
+
+
+def test_fuzzy_match_scales_to_thousands_of_beans():
+    rows = list(CATALOG) + [
+        (i, f"생두{i:05d} 농장", f"Farm {i:05d} Natural", None) for i in range(100, 5100)
+    ]
+    snapshot = BeanNameIndex()._snapshot_from(rows)
+    names = ["예가채프 G1", "생두01234 농잠", "Farm 04321 Natura"] * 100
+
+    started = time.perf_counter()
+    matches = [snapshot.match(name) for name in names]
+    per_item = (time.perf_counter() - started) / len(names)
+
+    assert [m.candidates[0].bean_id for m in matches[:3]] == [1, 1234, 4321]
+    assert per_item < 0.005  # 느린 CI 여유 (로컬 기준 1ms 미만)
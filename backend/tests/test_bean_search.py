@@ -0,0 +1,128 @@
+import unicodedata
+
+import pytest
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean, BeanType
+from app.models.inventory_log import InventoryLog
+from app.repositories.bean_repository import BeanRepository
+from app.repositories.inventory_repository import InventoryRepository
+
+
+@pytest.fixture
+def beans(db_session: Session):
+    rows = [
+        Bean(
+            name="예가체프 G1",
+            name_en="Yirgacheffe G1",
+            origin="Ethiopia",
+            origin_ko="에티오피아",
+            variety="Heirloom",
+            type=BeanType.GREEN_BEAN,
+            quantity_kg=5.0,
+        ),
+        Bean(
+            name="수프리모",
+            name_en="Supremo",
+            origin="Colombia",
+            origin_ko="콜롬비아",
+            variety="Caturra",
+            type=BeanType.GREEN_BEAN,
+            quantity_kg=3.0,
+        ),
+        Bean(
+            name="Kenya AA",
+            origin="Kenya",
+            variety="SL28",
+            type=BeanType.ROASTED_BEAN,
+            quantity_kg=1.0,
+        ),
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+def like_search(db_session: Session, search: str):
+    """인덱스 도입 이전의 7개 컬럼 LIKE 검색"""
+    return {
+        bean.id
+        for bean in db_session.query(Bean).filter(
+            or_(
+                Bean.name.contains(search),
+                Bean.name_ko.contains(search),
+                Bean.name_en.contains(search),
+                Bean.origin.contains(search),
+                Bean.origin_ko.contains(search),
+                Bean.origin_en.contains(search),
+                Bean.variety.contains(search),
+            )
+        )
+    }
+
+
+@pytest.mark.parametrize(
+    "search", ["예가체프", "에티오", "Supremo", "supremo", "SL28", "아", "G1", "없는원두"]
+)
+def test_search_matches_like_semantics(db_session: Session, beans, search):
+    repo = BeanRepository(db_session)
+
+    found = {bean.id for bean in repo.search_beans(search=search)}
+
+    assert found == like_search(db_session, search) | like_search(db_session, search.upper())
+    assert repo.count_beans(search=search) == len(found)
+
+
+def test_search_normalizes_decomposed_hangul(db_session: Session, beans):
+    decomposed = unicodedata.normalize("NFD", "콜롬비아")
+
+    found = BeanRepository(db_session).search_beans(search=decomposed)
+
+    assert [bean.name for bean in found] == ["수프리모"]
+
+
+def test_index_follows_bean_writes(db_session: Session, beans):
+    repo = BeanRepository(db_session)
+    kenya = beans[2]
+    db_session.refresh(kenya)
+
+    repo.update(kenya, {"name": "케냐 AA", "variety": "Batian"})
+    assert [b.id for b in repo.search_beans(search="케냐")] == [kenya.id]
+    assert repo.search_beans(search="SL28") == []
+
+    # 재고 수량만 바뀐 경우에도 검색 결과 유지
+    repo.update(kenya, {"quantity_kg": 2.0})
+    assert [b.id for b in repo.search_beans(search="batian")] == [kenya.id]
+
+    repo.remove(kenya.id)
+    assert repo.search_beans(search="케냐") == []
+
+
+def test_page_total_comes_from_same_query(db_session: Session, beans):
+    repo = BeanRepository(db_session)
+    db_session.add_all(
+        [
+            InventoryLog(
+                bean_id=beans[0].id, change_type="PURCHASE", change_amount=1.0, current_quantity=5.0
+            ),
+            InventoryLog(
+                bean_id=beans[0].id, change_type="PURCHASE", change_amount=2.0, current_quantity=7.0
+            ),
+            InventoryLog(
+                bean_id=beans[1].id, change_type="PURCHASE", change_amount=3.0, current_quantity=3.0
+            ),
+        ]
+    )
+    db_session.commit()
+
+    page, total = repo.search_beans_with_total(skip=0, limit=1, bean_types=[BeanType.GREEN_BEAN])
+    assert (len(page), total) == (1, 2)
+    beyond_last_page = repo.search_beans_with_total(
+        skip=10, limit=1, bean_types=[BeanType.GREEN_BEAN]
+    )
+    assert beyond_last_page == ([], 2)
+
+    logs, log_total = InventoryRepository(db_session).get_logs_with_total(search="yirga", limit=1)
+    assert len(logs) == 1 and logs[0].bean.id == beans[0].id
+    assert log_total == 2
@@ -0,0 +1,74 @@
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean, BeanType
+from app.repositories.bean_repository import BeanRepository
+from app.services import stats_service
+from app.services.bean_service import BeanService
+from app.services.cache_service import CacheService, cache_service
+
+
+def test_cache_hits_until_invalidated():
+    cache = CacheService(max_entries=8, default_ttl=60)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return len(calls)
+
+    # 파라미터 정규화: 공백/순서/날짜 타입 차이는 같은 키
+    assert (
+        cache.get_or_set("stats", {"name": " Kenya ", "types": ["B", "A"]}, load, tags=("beans",))
+        == 1
+    )
+    assert (
+        cache.get_or_set("stats", {"types": ("A", "B"), "name": "Kenya"}, load, tags=("beans",))
+        == 1
+    )
+    assert cache.get_or_set("stats", {"day": date(2025, 1, 1)}, load) == 2
+    assert cache.get_or_set("stats", {"day": "2025-01-01"}, load) == 2
+
+    assert cache.invalidate("inbound") == 0
+    assert cache.invalidate("beans") == 1
+    assert cache.get_or_set("stats", {"name": "Kenya", "types": ["A", "B"]}, load) == 3
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (2, 3, 1)
+
+
+def test_cache_lru_eviction_and_ttl():
+    cache = CacheService(max_entries=2, default_ttl=60)
+    cache.get_or_set("a", None, lambda: "a")
+    cache.get_or_set("b", None, lambda: "b")
+    cache.get_or_set("a", None, lambda: "a2")  # a 최근 사용
+    cache.get_or_set("c", None, lambda: "c")  # b 제거
+
+    assert cache.get_or_set("a", None, lambda: "a3") == "a"
+    assert cache.get_or_set("b", None, lambda: "b2") == "b2"
+    assert cache.stats()["evictions"] == 2
+
+    assert cache.get_or_set("ttl", None, lambda: 1, ttl=0) == 1
+    assert cache.get_or_set("ttl", None, lambda: 2, ttl=0) == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_write_service_invalidates_after_commit(db_session: Session):
+    bean_service = BeanService(BeanRepository(db_session))
+    db_session.add(Bean(name="Cache Bean", type=BeanType.GREEN_BEAN, quantity_kg=3.0))
+    db_session.commit()
+
+    assert stats_service.get_inventory_summary(db_session)["total_weight"] == 3.0
+    bean = bean_service.repository.get_by_name("Cache Bean")
+
+    # rollback된 쓰기는 무효화하지 않음
+    other = Session()
+    other.begin()
+    cache_service.invalidate_on_commit(other, "beans")
+    other.rollback()
+    other.commit()
+    assert cache_service.stats()["size"] == 1
+
+    bean_service.update_bean_quantity(bean.id, 2.0)
+    assert cache_service.stats()["size"] == 0
+    assert stats_service.get_inventory_summary(db_session)["total_weight"] == 5.0
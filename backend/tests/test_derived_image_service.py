@@ -0,0 +1,97 @@
+import io
+
+import pytest
+from PIL import Image
+
+from app.services.derived_image_service import EVICTION_GRACE_SECONDS, DerivedImageService
+from app.services.image_service import ImageService
+
+
+def jpeg(size=(1200, 900), color="white") -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color=color).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def images(tmp_path, monkeypatch):
+    service = ImageService(upload_base_dir=str(tmp_path / "uploads"))
+    monkeypatch.setattr(service, "_check_disk_space", lambda min_free_gb=0: None)
+    return service
+
+
+def save_original_only(images: ImageService, content: bytes) -> dict:
+    prepared = images.prepare_upload(content, "invoice.jpg")
+    prepared.tiers = {"original": prepared.tiers["original"]}
+    return images.save_encoded(prepared, "invoice.jpg")
+
+
+def test_only_original_is_written_and_tiers_are_generated_on_demand(images, tmp_path):
+    derived = DerivedImageService(
+        str(tmp_path / "cache"), max_bytes=10 * 1024 * 1024, images=images
+    )
+    result = save_original_only(images, jpeg())
+
+    webview = images.base_dir / result["paths"]["webview"]
+    thumbnail = images.base_dir / result["paths"]["thumbnail"]
+    assert (images.base_dir / result["paths"]["original"]).exists()
+    assert not webview.exists() and not thumbnail.exists()
+
+    thumb_path = derived.resolve(thumbnail)
+    with Image.open(thumb_path) as thumb:
+        assert thumb.format == "WEBP"
+        assert thumb.size == (400, 300)
+    assert thumb_path.is_relative_to(tmp_path / "cache")
+
+    # 두 번째 요청은 캐시 재사용, 같은 내용의 원본도 같은 캐시 파일 (content-addressed)
+    assert derived.resolve(thumbnail) == thumb_path
+    other = save_original_only(images, jpeg())
+    assert derived.resolve(images.base_dir / other["paths"]["thumbnail"]) == thumb_path
+    assert derived.stats()["generated"] == 1
+    assert derived.stats()["hits"] == 2
+
+    with Image.open(derived.resolve(webview)) as web:
+        assert web.size == (1200, 900)
+
+
+def test_unknown_or_outside_paths_are_not_generated(images, tmp_path):
+    derived = DerivedImageService(
+        str(tmp_path / "cache"), max_bytes=10 * 1024 * 1024, images=images
+    )
+    result = save_original_only(images, jpeg())
+    original = images.base_dir / result["paths"]["original"]
+
+    assert derived.resolve(original) is None  # 원본 단계는 대상 아님
+    assert derived.resolve(images.base_dir / "2020/01/thumbnail/missing_thumb.webp") is None
+    assert derived.resolve(tmp_path / "elsewhere" / "thumbnail" / "x_thumb.webp") is None
+
+
+def test_lru_eviction_under_quota(images, tmp_path):
+    import os
+    import time
+
+    derived = DerivedImageService(str(tmp_path / "cache"), max_bytes=1, images=images)
+    colors = ["red", "green", "blue"]
+    paths = []
+    for i, color in enumerate(colors):
+        result = save_original_only(images, jpeg(color=color))
+        paths.append(derived.resolve(images.base_dir / result["paths"]["thumbnail"]))
+        # 사용 후 유예 시간이 지난 것으로 간주 (순서는 mtime 해상도가 낮은 파일 시스템 대비)
+        used_at = time.time() - EVICTION_GRACE_SECONDS - 10 + i
+        os.utime(paths[-1], (used_at, used_at))
+
+    # 한도(1 byte)를 넘으면 방금 만든 파일만 남기고 오래된 것부터 삭제
+    assert [p.exists() for p in paths] == [False, False, True]
+    assert derived.stats()["evictions"] == 2
+
+
+def test_recently_served_files_are_not_evicted(images, tmp_path):
+    """방금 반환한 파일은 응답이 열기 전일 수 있으므로 용량을 넘어도 삭제하지 않음"""
+    derived = DerivedImageService(str(tmp_path / "cache"), max_bytes=1, images=images)
+    first, second = (
+        derived.resolve(images.base_dir / save_original_only(images, jpeg(color=c))["paths"][tier])
+        for c, tier in (("red", "thumbnail"), ("blue", "webview"))
+    )
+
+    assert first.exists() and second.exists()
+    assert derived.stats()["evictions"] == 0
@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean, BeanType
+from app.models.inbound_document import InboundDocument
+from app.models.inbound_item import InboundItem
+from app.models.inventory_log import InventoryLog
+from app.repositories.fifo_ledger_repository import FifoLedgerRepository
+from app.schemas.inventory_log import InventoryLogCreate
+from app.services import cost_service
+from app.services.fifo_ledger_service import FifoLedgerService
+from app.services.inventory_log_service import inventory_log_service
+
+
+def replay_fifo_cost(db: Session, bean: Bean, quantity: float) -> float:
+    """기존 전체 이력 재계산 방식 (비교 기준)"""
+    lots = (
+        db.query(InboundItem)
+        .filter(InboundItem.bean_id == bean.id)
+        .order_by(InboundItem.created_at, InboundItem.id)
+        .all()
+    )
+    used = sum(
+        -log.change_amount
+        for log in db.query(InventoryLog).filter(
+            InventoryLog.bean_id == bean.id, InventoryLog.change_amount < 0
+        )
+    )
+    cost, needed, accumulated = 0.0, quantity, 0.0
+    for lot in lots:
+        qty = lot.quantity or 0
+        if accumulated + qty > used and needed > 0:
+            available = (accumulated + qty) - max(accumulated, used)
+            take = min(needed, available)
+            cost += take * (lot.unit_price or bean.avg_price)
+            needed -= take
+        accumulated += qty
+    cost += max(needed, 0) * bean.avg_price
+    return cost / quantity
+
+
+@pytest.fixture
+def bean(db_session: Session):
+    bean = Bean(name="Ledger Bean", type=BeanType.GREEN_BEAN, quantity_kg=0.0, avg_price=9000)
+    db_session.add(bean)
+    db_session.commit()
+    return bean
+
+
+@pytest.fixture
+def add_lot(db_session: Session, bean: Bean):
+    doc = InboundDocument(supplier_name="Ledger Supplier")
+    db_session.add(doc)
+    db_session.flush()
+    base = datetime(2025, 1, 1)
+    ledger = FifoLedgerService(FifoLedgerRepository(db_session))
+
+    def _add(qty: float, price: float, days: int) -> InboundItem:
+        item = InboundItem(
+            inbound_document_id=doc.id,
+            bean_id=bean.id,
+            quantity=qty,
+            remaining_quantity=qty,
+            unit_price=price,
+            created_at=base + timedelta(days=days),
+        )
+        db_session.add(item)
+        bean.quantity_kg += qty
+        ledger.add_lot(item)
+        db_session.commit()
+        return item
+
+    return _add
+
+
+def use(db_session: Session, bean: Bean, amount: float) -> InventoryLog:
+    return inventory_log_service.create_log(
+        db_session,
+        InventoryLogCreate(bean_id=bean.id, change_type="SALES", change_amount=-amount),
+    )
+
+
+def assert_quotes_match(db_session: Session, bean: Bean):
+    for qty in (0.5, 3.0, 12.0, 40.0):
+        expected = replay_fifo_cost(db_session, bean, qty)
+        assert cost_service.calculate_fifo_cost(db_session, bean.id, qty) == pytest.approx(expected)
+
+
+def test_ledger_matches_full_replay(db_session: Session, bean: Bean, add_lot):
+    add_lot(10.0, 1000, 0)
+    add_lot(5.0, 2000, 1)
+
+    # 입고 시 커서가 materialize 됨
+    cursor = FifoLedgerRepository(db_session).get_cursor(bean.id)
+    assert cursor is not None
+    assert_quotes_match(db_session, bean)
+
+    first = use(db_session, bean, 4.0)
+    assert_quotes_match(db_session, bean)
+
+    use(db_session, bean, 8.0)  # 첫 lot 소진, 두 번째 lot으로 이동
+    assert_quotes_match(db_session, bean)
+
+    add_lot(20.0, 3000, 2)
+    inventory_log_service.update_log(db_session, first.id, -1.0)  # 사용량 감소 → 되감기
+    assert_quotes_match(db_session, bean)
+
+    inventory_log_service.delete_log(db_session, first.id)
+    assert_quotes_match(db_session, bean)
+
+
+def test_ledger_overflow_absorbed_by_new_lot(db_session: Session, bean: Bean, add_lot):
+    add_lot(5.0, 1000, 0)
+    bean.quantity_kg += 10.0  # 입고 이력 없는 재고 (초기 재고 등)
+    db_session.commit()
+    assert_quotes_match(db_session, bean)
+
+    use(db_session, bean, 8.0)  # 입고 이력 초과 사용
+    cursor = FifoLedgerRepository(db_session).get_cursor(bean.id)
+    assert cursor.head_item_id is None
+    assert cursor.overflow_qty == pytest.approx(3.0)
+
+    add_lot(10.0, 2000, 1)  # 초과분 3kg을 새 lot이 흡수
+    assert cursor.head_consumed_qty == pytest.approx(3.0)
+    assert_quotes_match(db_session, bean)
+
+    ledger = FifoLedgerService(FifoLedgerRepository(db_session))
+    assert ledger.get_open_lots(bean.id)[0]["remaining_qty"] == pytest.approx(7.0)
+
+
+def test_quote_is_read_only_and_backfill_materializes(db_session: Session, bean: Bean):
+    # 커서 도입 이전에 기록된 입고/사용 이력
+    doc = InboundDocument(supplier_name="Legacy Supplier")
+    db_session.add(doc)
+    db_session.flush()
+    for days, (qty, price) in enumerate([(10.0, 1000), (5.0, 2000)]):
+        db_session.add(
+            InboundItem(
+                inbound_document_id=doc.id,
+                bean_id=bean.id,
+                quantity=qty,
+                remaining_quantity=qty,
+                unit_price=price,
+                created_at=datetime(2025, 1, 1) + timedelta(days=days),
+            )
+        )
+    db_session.add(
+        InventoryLog(
+            bean_id=bean.id, change_type="SALES", change_amount=-12.0, current_quantity=3.0
+        )
+    )
+    db_session.commit()
+
+    # 견적은 이력으로 계산만 하고 커서를 쓰지 않음
+    assert_quotes_match(db_session, bean)
+    assert not db_session.new and not db_session.dirty
+    assert FifoLedgerRepository(db_session).get_cursor(bean.id) is None
+
+    ledger = FifoLedgerService(FifoLedgerRepository(db_session))
+    assert ledger.backfill() == 1
+    assert ledger.backfill() == 0
+    cursor = FifoLedgerRepository(db_session).get_cursor(bean.id)
+    assert cursor.consumed_qty == pytest.approx(12.0)
+    assert cursor.head_consumed_qty == pytest.approx(2.0)
+    assert_quotes_match(db_session, bean)
+
+
+def test_first_usage_materializes_cursor_before_applying(db_session: Session, bean: Bean):
+    doc = InboundDocument(supplier_name="Legacy Supplier")
+    db_session.add(doc)
+    db_session.flush()
+    db_session.add(
+        InboundItem(
+            inbound_document_id=doc.id,
+            bean_id=bean.id,
+            quantity=10.0,
+            remaining_quantity=10.0,
+            unit_price=1000,
+            created_at=datetime(2025, 1, 1),
+        )
+    )
+    bean.quantity_kg = 10.0
+    db_session.commit()
+
+    use(db_session, bean, 4.0)
+
+    cursor = FifoLedgerRepository(db_session).get_cursor(bean.id)
+    assert cursor.consumed_qty == pytest.approx(4.0)  # 재구성 + 이번 사용량 1회만 반영
+    assert_quotes_match(db_session, bean)
@@ -0,0 +1,58 @@
+import asyncio
+import io
+
+import pytest
+from PIL import Image
+
+from app.schemas.config import ImageProcessingConfig
+from app.services.image_process_pool import ImageProcessPool
+from app.services.image_service import InvalidImageError
+from app.services.upload_service import SpooledUpload
+
+
+def make_jpeg(size=(900, 1200)) -> bytes:
+    img = Image.new("RGB", size, color="white")
+    for x in range(0, size[0], 30):
+        img.paste((20, 20, 20), (x, 0, x + 3, size[1]))
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def process_pool():
+    # 공유 메모리 경로도 타도록 임계값 0
+    pool = ImageProcessPool(workers=1, shared_memory_threshold=0)
+    yield pool
+    pool.shutdown()
+
+
+def test_process_pool_matches_inline_preparation(process_pool):
+    content = make_jpeg()
+    config = ImageProcessingConfig(upscale_image=False)
+
+    async def run():
+        inline = await ImageProcessPool(workers=0).prepare_upload(
+            content, "invoice.jpg", "image/jpeg", config
+        )
+        # 임시 파일에서 공유 메모리로 청크 단위 복사
+        with SpooledUpload("invoice.jpg", spool_max_memory=1024) as upload:
+            upload.write(content)
+            upload.finish()
+            pooled = await process_pool.prepare_upload(upload, "invoice.jpg", "image/jpeg", config)
+        return inline, pooled
+
+    inline, pooled = asyncio.run(run())
+
+    assert pooled == inline
+    assert set(pooled.tiers) == {"original"}  # 웹뷰/썸네일은 첫 요청 시 생성 (IMAGE_LAZY_TIERS)
+    assert (pooled.width, pooled.height) == (900, 1200)
+    with Image.open(io.BytesIO(pooled.ocr_bytes)) as ocr_img:
+        assert ocr_img.mode == "L"  # 부모가 전달한 전처리 설정 적용
+    assert process_pool.stats()["shared_memory"] == 1
+
+
+def test_process_pool_reports_corrupted_image(process_pool):
+    with pytest.raises(InvalidImageError):
+        asyncio.run(process_pool.prepare_upload(make_jpeg()[:300], "broken.jpg", "image/jpeg"))
+    assert process_pool.stats()["failed"] == 1
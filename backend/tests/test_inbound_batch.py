@@ -0,0 +1,171 @@
+import asyncio
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.bean import Bean, BeanType
+from app.models.inbound_job import InboundJob, InboundJobStatus
+from app.services.image_service import image_service
+from app.services.inbound_batch_service import InboundBatchService
+from app.services.upload_service import SpooledUpload
+
+
+class FakeOCRService:
+    """이미지 비율(세로로 긴 이미지 = 명세서 아님)로 결과를 구분하는 OCR 대역"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self.cache = {}
+
+    def cached_result(self, source_hash):
+        return self.cache.get(source_hash)
+
+    async def analyze_image_stream(self, image_bytes, mime_type="image/jpeg", source_hash=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            yield {"status": "progress", "message": "분석 중..."}
+            await asyncio.sleep(0.01)
+            with Image.open(io.BytesIO(image_bytes)) as img:
+                portrait = img.height > img.width * 2
+        finally:
+            self.in_flight -= 1
+        if portrait:
+            yield {"status": "complete", "data": {"error": "INVALID_DOCUMENT"}}
+            return
+        result = {
+            "supplier": {"name": "Batch Supplier"},
+            "items": [{"bean_name": "Batch Bean", "quantity": 1}],
+        }
+        self.cache[source_hash] = result
+        yield {"status": "complete", "data": result}
+
+
+def jpeg(width: int) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, 300), color="white").save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def spooled(filename: str, content: bytes) -> SpooledUpload:
+    upload = SpooledUpload(filename, "image/jpeg")
+    upload.write(content)
+    return upload.finish()
+
+
+@pytest.fixture
+def batch_service(db_session: Session, tmp_path, monkeypatch):
+    monkeypatch.setattr(image_service, "base_dir", Path(tmp_path / "uploads"))
+    return InboundBatchService(
+        session_factory=sessionmaker(bind=db_session.connection()),
+        ocr_service=FakeOCRService(),
+        workers=3,
+        stage_limits={"ocr": 2},
+        staging_dir=str(tmp_path / "staging"),
+    )
+
+
+def test_batch_jobs_run_through_worker_pool(db_session: Session, batch_service):
+    db_session.add(Bean(name="Batch Bean", type=BeanType.GREEN_BEAN, quantity_kg=0))
+    db_session.commit()
+
+    files = [spooled(f"invoice_{i}.jpg", jpeg(400 + i)) for i in range(4)]
+    files.append(spooled("not_invoice.jpg", jpeg(100)))
+    files.append(spooled("broken.jpg", jpeg(500)[:300]))  # JPEG 헤더만 있고 잘린 파일
+
+    batch_id, jobs = batch_service.submit(db_session, files, [])
+    assert all(job.status == InboundJobStatus.QUEUED for job in jobs)
+
+    async def run():
+        # 워커 시작 시 대기 중인 작업을 DB에서 다시 읽어 처리
+        await batch_service.start()
+        await batch_service._queue.join()
+        await batch_service.stop()
+
+    asyncio.run(run())
+
+    db_session.expire_all()
+    status = batch_service.get_batch_status(db_session, batch_id)
+    counts = (status["total"], status["completed"], status["failed"], status["done"])
+    assert counts == (6, 4, 2, True)
+    assert batch_service.ocr_service.max_in_flight <= 2
+
+    by_source = {job.source: job for job in status["jobs"]}
+    assert "INVALID_DOCUMENT" in by_source["not_invoice.jpg"].error
+    assert by_source["broken.jpg"].error.startswith("유효하지 않은 이미지")
+
+    done = db_session.get(InboundJob, by_source["invoice_0.jpg"].id)
+    assert done.result["supplier_name"] == "Batch Supplier"
+    assert done.result["items"][0]["matched"] is True
+    assert done.result["thumbnail_image_path"]
+    assert list(Path(batch_service.staging_dir).iterdir()) == []
+
+
+def test_ocr_progress_messages_are_not_persisted(db_session: Session, batch_service, monkeypatch):
+    writes = []
+    update = batch_service._update
+    monkeypatch.setattr(
+        batch_service,
+        "_update",
+        lambda job_id, **fields: (writes.append(fields), update(job_id, **fields)),
+    )
+    _, jobs = batch_service.submit(db_session, [spooled("invoice.jpg", jpeg(400))], [])
+
+    asyncio.run(batch_service.process_job(jobs[0].id))
+
+    messages = [fields["progress_message"] for fields in writes if "progress_message" in fields]
+    assert "분석 중..." not in messages  # OCR 스트림의 진행 메시지
+    assert messages[-1] == "분석 완료"
+
+
+def test_job_over_max_attempts_is_failed_instead_of_requeued(db_session: Session, batch_service):
+    _, jobs = batch_service.submit(db_session, [spooled("crashing.jpg", jpeg(400))], [])
+    staged_path = jobs[0].staged_path
+    # 처리 도중 서버가 중단된 상태로 최대 횟수만큼 시도됨
+    jobs[0].status, jobs[0].attempts = InboundJobStatus.OCR, batch_service.max_attempts
+    db_session.commit()
+
+    async def run():
+        await batch_service.start()
+        await batch_service._queue.join()
+        await batch_service.stop()
+
+    asyncio.run(run())
+
+    db_session.expire_all()
+    job = db_session.get(InboundJob, jobs[0].id)
+    assert job.status == InboundJobStatus.FAILED
+    assert "재시도 횟수 초과" in job.error
+    assert job.result is None
+    assert not Path(staged_path).exists()
+
+
+def test_reupload_hits_cache_before_preprocessing(db_session: Session, batch_service, monkeypatch):
+    from app.services import inbound_analysis_service as analysis
+
+    prepare_calls = []
+    prepare = analysis.prepare
+
+    async def tracking_prepare(upload, ocr=True):
+        prepare_calls.append(ocr)
+        return await prepare(upload, ocr=ocr)
+
+    monkeypatch.setattr(analysis, "prepare", tracking_prepare)
+    content = jpeg(400)
+    for name in ("first.jpg", "again.jpg"):
+        _, jobs = batch_service.submit(db_session, [spooled(name, content)], [])
+        asyncio.run(batch_service.process_job(jobs[0].id))
+
+    db_session.expire_all()
+    assert batch_service.ocr_service.calls == 1
+    assert prepare_calls == [True, False]  # 적중 시 OCR 전처리 생략, 저장용 이미지만
+    again = db_session.get(InboundJob, jobs[0].id)
+    assert again.status == InboundJobStatus.COMPLETED
+    assert again.result["supplier_name"] == "Batch Supplier"
+    assert again.result["thumbnail_image_path"]
@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean, BeanType
+from app.models.inbound_item import InboundItem
+from app.models.inventory_log import InventoryLog
+from app.schemas.inbound import InboundConfirmRequest
+from app.services.inbound_service import inbound_service
+
+
+def make_request(items, contract_number="C-001"):
+    return InboundConfirmRequest(
+        document={"supplier_name": "Bulk Supplier", "contract_number": contract_number},
+        items=items,
+    )
+
+
+def test_confirm_updates_stock_and_running_balances(db_session: Session):
+    existing = Bean(name="Kenya AA", type=BeanType.GREEN_BEAN, quantity_kg=5.0)
+    db_session.add(existing)
+    db_session.commit()
+
+    commits = []
+    event.listen(db_session, "after_commit", lambda session: commits.append(session))
+
+    result = inbound_service.confirm_inbound(
+        db_session,
+        make_request(
+            [
+                {"bean_name": "kenya aa", "quantity": 10.0},
+                {"bean_name": "Guji Uraga", "quantity": 3.0, "origin": "Ethiopia"},
+                {"bean_name": "Kenya AA", "quantity": 2.5},
+                {"bean_name": "guji  uraga", "quantity": 1.0},  # 같은 품목의 새 생두는 한 번만 생성
+            ]
+        ),
+    )
+
+    assert result["status"] == "success"
+    assert len(commits) == 1
+
+    db_session.refresh(existing)
+    assert existing.quantity_kg == 17.5
+    created = db_session.query(Bean).filter(Bean.name == "Guji Uraga").all()
+    assert len(created) == 1 and created[0].quantity_kg == 4.0 and created[0].origin == "Ethiopia"
+
+    logs = db_session.query(InventoryLog).order_by(InventoryLog.id).all()
+    assert [(log.bean_id, log.change_amount, log.current_quantity) for log in logs] == [
+        (existing.id, 10.0, 15.0),
+        (created[0].id, 3.0, 3.0),
+        (existing.id, 2.5, 17.5),
+        (created[0].id, 1.0, 4.0),
+    ]
+    assert all(log.inbound_document_id == result["document_id"] for log in logs)
+
+    items = db_session.query(InboundItem).order_by(InboundItem.item_order).all()
+    assert [(item.item_order, item.bean_id, item.remaining_quantity) for item in items] == [
+        (0, existing.id, 10.0),
+        (1, created[0].id, 3.0),
+        (2, existing.id, 2.5),
+        (3, created[0].id, 1.0),
+    ]
+
+
+def test_confirm_never_assigns_fuzzy_matches(db_session: Session):
+    brazil = Bean(name="Brazil", type=BeanType.GREEN_BEAN, quantity_kg=0.0)
+    yirga = Bean(name="Yirgacheffe G1", type=BeanType.GREEN_BEAN, quantity_kg=0.0)
+    db_session.add_all([brazil, yirga])
+    db_session.commit()
+
+    inbound_service.confirm_inbound(
+        db_session,
+        make_request(
+            [
+                {"bean_name": "Brazil Santos NY2 17/18", "quantity": 5.0},
+                {"bean_name": "Yirgachefe G1", "quantity": 2.0},  # 유사 일치 → 자동 매칭하지 않음
+                # 후보 선택
+                {"bean_name": "Yirgachefe G1 (선택)", "quantity": 1.0, "bean_id": yirga.id},
+            ]
+        ),
+    )
+
+    db_session.refresh(brazil)
+    db_session.refresh(yirga)
+    assert brazil.quantity_kg == 0.0
+    assert yirga.quantity_kg == 1.0
+    new_names = {
+        b.name for b in db_session.query(Bean).filter(Bean.id.notin_([brazil.id, yirga.id]))
+    }
+    assert new_names == {"Brazil Santos NY2 17/18", "Yirgachefe G1"}
+
+
+def test_confirm_rejects_unknown_selected_bean(db_session: Session):
+    with pytest.raises(ValueError):
+        inbound_service.confirm_inbound(
+            db_session, make_request([{"bean_name": "Unknown", "quantity": 1.0, "bean_id": 999999}])
+        )
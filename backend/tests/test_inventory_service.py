@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean, BeanType
+from app.models.inbound_document import InboundDocument
+from app.models.inbound_item import InboundItem
+from app.repositories.inbound_repository import InboundRepository
+from app.repositories.inventory_log_repository import InventoryLogRepository
+from app.services.inventory_service import InventoryService
+
+
+@pytest.fixture
+def inventory_service(db_session: Session):
+    return InventoryService(InboundRepository(db_session), InventoryLogRepository(db_session))
+
+
+@pytest.fixture
+def blend_beans(db_session: Session):
+    doc = InboundDocument(supplier_name="Batch Supplier")
+    db_session.add(doc)
+    db_session.flush()
+
+    base = datetime(2025, 3, 1)
+    # (원두명, [(수량, 단가)])
+    specs = [
+        ("Batch A", [(2.0, 1000), (10.0, 2000)]),
+        ("Batch B", [(5.0, 3000)]),
+        ("Batch C", [(1.0, 4000)]),  # 재고 부족
+    ]
+    beans = []
+    for name, lots in specs:
+        bean = Bean(name=name, type=BeanType.GREEN_BEAN, quantity_kg=sum(q for q, _ in lots))
+        db_session.add(bean)
+        db_session.flush()
+        for day, (qty, price) in enumerate(lots):
+            db_session.add(
+                InboundItem(
+                    inbound_document_id=doc.id,
+                    bean_id=bean.id,
+                    quantity=qty,
+                    remaining_quantity=qty,
+                    unit_price=price,
+                    created_at=base + timedelta(days=day),
+                )
+            )
+        beans.append(bean)
+    db_session.commit()
+    return beans
+
+
+def test_consume_fifo_batch_costs_and_deducts(db_session, inventory_service, blend_beans):
+    a, b, c = blend_beans
+
+    results = inventory_service.consume_fifo_batch({a.id: 5.0, b.id: 2.0, c.id: 2.0})
+
+    # A: 2kg@1000 + 3kg@2000
+    assert results[a.id] == (pytest.approx(8000 / 5.0), pytest.approx(8000))
+    assert results[b.id] == (pytest.approx(3000), pytest.approx(6000))
+    # C: 1kg만 충당, 부족분은 원가 0 (단건 calculate_fifo_cost와 동일)
+    assert results[c.id] == (pytest.approx(2000), pytest.approx(4000))
+
+    remaining = {
+        (item.bean_id, item.unit_price): item.remaining_quantity
+        for item in db_session.query(InboundItem).all()
+    }
+    assert remaining[(a.id, 1000)] == 0
+    assert remaining[(a.id, 2000)] == pytest.approx(7.0)
+    assert remaining[(b.id, 3000)] == pytest.approx(3.0)
+    assert remaining[(c.id, 4000)] == 0
+
+
+def test_consume_fifo_batch_matches_single_bean_path(db_session, inventory_service, blend_beans):
+    a, b, _ = blend_beans
+    expected = {
+        a.id: inventory_service.calculate_fifo_cost(a.id, 4.0),
+        b.id: inventory_service.calculate_fifo_cost(b.id, 1.5),
+    }
+
+    results = inventory_service.consume_fifo_batch({a.id: 4.0, b.id: 1.5})
+
+    for bean_id, (unit_cost, total_cost) in expected.items():
+        assert results[bean_id] == (pytest.approx(unit_cost), pytest.approx(total_cost))
+
+
+def test_consume_fifo_batch_query_count_is_constant(db_session, inventory_service, blend_beans):
+    quantities = {bean.id: 1.0 for bean in blend_beans}
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        inventory_service.consume_fifo_batch(quantities)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 1
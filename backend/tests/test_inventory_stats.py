@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean, BeanType
+from app.models.inbound_document import InboundDocument
+from app.models.inbound_item import InboundItem
+from app.models.inventory_log import InventoryChangeType, InventoryLog
+from app.services import stats_service
+
+
+# 기존 원두별 N+1 조회 엔진 (비교 기준, 8bbab9f 의 stats_service.get_inventory_stats 그대로)
+def legacy_get_inventory_stats(
+    db: Session, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+):
+    """
+    Calculate the current inventory value of items purchased within a specific date range,
+    using FIFO (First-In-First-Out) logic.
+    Returns aggregated stats by bean, supplier, and top items.
+    """
+    from app.models.bean import Bean
+    from app.models.inbound_document import InboundDocument
+    from app.models.inventory_log import InventoryLog
+
+    beans = db.query(Bean).all()
+
+    bean_results = []
+    supplier_results = {}
+    total_inventory_value = 0.0
+
+    for bean in beans:
+        # Fetch Inbound History with supplier info joined
+        relevant_inbounds = (
+            db.query(InboundItem)
+            .join(InboundDocument)
+            .filter(InboundItem.bean_id == bean.id)
+            .order_by(InboundItem.created_at)
+            .all()
+        )
+
+        if not relevant_inbounds:
+            continue
+
+        usage_logs = (
+            db.query(InventoryLog)
+            .filter(InventoryLog.bean_id == bean.id, InventoryLog.change_amount < 0)
+            .all()
+        )
+
+        total_used_amount = sum(abs(log.change_amount) for log in usage_logs)
+
+        bean_total_qty = 0.0
+        bean_total_value = 0.0
+        accumulated_qty = 0.0
+
+        for item in relevant_inbounds:
+            qty = item.quantity or 0
+            if accumulated_qty + qty > total_used_amount:
+                remaining_qty = (accumulated_qty + qty) - max(accumulated_qty, total_used_amount)
+
+                is_in_range = True
+                if start_date and item.created_at < start_date:
+                    is_in_range = False
+                if end_date and item.created_at > end_date:
+                    is_in_range = False
+
+                if is_in_range:
+                    item_value = remaining_qty * (item.unit_price or 0)
+                    bean_total_qty += remaining_qty
+                    bean_total_value += item_value
+                    total_inventory_value += item_value
+
+                    # Aggregate by supplier
+                    supplier_name = item.inbound_document.supplier_name or "Unknown"
+                    supplier_results[supplier_name] = (
+                        supplier_results.get(supplier_name, 0.0) + item_value
+                    )
+
+            accumulated_qty += qty
+
+        if bean_total_qty > 0:
+            bean_results.append(
+                {
+                    "bean_name": bean.name,
+                    "quantity_kg": bean_total_qty,
+                    "avg_price": bean_total_value / bean_total_qty,
+                    "total_value": bean_total_value,
+                }
+            )
+
+    # Sort and refine
+    bean_results.sort(key=lambda x: x["total_value"], reverse=True)
+
+    # Format suppliers list with percentages
+    supplier_list = []
+    for name, value in supplier_results.items():
+        supplier_list.append(
+            {
+                "name": name,
+                "value": value,
+                "percentage": (
+                    (value / total_inventory_value * 100) if total_inventory_value > 0 else 0
+                ),
+            }
+        )
+    supplier_list.sort(key=lambda x: x["value"], reverse=True)
+
+    return {
+        "items": bean_results,
+        "suppliers": supplier_list,
+        "top_items": bean_results[:3],
+        "total_value": total_inventory_value,
+    }
+
+
+@pytest.fixture
+def seeded_inventory(db_session: Session):
+    base = datetime(2025, 6, 1)
+    docs = [
+        InboundDocument(supplier_name="GSC"),
+        InboundDocument(supplier_name="LACIELO"),
+        InboundDocument(supplier_name=None),
+    ]
+    db_session.add_all(docs)
+    db_session.flush()
+
+    # (입고 [(수량, 단가, 일자, 문서)], 사용량 목록)
+    scenarios = [
+        ([(10.0, 12000, 0, 0), (5.0, 13000, 10, 1)], [-4.0, -2.5]),
+        ([(20.0, 9000, 3, 1)], [-20.0]),  # 전량 소진
+        ([(8.0, None, 5, 2), (8.0, 15000, 40, 0), (4.0, 16000, 60, 1)], [-9.0]),
+        ([(3.0, 20000, 20, 0)], []),
+        ([], [-1.0]),  # 입고 이력 없음
+    ]
+    for idx, (lots, usages) in enumerate(scenarios):
+        bean = Bean(name=f"Stats Bean {idx}", type=BeanType.GREEN_BEAN, quantity_kg=0.0)
+        db_session.add(bean)
+        db_session.flush()
+        for qty, price, day, doc_idx in lots:
+            db_session.add(
+                InboundItem(
+                    inbound_document_id=docs[doc_idx].id,
+                    bean_id=bean.id,
+                    quantity=qty,
+                    unit_price=price,
+                    created_at=base + timedelta(days=day),
+                )
+            )
+        for amount in usages:
+            db_session.add(
+                InventoryLog(
+                    bean_id=bean.id,
+                    change_type=InventoryChangeType.ROASTING_INPUT,
+                    change_amount=amount,
+                    current_quantity=0.0,
+                )
+            )
+    db_session.commit()
+    return base
+
+
+@pytest.mark.parametrize("start_offset, end_offset", [(None, None), (4, None), (None, 30), (4, 45)])
+def test_inventory_stats_matches_legacy_engine(
+    db_session: Session, seeded_inventory, start_offset, end_offset
+):
+    start_dt = seeded_inventory + timedelta(days=start_offset) if start_offset is not None else None
+    end_dt = seeded_inventory + timedelta(days=end_offset) if end_offset is not None else None
+
+    expected = legacy_get_inventory_stats(db_session, start_dt, end_dt)
+    actual = stats_service.get_inventory_stats(db_session, start_dt, end_dt)
+
+    assert actual == expected
+
+
+def test_inventory_stats_uses_constant_queries(db_session: Session, seeded_inventory):
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        stats_service.get_inventory_stats(db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    assert len(statements) == 2
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app.services.config_service import config_service
+from app.services.ocr_cache_service import OCRCacheService
+from app.services.ocr_service import OCRService
+
+MODELS = [("gemini", "gemini-2.0-flash")]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return OCRCacheService(path=str(tmp_path / "ocr_cache.sqlite3"), max_entries=2)
+
+
+def collect(stream):
+    async def run():
+        return [update async for update in stream]
+
+    return asyncio.run(run())
+
+
+def test_cache_key_and_lru_eviction(cache):
+    cache.set("img-a", "prompt", MODELS, {"items": ["a"]})
+    cache.set("img-b", "prompt", MODELS, {"items": ["b"]})
+    assert cache.get("img-a", "prompt", MODELS) == {"items": ["a"]}  # a 최근 사용
+
+    # 프롬프트/모델 목록이 다르면 다른 키
+    assert cache.get("img-a", "prompt v2", MODELS) is None
+    assert cache.get("img-a", "prompt", MODELS + [("claude", "claude-sonnet-4-5")]) is None
+
+    cache.set("img-c", "prompt", MODELS, {"items": ["c"]})  # b 제거
+    assert cache.get("img-b", "prompt", MODELS) is None
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
+
+    assert cache.retain_only("prompt v2", MODELS) == 2
+    assert cache.stats()["size"] == 0
+
+
+def test_stream_hit_skips_model_call_and_config_save_invalidates(cache, monkeypatch):
+    # 다른 OCRService 인스턴스의 리스너가 실제 캐시 파일을 건드리지 않도록 분리
+    monkeypatch.setattr(config_service, "_listeners", [])
+    service = OCRService(cache=cache)
+    calls = []
+
+    async def fake_call(model_name, image_bytes, mime_type, prompt, on_text=None):
+        calls.append(model_name)
+        return '{"supplier": {"name": "LACIELO"}, "items": []}', None
+
+    monkeypatch.setattr(service, "_get_active_models", lambda ocr_config=None: MODELS)
+    monkeypatch.setattr(service, "_call_gemini_async", fake_call)
+
+    first = collect(service.analyze_image_stream(b"invoice"))
+    second = collect(service.analyze_image_stream(b"invoice"))
+
+    assert calls == ["gemini-2.0-flash"]
+    assert second == [{"status": "complete", "data": first[-1]["data"], "cached": True}]
+
+    # 업로드 원본 해시로 저장한 결과는 전처리 전에 조회 가능
+    collect(service.analyze_image_stream(b"preprocessed", source_hash="raw-upload-hash"))
+    assert service.cached_result("raw-upload-hash") == first[-1]["data"]
+    assert calls == ["gemini-2.0-flash", "gemini-2.0-flash"]
+
+    # 설정 저장 → 프롬프트 구조가 바뀌면 기존 항목 제거
+    config = config_service.get_system_config().model_copy(deep=True)
+    config.ocr.prompt_structure.debug_raw_text = "changed"
+    monkeypatch.setattr(config_service, "_config_path", cache.path + ".json")
+    original = config_service.get_system_config()
+    try:
+        config_service.save_config(config)
+        assert cache.stats()["size"] == 0
+    finally:
+        config_service._config = original
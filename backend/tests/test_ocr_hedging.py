@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app.schemas.config import OCRHedgingConfig
+from app.services.config_service import config_service
+from app.services.latency_tracker import LatencyTracker, ocr_latency_tracker
+from app.services.ocr_cache_service import OCRCacheService
+from app.services.ocr_service import OCRService
+
+MODELS = [("gemini", "gemini-slow"), ("gemini", "gemini-fast")]
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_service, "_listeners", [])
+    ocr_latency_tracker.clear()
+    service = OCRService(cache=OCRCacheService(path=str(tmp_path / "ocr_cache.sqlite3")))
+    monkeypatch.setattr(service, "_get_active_models", lambda ocr_config=None: MODELS)
+    yield service
+    ocr_latency_tracker.clear()
+
+
+def use_hedging(monkeypatch, **kwargs):
+    monkeypatch.setattr(config_service.get_ocr_config(), "hedging", OCRHedgingConfig(**kwargs))
+
+
+def collect(stream):
+    async def run():
+        return [update async for update in stream]
+
+    return asyncio.run(run())
+
+
+def test_latency_percentiles():
+    tracker = LatencyTracker(window=10)
+    for seconds in range(1, 21):
+        tracker.record("m", float(seconds))
+
+    # 최근 10건 (11~20초)만 유지
+    assert tracker.count("m") == 10
+    assert tracker.percentile("m", 0.9) == 19.0
+    assert tracker.percentile("m", 0.5) == 15.0
+    assert tracker.percentile("other", 0.9) is None
+
+
+def test_slow_primary_is_hedged_and_fast_answer_wins(service, monkeypatch):
+    use_hedging(monkeypatch, enabled=True, default_delay_seconds=0.05, min_delay_seconds=0)
+    calls, cancelled = [], []
+
+    async def fake_call(model_name, image_bytes, mime_type, prompt, on_text=None):
+        calls.append(model_name)
+        if model_name == "gemini-slow":
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(model_name)
+                raise
+        return f'{{"supplier": {{"name": "{model_name}"}}, "items": []}}', None
+
+    monkeypatch.setattr(service, "_call_gemini_async", fake_call)
+
+    updates = collect(service.analyze_image_stream(b"invoice"))
+
+    assert calls == ["gemini-slow", "gemini-fast"]
+    assert cancelled == ["gemini-slow"]
+    assert updates[-1]["status"] == "complete"
+    assert updates[-1]["data"]["supplier"]["name"] == "gemini-fast"
+    assert ocr_latency_tracker.count("gemini-fast") == 1
+    assert ocr_latency_tracker.count("gemini-slow") == 0  # 취소된 요청은 기록하지 않음
+
+
+def test_sequential_fallback_when_hedging_disabled(service, monkeypatch):
+    use_hedging(monkeypatch, enabled=False)
+    calls = []
+
+    async def fake_call(model_name, image_bytes, mime_type, prompt, on_text=None):
+        calls.append(model_name)
+        if model_name == "gemini-slow":
+            return "not json", None
+        return '{"items": []}', None
+
+    monkeypatch.setattr(service, "_call_gemini_async", fake_call)
+
+    updates = collect(service.analyze_image_stream(b"invoice"))
+
+    assert calls == ["gemini-slow", "gemini-fast"]
+    assert updates[-1]["status"] == "complete"
+    assert ocr_latency_tracker.snapshot()["gemini-slow"]["failures"] == 1
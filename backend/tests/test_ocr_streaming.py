@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.bean import Bean, BeanType
+from app.schemas.config import OCRHedgingConfig
+from app.services import inbound_analysis_service as analysis
+from app.services.config_service import config_service
+from app.services.latency_tracker import ocr_latency_tracker
+from app.services.ocr_cache_service import OCRCacheService
+from app.services.ocr_service import STREAM_SECTIONS, OCRService
+from app.services.ocr_stream_parser import PartialJSONParser
+
+RESPONSE = (
+    "```json\n"
+    + json.dumps(
+        {
+            "document_info": {"contract_number": "C-1"},
+            "supplier": {"name": "LACIELO", "phone": "02-123-4567"},
+            "amounts": {"total_amount": 30000},
+            "items": [
+                {"bean_name": "Kenya AA", "quantity": 1, "note": 'a "quoted" {brace} [x], \\ end'},
+                {"bean_name": "예가체프 G1", "quantity": 2},
+            ],
+            "debug_raw_text": "공급자 {LACIELO} ... 긴 원문 ...",
+        },
+        ensure_ascii=False,
+    )
+    + "\n```"
+)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_service, "_listeners", [])
+    monkeypatch.setattr(config_service.get_ocr_config(), "hedging", OCRHedgingConfig(enabled=False))
+    ocr_latency_tracker.clear()
+    service = OCRService(cache=OCRCacheService(path=str(tmp_path / "ocr_cache.sqlite3")))
+    monkeypatch.setattr(
+        service, "_get_active_models", lambda ocr_config=None: [("gemini", "m1"), ("gemini", "m2")]
+    )
+    yield service
+    ocr_latency_tracker.clear()
+
+
+def collect(stream):
+    async def run():
+        return [update async for update in stream]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, len(RESPONSE)])
+def test_parser_emits_sections_as_they_close(chunk_size):
+    parser = PartialJSONParser(STREAM_SECTIONS)
+    completed = []
+    for start in range(0, len(RESPONSE), chunk_size):
+        completed += parser.feed(RESPONSE[start : start + chunk_size])
+
+    expected = json.loads(RESPONSE.strip("`json\n"))
+    assert completed == [
+        (("supplier",), expected["supplier"]),
+        (("amounts",), expected["amounts"]),
+        (("items", 0), expected["items"][0]),
+        (("items", 1), expected["items"][1]),
+    ]
+
+
+def test_partials_are_yielded_before_the_model_finishes(service, monkeypatch):
+    async def fake_call(model_name, image_bytes, mime_type, prompt, on_text=None):
+        cut = RESPONSE.index("debug_raw_text")
+        on_text(RESPONSE[:cut])
+        await asyncio.sleep(0.05)  # 긴 원문 생성 중
+        on_text(RESPONSE[cut:])
+        return RESPONSE, None
+
+    monkeypatch.setattr(service, "_call_gemini_async", fake_call)
+
+    updates = collect(service.analyze_image_stream(b"invoice"))
+
+    statuses = [u["status"] for u in updates]
+    assert statuses == ["progress", "partial", "partial", "partial", "partial", "complete"]
+    assert [(u["section"], u.get("index")) for u in updates[1:5]] == [
+        ("supplier", None),
+        ("amounts", None),
+        ("items", 0),
+        ("items", 1),
+    ]
+    assert updates[-1]["data"]["items"][1]["bean_name"] == "예가체프 G1"
+
+
+def test_leader_failure_resets_partials(service, monkeypatch):
+    async def fake_call(model_name, image_bytes, mime_type, prompt, on_text=None):
+        if model_name == "m1":
+            on_text(RESPONSE[: RESPONSE.index('"items"')])
+            raise RuntimeError("connection dropped")
+        on_text(RESPONSE)
+        return RESPONSE, None
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(service, "_call_gemini_async", fake_call)
+    monkeypatch.setattr("app.services.ocr_service.asyncio.sleep", no_sleep)
+
+    updates = collect(service.analyze_image_stream(b"invoice"))
+
+    statuses = [u["status"] for u in updates]
+    assert statuses[:3] == ["progress", "partial", "partial"]  # m1: 공급자, 금액
+    assert "reset" in statuses
+    after_reset = updates[statuses.index("reset") + 1 :]
+    assert [u.get("section") for u in after_reset if u["status"] == "partial"] == [
+        "supplier",
+        "amounts",
+        "items",
+        "items",
+    ]
+    assert statuses[-1] == "complete"
+
+
+def test_build_partial_matches_item_on_arrival(db_session: Session):
+    bean = Bean(name="Kenya AA", type=BeanType.GREEN_BEAN)
+    db_session.add(bean)
+    db_session.commit()
+
+    event = analysis.build_partial(
+        {
+            "status": "partial",
+            "section": "items",
+            "index": 0,
+            "data": {"bean_name": "kenya  aa", "quantity": 1},
+        },
+        db_session,
+    )
+
+    assert event["index"] == 0
+    assert event["data"]["bean_id"] == bean.id and event["data"]["matched"]
+    broken = {"status": "partial", "section": "items", "data": "broken"}
+    assert analysis.build_partial(broken, db_session) is None
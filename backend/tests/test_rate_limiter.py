@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import pytest
+
+from app.schemas.config import OCRModelRateLimit, OCRRateLimitConfig
+from app.services.rate_limiter import (
+    AIMDConcurrency,
+    ModelRateLimiter,
+    RateLimiterRegistry,
+    TokenBucket,
+    is_throttle_error,
+)
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+
+
+def test_token_bucket_waits_after_capacity_is_used():
+    bucket = TokenBucket(per_minute=60)  # 초당 1개 보충
+
+    assert bucket.wait_time(60) == 0
+    bucket.consume(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0, abs=0.05)
+
+    # 실제 사용량 보정으로 음수 잔량이 되면 그만큼 더 기다림
+    bucket.consume(30)
+    assert bucket.wait_time(1) == pytest.approx(31.0, abs=0.05)
+
+
+def test_throttle_detection():
+    assert is_throttle_error(FakeAPIError(429))
+    assert is_throttle_error(FakeAPIError(529))
+    assert is_throttle_error(Exception("429 RESOURCE_EXHAUSTED"))
+    assert not is_throttle_error(FakeAPIError(400))
+    assert not is_throttle_error(ValueError("not json"))
+
+
+def test_aimd_shrinks_on_throttle_and_grows_on_success():
+    async def run():
+        concurrency = AIMDConcurrency(minimum=1, maximum=8, decrease_factor=0.5)
+        limits = [concurrency.limit]
+
+        await concurrency.acquire()
+        await concurrency.release(throttled=True)
+        limits.append(concurrency.limit)
+        await concurrency.acquire()
+        await concurrency.release(throttled=True)
+        limits.append(concurrency.limit)
+
+        for _ in range(4):
+            await concurrency.acquire()
+            await concurrency.release()
+        limits.append(concurrency.limit)
+        return limits
+
+    limits = asyncio.run(run())
+
+    assert limits[:3] == [8.0, 4.0, 2.0]
+    assert 3.0 < limits[3] < 4.0  # 성공 시 +1/limit 씩 천천히 증가
+
+
+def test_requests_queue_until_rpm_allows():
+    limiter = ModelRateLimiter(OCRModelRateLimit(rpm=600, max_concurrency=4))  # 초당 10건
+    limiter.requests.consume(600 - 2)  # 즉시 보낼 수 있는 요청 2건만 남김
+
+    async def run():
+        started = time.monotonic()
+        finished = []
+
+        async def call(i):
+            permit = await limiter.acquire(estimated_tokens=100)
+            finished.append((i, time.monotonic() - started))
+            await limiter.release(permit, used_tokens=100)
+
+        await asyncio.gather(*(call(i) for i in range(4)))
+        return finished
+
+    finished = asyncio.run(run())
+
+    assert [i for i, _ in finished] == [0, 1, 2, 3]  # 요청 순서대로 통과
+    assert finished[1][1] < 0.05
+    assert finished[3][1] >= 0.15  # 초과분 2건은 보충될 때까지 대기
+    assert limiter.stats["requests"] == 4
+
+
+def test_registry_uses_model_limits_and_reconfigures():
+    config = OCRRateLimitConfig(
+        enabled=True,
+        default=OCRModelRateLimit(rpm=10, max_concurrency=2),
+        models={"gemini-2.5-flash": OCRModelRateLimit(rpm=60, max_concurrency=8)},
+    )
+    registry = RateLimiterRegistry(config)
+
+    assert registry.get("gemini-2.5-flash").requests.capacity == 60
+    assert registry.get("unknown-model").concurrency.maximum == 2
+
+    registry.configure(config.model_copy(update={"models": {}}))
+    assert registry.get("gemini-2.5-flash").requests.capacity == 10
+    assert registry.get("gemini-2.5-flash").concurrency.limit == 2
+    assert set(registry.snapshot()) == {"gemini-2.5-flash", "unknown-model"}
+
+
+def test_throttled_model_does_not_hold_global_ocr_slot(tmp_path, monkeypatch):
+    """한도에 걸려 대기 중인 모델이 전역 동시 호출 슬롯을 잡고 있지 않음"""
+    from app.services.ocr_cache_service import OCRCacheService
+    from app.services.ocr_service import OCRService
+
+    service = OCRService(cache=OCRCacheService(path=str(tmp_path / "ocr_cache.sqlite3")))
+    service.rate_limiters.configure(
+        OCRRateLimitConfig(
+            enabled=True, models={"slow-model": OCRModelRateLimit(rpm=60, max_concurrency=1)}
+        )
+    )
+    service.rate_limiters.get("slow-model").requests.consume(60)  # 약 1초 대기 필요
+
+    async def fake_call(model_name, image_bytes, mime_type, prompt, on_text=None):
+        return '{"items": []}', None
+
+    monkeypatch.setattr(service, "_call_gemini_async", fake_call)
+
+    async def run():
+        service._call_semaphore = asyncio.Semaphore(1)
+        waiting = asyncio.create_task(
+            service._attempt_model("gemini", "slow-model", b"img", "image/jpeg", "p")
+        )
+        await asyncio.sleep(0.01)
+        try:
+            # 전역 슬롯 1개를 slow-model 이 잡고 있으면 타임아웃
+            return await asyncio.wait_for(
+                service._attempt_model("gemini", "fast-model", b"img", "image/jpeg", "p"), 0.5
+            )
+        finally:
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+
+    assert asyncio.run(run()) == {"items": []}
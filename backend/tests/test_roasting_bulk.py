@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.v1.roasting import get_roasting_service
+from app.models.bean import Bean, BeanType, RoastProfile
+from app.models.blend import Blend
+from app.models.inbound_document import InboundDocument
+from app.models.inbound_item import InboundItem
+from app.models.inventory_log import InventoryLog
+from app.models.roasting_log import RoastingLog
+from app.schemas.roasting import BulkRoastingBatch
+
+
+@pytest.fixture
+def stock(db_session: Session):
+    doc = InboundDocument(supplier_name="Bulk Supplier")
+    db_session.add(doc)
+    db_session.flush()
+
+    base = datetime(2025, 5, 1)
+    beans = {}
+    # (원두명, [(수량, 단가)])
+    for name, lots in [("Bulk A", [(10.0, 1000), (10.0, 2000)]), ("Bulk B", [(10.0, 3000)])]:
+        bean = Bean(
+            name=name,
+            type=BeanType.GREEN_BEAN,
+            quantity_kg=sum(q for q, _ in lots),
+            expected_loss_rate=0.2,
+        )
+        db_session.add(bean)
+        db_session.flush()
+        for day, (qty, price) in enumerate(lots):
+            db_session.add(
+                InboundItem(
+                    inbound_document_id=doc.id,
+                    bean_id=bean.id,
+                    quantity=qty,
+                    remaining_quantity=qty,
+                    unit_price=price,
+                    created_at=base + timedelta(days=day),
+                )
+            )
+        beans[name] = bean
+
+    blend = Blend(
+        name="Bulk Blend",
+        recipe=[
+            {"bean_id": beans["Bulk A"].id, "ratio": 0.5},
+            {"bean_id": beans["Bulk B"].id, "ratio": 0.5},
+        ],
+    )
+    db_session.add(blend)
+    db_session.commit()
+    return beans["Bulk A"], beans["Bulk B"], blend
+
+
+def single(bean: Bean, input_weight: float, output_weight: float) -> BulkRoastingBatch:
+    return BulkRoastingBatch(
+        roasting_type="single_origin",
+        green_bean_id=bean.id,
+        input_weight=input_weight,
+        output_weight=output_weight,
+        roast_profile=RoastProfile.LIGHT,
+    )
+
+
+def test_bulk_roasting_applies_batches_in_order(db_session: Session, stock):
+    a, b, blend = stock
+    service = get_roasting_service(db_session)
+
+    results = service.create_bulk_roasting(
+        [
+            single(a, 8.0, 6.4),
+            BulkRoastingBatch(
+                roasting_type="blend", blend_id=blend.id, input_weight=4.0, output_weight=3.2
+            ),
+            single(a, 4.0, 3.2),
+        ]
+    )
+
+    batch_nos = [r["batch_no"] for r in results]
+    prefix = batch_nos[0].rsplit("-", 1)[0]
+    assert batch_nos == [f"{prefix}-001", f"{prefix}-002", f"{prefix}-003"]
+
+    # 배치 순서대로 FIFO 소진: 8kg@1000 → 2kg@1000 (블렌드) → 4kg@2000
+    assert results[0]["production_cost"] == pytest.approx(8000 / 6.4, abs=0.01)
+    assert results[1]["production_cost"] == pytest.approx((2 * 1000 + 2 * 3000) / 3.2, abs=0.01)
+    assert results[2]["production_cost"] == pytest.approx(8000 / 3.2, abs=0.01)
+
+    # 같은 SKU의 싱글 오리진 배치는 하나의 원두로 누적
+    assert results[0]["roasted_bean_id"] == results[2]["roasted_bean_id"]
+    roasted = db_session.get(Bean, results[0]["roasted_bean_id"])
+    assert roasted.quantity_kg == pytest.approx(9.6)
+    assert roasted.avg_price == pytest.approx((8000 + 8000) / 9.6)
+
+    assert db_session.get(Bean, a.id).quantity_kg == pytest.approx(6.0)
+    assert db_session.get(Bean, b.id).quantity_kg == pytest.approx(8.0)
+
+    logs = db_session.query(RoastingLog).filter(RoastingLog.batch_no.in_(batch_nos)).all()
+    assert len(logs) == 3
+    inventory_logs = (
+        db_session.query(InventoryLog)
+        .filter(InventoryLog.roasting_log_id.in_([log.id for log in logs]))
+        .all()
+    )
+    # 입력 로그 4건 (싱글 1 + 블렌드 2 + 싱글 1) + 생산 로그 3건
+    assert len(inventory_logs) == 7
+
+
+def test_bulk_roasting_validates_total_stock_up_front(db_session: Session, stock):
+    a, _, _ = stock
+    service = get_roasting_service(db_session)
+
+    # 배치별로는 재고 범위 안이지만 합계가 재고(20kg)를 초과
+    with pytest.raises(HTTPException) as exc:
+        service.create_bulk_roasting([single(a, 12.0, 10.0), single(a, 12.0, 10.0)])
+
+    assert exc.value.status_code == 400
+    assert "Bulk A" in exc.value.detail
+    assert db_session.query(RoastingLog).count() == 0
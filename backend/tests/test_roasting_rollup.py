@@ -0,0 +1,117 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.api.v1.roasting import get_roasting_service
+from app.models.bean import Bean, BeanType, RoastProfile
+from app.models.roasting_daily_rollup import RoastingDailyRollup
+from app.models.roasting_log import RoastingLog
+from app.repositories.roasting_rollup_repository import RoastingRollupRepository
+from app.schemas.roasting import BulkRoastingBatch
+from app.services.cache_service import cache_service
+
+
+@pytest.fixture
+def green_bean(db_session: Session):
+    bean = Bean(name="Rollup Green", type=BeanType.GREEN_BEAN, quantity_kg=100.0, avg_price=5000)
+    db_session.add(bean)
+    db_session.commit()
+    return bean
+
+
+def rollup_rows(db_session: Session):
+    return {
+        (row.rollup_date, row.bean_id): (
+            row.output_weight_sum,
+            row.input_weight_sum,
+            row.batch_count,
+        )
+        for row in db_session.query(RoastingDailyRollup).all()
+    }
+
+
+def test_rollup_tracks_roasting_writes(db_session: Session, green_bean: Bean):
+    service = get_roasting_service(db_session)
+
+    service.create_single_origin_roasting(
+        green_bean_id=green_bean.id,
+        input_weight=10.0,
+        output_weight=8.0,
+        roast_profile=RoastProfile.LIGHT,
+    )
+    service.create_bulk_roasting(
+        [
+            BulkRoastingBatch(
+                roasting_type="single_origin",
+                green_bean_id=green_bean.id,
+                input_weight=5.0,
+                output_weight=4.2,
+                roast_profile=RoastProfile.LIGHT,
+            ),
+            BulkRoastingBatch(
+                roasting_type="single_origin",
+                green_bean_id=green_bean.id,
+                input_weight=5.0,
+                output_weight=4.0,
+                roast_profile=RoastProfile.DARK,
+            ),
+        ]
+    )
+
+    expected = {}
+    for log in db_session.query(RoastingLog).all():
+        key = (log.roast_date.date(), log.target_bean_id)
+        output, input_, count = expected.get(key, (0.0, 0.0, 0))
+        expected[key] = (
+            output + log.output_weight_total,
+            input_ + log.input_weight_total,
+            count + 1,
+        )
+
+    assert rollup_rows(db_session) == pytest.approx(expected)
+
+    summary = service.get_analytics_summary()
+    assert summary.overview["total_batches"] == 3
+    assert summary.overview["total_production_kg"] == pytest.approx(16.2)
+
+
+def test_startup_backfill_covers_existing_logs(db_session: Session, green_bean: Bean):
+    # 집계 테이블 도입 이전에 기록된 로그
+    roasts = [
+        (datetime(2025, 3, 1, 9), 8.0),
+        (datetime(2025, 3, 1, 15), 7.0),
+        (datetime(2025, 3, 3, 10), 6.5),
+        (datetime(2025, 4, 1, 10), 9.0),  # 조회 범위 밖
+    ]
+    for idx, (roast_date, output) in enumerate(roasts):
+        db_session.add(
+            RoastingLog(
+                batch_no=f"R250301-{idx:03d}",
+                target_bean_id=green_bean.id,
+                roast_date=roast_date,
+                input_weight_total=10.0,
+                output_weight_total=output,
+                loss_rate=(10.0 - output) * 10,
+            )
+        )
+    db_session.commit()
+
+    # 통계 조회는 집계를 채우지 않음 (읽기 전용)
+    service = get_roasting_service(db_session)
+    assert service.get_analytics_summary(date(2025, 3, 1), date(2025, 3, 3)).daily_production == []
+    assert rollup_rows(db_session) == {}
+
+    # 서버 시작 시 backfill
+    RoastingRollupRepository(db_session).ensure_backfilled()
+    db_session.commit()
+    cache_service.clear()
+
+    summary = service.get_analytics_summary(date(2025, 3, 1), date(2025, 3, 3))
+
+    assert [(d.date, d.total_weight, d.batch_count) for d in summary.daily_production] == [
+        ("2025-03-01", pytest.approx(15.0), 2),
+        ("2025-03-03", pytest.approx(6.5), 1),
+    ]
+    assert summary.bean_usage[0].total_output == pytest.approx(21.5)
+    assert len(rollup_rows(db_session)) == 3
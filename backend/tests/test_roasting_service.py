@@ -11,6 +11,8 @@ def mock_dependencies():
         "inventory_service": Mock(),
         "blend_repo": Mock(),
         "roasting_log_repo": Mock(),
+        "batch_sequence_repo": Mock(),
+        "rollup_repo": Mock(),
     }
 
 @pytest.fixture
@@ -20,10 +22,12 @@ def roasting_service(mock_dependencies):
         inventory_service=mock_dependencies["inventory_service"],
         blend_repo=mock_dependencies["blend_repo"],
         roasting_log_repo=mock_dependencies["roasting_log_repo"],
+        batch_sequence_repo=mock_dependencies["batch_sequence_repo"],
+        rollup_repo=mock_dependencies["rollup_repo"],
     )
 
 def test_generate_batch_no_new(roasting_service, mock_dependencies):
-    mock_dependencies["roasting_log_repo"].get_latest_batch_no.return_value = None
+    mock_dependencies["batch_sequence_repo"].reserve.return_value = 1
     batch_no = roasting_service.generate_batch_no()
     assert batch_no.startswith("R")
     assert batch_no.endswith("-001")
@@ -45,7 +49,7 @@ def test_single_origin_roasting_flow(roasting_service, mock_dependencies):
     mock_dependencies["bean_service"].get_bean.return_value = green_bean
     mock_dependencies["bean_service"].get_bean.return_value = green_bean
     mock_dependencies["inventory_service"].calculate_fifo_cost.return_value = (10000, 50000)
-    mock_dependencies["roasting_log_repo"].get_latest_batch_no.return_value = None
+    mock_dependencies["batch_sequence_repo"].reserve.return_value = 1
     
     roasted_bean_mock = Mock()
     roasted_bean_mock.id = 10
@@ -87,3 +91,37 @@ def test_single_origin_roasting_flow(roasting_service, mock_dependencies):
     # Check Output Processing
     mock_dependencies["bean_service"].repository.create.assert_called() # New roasted bean
     mock_dependencies["bean_service"].update_bean_quantity.assert_any_call(10, 4.2)
+
+def test_blend_roasting_uses_batch_fifo(roasting_service, mock_dependencies):
+    blend = Mock()
+    blend.id = 3
+    blend.name = "House Blend"
+    blend.recipe = [{"bean_id": 1, "ratio": 0.6}, {"bean_id": 2, "ratio": 0.4}]
+    mock_dependencies["blend_repo"].get.return_value = blend
+
+    beans = {}
+    for bean_id in (1, 2):
+        bean = Mock()
+        bean.id = bean_id
+        bean.name = f"Bean {bean_id}"
+        bean.quantity_kg = 50.0
+        bean.expected_loss_rate = 0.2
+        beans[bean_id] = bean
+    mock_dependencies["bean_service"].get_beans_by_ids.return_value = beans
+    mock_dependencies["bean_service"].get_bean_by_sku.return_value = None
+    mock_dependencies["inventory_service"].consume_fifo_batch.return_value = {
+        1: (10000, 60000),
+        2: (12000, 48000),
+    }
+    mock_dependencies["batch_sequence_repo"].reserve.return_value = 1
+
+    roasting_service.create_blend_roasting(blend_id=3, output_weight=8.0, input_weight=10.0)
+
+    mock_dependencies["inventory_service"].consume_fifo_batch.assert_called_once_with(
+        {1: 6.0, 2: 4.0}
+    )
+    mock_dependencies["bean_service"].get_bean.assert_not_called()
+    mock_dependencies["inventory_service"].deduct_inventory.assert_not_called()
+
+    call_args = mock_dependencies["roasting_log_repo"].create.call_args[0][0]
+    assert call_args["production_cost"] == 108000
@@ -0,0 +1,71 @@
+import asyncio
+import hashlib
+import io
+
+import httpx
+import pytest
+from PIL import Image
+
+from app.services.upload_service import SpooledUpload, UploadRejectedError, download
+
+
+def png_bytes(size=(64, 64)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color="white").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_size_cap_is_enforced_while_streaming():
+    upload = SpooledUpload("big.png", "image/png", max_size=100 * 1024, spool_max_memory=16 * 1024)
+    upload.write(png_bytes())
+    with pytest.raises(UploadRejectedError, match="exceeds limit"):
+        for _ in range(10):
+            upload.write(b"\0" * 16 * 1024)
+    assert upload.size <= 100 * 1024 + 16 * 1024  # 한도를 넘는 첫 청크에서 중단
+    upload.close()
+
+
+def test_non_image_is_rejected_on_first_chunk():
+    upload = SpooledUpload("invoice.jpg")
+    with pytest.raises(UploadRejectedError, match="Invalid file content type"):
+        upload.write(b"<html>" + b" " * 4096)
+    upload.close()
+
+
+def test_spooled_upload_rolls_over_to_disk_and_reads_back():
+    content = png_bytes((400, 400)) + b"\0" * 64 * 1024
+    upload = SpooledUpload("invoice.png", "image/png", spool_max_memory=8 * 1024)
+    for i in range(0, len(content), 4096):
+        upload.write(content[i : i + 4096])
+    upload.finish()
+
+    assert upload.file._rolled  # 메모리 한도 초과분은 임시 파일로
+    assert upload.size == len(content)
+    assert upload.read() == content
+    assert upload.content_hash == hashlib.sha256(content).hexdigest()  # 수신 중 계산
+    upload.close()
+
+
+def test_download_stops_on_content_length_and_streams_body():
+    body = png_bytes()
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        if request.url.path == "/huge.png":
+            return httpx.Response(200, headers={"content-length": str(1024**3)}, content=b"")
+        return httpx.Response(200, headers={"content-type": "image/png"}, content=body)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with pytest.raises(UploadRejectedError):
+                await download("https://example.com/huge.png", client=client)
+            upload, headers = await download("https://example.com/ok.png", client=client)
+            with upload:
+                return upload.read(), upload.mime_type
+
+    content, mime_type = asyncio.run(run())
+
+    assert content == body
+    assert mime_type == "image/png"
+    assert requested == ["/huge.png", "/ok.png"]
@@ -57,6 +57,8 @@ interface InboundItem {
   amount: number;
   total_weight?: number;
   order_number?: string;
+  bean_id?: number | null; // 유사 일치 후보 중 사용자가 선택한 생두
+  match_candidates?: { bean_id: number; name: string; score: number }[];
 }
 
 interface OrderGroup {
@@ -249,33 +251,62 @@ export default function InboundPage() {
 
       const decoder = new TextDecoder();
       let finalData = null;
+      let buffer = '';
+      // 모델 응답 도중 도착하는 품목/공급처/금액 미리보기 (complete 결과로 최종 대체)
+      let previewItems: any[] = [];
+
+      const toFormItem = (item: any) => ({
+        ...item,
+        quantity: (item.total_weight && item.total_weight > item.quantity)
+          ? item.total_weight
+          : item.quantity
+      });
+
+      const applyPartial = (update: any) => {
+        if (update.section === 'items') {
+          previewItems[update.index] = toFormItem(update.data);
+          setValue('items', previewItems.filter(Boolean));
+        } else if (update.section === 'supplier') {
+          setValue('supplier_name', update.data?.name || '');
+          setValue('supplier_phone', update.data?.phone || '');
+          setValue('contact_phone', update.data?.contact_phone || '');
+          setValue('supplier_email', update.data?.email || '');
+        } else if (update.section === 'amounts') {
+          setValue('total_amount', update.data?.total_amount || 0);
+        }
+      };
 
       while (true) {
         const { done, value } = await reader.read();
         if (done) break;
 
-        const chunk = decoder.decode(value, { stream: true });
-        const lines = chunk.split('\n');
+        // 줄 단위로 처리 (청크 경계에서 잘린 줄은 다음 청크와 합침)
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() || '';
 
         for (const line of lines) {
           if (!line.trim()) continue;
+          let update;
           try {
-            const update = JSON.parse(line);
-
-            if (update.status === 'progress') {
-              setStatusMessage(update.message);
-            } else if (update.status === 'complete') {
-              finalData = update.data;
-            } else if (update.status === 'error') {
-              throw new Error(update.message);
-            }
+            update = JSON.parse(line);
           } catch (e) {
-            // Ignore incomplete JSON chunks or parse errors
-            // In production, might want to buffer incomplete lines.
-            // But NDJSON is usually line-buffered.
-            if ((e as Error).message !== 'Unexpected end of JSON input') {
-              console.warn('Stream parse error:', e);
-            }
+            console.warn('Stream parse error:', e);
+            continue;
+          }
+
+          if (update.status === 'progress') {
+            setStatusMessage(update.message);
+          } else if (update.status === 'partial') {
+            applyPartial(update);
+          } else if (update.status === 'reset') {
+            previewItems = [];
+            setValue('items', []);
+            setStatusMessage(update.message);
+          } else if (update.status === 'complete') {
+            finalData = update.data;
+          } else if (update.status === 'error') {
+            throw new Error(update.message);
           }
         }
       }
@@ -292,6 +323,7 @@ export default function InboundPage() {
 
       // Check for multiple orders
       if (data.has_multiple_orders) {
+        reset(); // 미리보기로 채운 품목 제거 (주문 선택 시 다시 입력)
         setHasMultipleOrders(true);
         setTotalOrderCount(data.total_order_count);
         setOrderGroups(data.order_groups);
@@ -327,12 +359,7 @@ export default function InboundPage() {
       setValue('invoice_date', data.document_info?.invoice_date || data.invoice_date || '');
       setValue('total_amount', data.amounts?.total_amount || data.total_amount || 0);
 
-      setValue('items', (data.items || []).map((item: any) => ({
-        ...item,
-        quantity: (item.total_weight && item.total_weight > item.quantity)
-          ? item.total_weight
-          : item.quantity
-      })));
+      setValue('items', (data.items || []).map(toFormItem));
       setDriveLink(data.drive_link);
 
       toast({ title: '분석 완료', description: '명세서 내용을 자동으로 입력했습니다.' });
@@ -1072,6 +1099,8 @@ export default function InboundPage() {
                         // Watch current item name to show status
                         const currentName = watch(`items.${index}.bean_name`);
                         const status = itemStatus[currentName];
+                        // 유사 일치 후보 (서버는 자동 매칭하지 않음, 여기서 선택한 생두로 입고)
+                        const candidates = watch(`items.${index}.match_candidates`) || [];
 
                         return (
                           <div
@@ -1096,9 +1125,37 @@ export default function InboundPage() {
                                 </Badge>
                               )}
                             </div>
+                            {candidates.length > 0 && (
+                              <div className="col-span-12 flex items-center gap-2 text-xs">
+                                <span className="text-latte-500">유사 생두</span>
+                                <select
+                                  className="h-7 rounded-md border border-latte-200 bg-white px-2 text-xs"
+                                  value={watch(`items.${index}.bean_id`) ?? ''}
+                                  onChange={(e) =>
+                                    setValue(
+                                      `items.${index}.bean_id`,
+                                      e.target.value ? Number(e.target.value) : null
+                                    )
+                                  }
+                                >
+                                  <option value="">신규 상품으로 등록</option>
+                                  {candidates.map((c) => (
+                                    <option key={c.bean_id} value={c.bean_id}>
+                                      {c.name} ({Math.round(c.score * 100)}%)
+                                    </option>
+                                  ))}
+                                </select>
+                              </div>
+                            )}
                             <div className="col-span-5 relative">
                               <Input
-                                {...register(`items.${index}.bean_name`)}
+                                {...register(`items.${index}.bean_name`, {
+                                  // 이름을 고치면 이전 매칭/선택은 무효
+                                  onChange: () => {
+                                    setValue(`items.${index}.bean_id`, null);
+                                    setValue(`items.${index}.match_candidates`, []);
+                                  },
+                                })}
                                 placeholder="원두명"
                                 className="h-8 pr-10"
                                 onBlur={(e) => checkItemsBatch([e.target.value])}